@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import deque
+
+
+class AccountSession:
+    """Conta OLX com sessão de navegador própria, cota e cooldown.
+
+    Attributes:
+        email (str): Email da conta
+        password (str): Senha da conta
+        browser (PooledBrowser): Navegador do pool logado com esta conta (ou None)
+        logged_in (bool): Se o login já foi realizado no driver atual
+        cooldown_until (float): Instante (time.monotonic) até o qual a conta fica em pausa
+        failures (int): Falhas consecutivas (login, bloqueio)
+        total_reveals (int): Telefones revelados desde a criação do pool
+        removed (bool): Se a conta saiu do pool enquanto estava em uso
+    """
+
+    def __init__(self, email: str, password: str):
+        self.email = email
+        self.password = password
+        self.browser = None
+        self.logged_in = False
+        self.cooldown_until = 0.0
+        self.failures = 0
+        self.total_reveals = 0
+        self.last_request = 0.0
+        self.in_use = False
+        self.removed = False
+        self._reveals = deque()
+
+    @property
+    def driver(self):
+        return self.browser.driver if self.browser else None
+
+    def reveals_in_window(self, now: float, window: float) -> int:
+        while self._reveals and now - self._reveals[0] >= window:
+            self._reveals.popleft()
+        return len(self._reveals)
+
+    def register_reveal(self, now: float) -> None:
+        self._reveals.append(now)
+        self.total_reveals += 1
+
+    def respect_rate_limit(self, min_delay: float) -> None:
+        """Espaça as requisições desta conta."""
+        delay = min_delay - (time.monotonic() - self.last_request)
+        if delay > 0:
+            time.sleep(delay)
+        self.last_request = time.monotonic()
+
+    def __repr__(self):
+        return f"AccountSession({self.email!r})"
+
+
+class AccountPool:
+    """Agenda revelações de telefone entre várias contas.
+
+    Cada conta tem cota própria de revelações por janela de tempo e entra em
+    cooldown quando a cota acaba, quando é bloqueada ou após falhas seguidas.
+    `acquire` entrega a conta livre com menos revelações na janela, então a
+    vazão cresce com o número de contas.
+
+    Attributes:
+        accounts (list): Sessões de conta gerenciadas
+        max_reveals (int): Revelações permitidas por conta na janela
+        window (float): Tamanho da janela de cota em segundos
+        cooldown (float): Pausa aplicada após bloqueio ou falhas seguidas
+        max_failures (int): Falhas consecutivas até o cooldown
+    """
+
+    def __init__(self, accounts: list[dict], max_reveals: int = 60, window: float = 3600.0,
+                 cooldown: float = 900.0, max_failures: int = 3):
+        self.accounts = [AccountSession(a['email'], a['password']) for a in accounts]
+        self.max_reveals = max_reveals
+        self.window = window
+        self.cooldown = cooldown
+        self.max_failures = max_failures
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def sync(self, accounts: list[dict]) -> list[AccountSession]:
+        """Atualiza a lista de contas mantendo as sessões já existentes.
+
+        Retorna as sessões removidas que estão livres, para o chamador liberar
+        seus navegadores. As removidas em uso são marcadas (`removed`) e
+        `release` avisa quando forem devolvidas.
+        """
+        with self._cond:
+            current = {a.email: a for a in self.accounts}
+            updated = []
+            for account in accounts:
+                session = current.pop(account['email'], None) or AccountSession(account['email'], account['password'])
+                if session.password != account['password']:
+                    session.password = account['password']
+                    session.logged_in = False
+                updated.append(session)
+            self.accounts = updated
+            for session in current.values():
+                session.removed = True
+            self._cond.notify_all()
+            return [session for session in current.values() if not session.in_use]
+
+    def _ready_at(self, account: AccountSession, now: float) -> float:
+        """Instante em que a conta pode voltar a revelar telefones."""
+        ready = account.cooldown_until
+        if account.reveals_in_window(now, self.window) >= self.max_reveals:
+            ready = max(ready, account._reveals[0] + self.window)
+        return ready
+
+    def acquire(self, timeout: float | None = None) -> AccountSession | None:
+        """Reserva a melhor conta disponível, aguardando até `timeout` segundos."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                free = [a for a in self.accounts if not a.in_use]
+                ready = [a for a in free if self._ready_at(a, now) <= now]
+                if ready:
+                    account = min(ready, key=lambda a: (a.reveals_in_window(now, self.window), a.last_request))
+                    account.in_use = True
+                    return account
+                if not self.accounts:
+                    return None
+                # Aguarda uma conta ser liberada ou sair do cooldown
+                next_ready = min((self._ready_at(a, now) for a in free), default=now + 1.0)
+                wait = max(next_ready - now, 0.05)
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return None
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+
+    def release(self, account: AccountSession, revealed: bool = False, blocked: bool = False,
+                failed: bool = False) -> bool:
+        """Devolve a conta ao pool registrando o resultado da operação.
+
+        Retorna True se a conta foi removida do pool durante o uso: o chamador
+        deve liberar o navegador dela.
+        """
+        with self._cond:
+            now = time.monotonic()
+            if revealed:
+                account.register_reveal(now)
+                account.failures = 0
+            if blocked:
+                account.cooldown_until = now + self.cooldown
+                print(f"[ACCOUNTS] {account.email} bloqueada, em cooldown por {self.cooldown:.0f}s")
+            elif failed:
+                account.failures += 1
+                if account.failures >= self.max_failures:
+                    account.cooldown_until = now + self.cooldown
+                    account.failures = 0
+                    print(f"[ACCOUNTS] {account.email} com falhas seguidas, em cooldown por {self.cooldown:.0f}s")
+            account.in_use = False
+            self._cond.notify_all()
+            return account.removed
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            return {
+                a.email: {
+                    'reveals': a.total_reveals,
+                    'reveals_in_window': a.reveals_in_window(now, self.window),
+                    'cooldown_seconds': round(max(a.cooldown_until - now, 0.0), 1),
+                    'logged_in': a.logged_in,
+                }
+                for a in self.accounts
+            }
+
+    def close(self, cleanup) -> None:
+        """Libera os navegadores de todas as contas usando a função fornecida."""
+        with self._cond:
+            for account in self.accounts:
+                if account.browser:
+                    cleanup(account.browser)
+                account.browser = None
+                account.logged_in = False
@@ -0,0 +1,75 @@
+import re
+
+# Vereditos de classificação de uma resposta ou página
+OK = 'ok'
+BLOCKED = 'blocked'
+CAPTCHA = 'captcha'
+RATE_LIMITED = 'rate_limited'
+ERROR = 'error'
+BLOCK_VERDICTS = (BLOCKED, CAPTCHA, RATE_LIMITED)
+
+# Marcadores inequívocos de desafio anti-bot (PerimeterX, DataDome, Cloudflare, reCAPTCHA, hCaptcha)
+_CAPTCHA_MARKERS = re.compile(
+    r'px-captcha|captcha-delivery\.com|cf-challenge|challenge-platform|cf-turnstile|g-recaptcha|h-captcha',
+    re.IGNORECASE)
+# Marcadores genéricos: só contam no título ou em páginas curtas, onde não há conteúdo real
+_BLOCK_MARKERS = re.compile(
+    r'captcha|security check|verificação de segurança|access denied|acesso negado|are you a robot|'
+    r'unusual traffic|tráfego incomum|request blocked|you have been blocked|bloquead[oa]',
+    re.IGNORECASE)
+_REDIRECT_MARKERS = re.compile(r'captcha|challenge|/blocked|/denied|/sorry', re.IGNORECASE)
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+# Probe executado no navegador: uma única chamada em vez de várias buscas XPath pelo DOM
+_DRIVER_PROBE_SCRIPT = """
+const strong = document.querySelector(
+    '#px-captcha, #challenge-form, .cf-turnstile, .g-recaptcha, .h-captcha, iframe[src*="captcha"]');
+const text = document.body ? (document.body.textContent || '') : '';
+return [location.href, document.title || '', !!strong, text.slice(0, arguments[0]), text.length];
+"""
+
+
+class BlockDetector:
+    """Classifica respostas HTTP e páginas do navegador como ok, bloqueio ou captcha.
+
+    Usa o status HTTP, o destino de redirecionamentos e marcadores no corpo.
+    Só o início do corpo é examinado, e marcadores genéricos ("captcha",
+    "security check") só valem no título ou em páginas curtas, para não
+    confundir anúncios reais com páginas de bloqueio.
+
+    Attributes:
+        scan_bytes (int): Quantidade do início do corpo examinada
+        short_page (int): Tamanho abaixo do qual a página é considerada sem conteúdo real
+    """
+
+    def __init__(self, scan_bytes: int = 65536, short_page: int = 20000):
+        self.scan_bytes = scan_bytes
+        self.short_page = short_page
+
+    def classify_response(self, status: int, url: str = '', body: str = '') -> str:
+        """Classifica uma resposta do caminho requests."""
+        if status == 429:
+            return RATE_LIMITED
+        if url and _REDIRECT_MARKERS.search(url):
+            return CAPTCHA
+        head = body[:self.scan_bytes] if body else ''
+        if head and _CAPTCHA_MARKERS.search(head):
+            return CAPTCHA
+        title = _TITLE_RE.search(head)
+        if (title and _BLOCK_MARKERS.search(title.group(1))) \
+                or (len(body) < self.short_page and _BLOCK_MARKERS.search(head)):
+            return BLOCKED if status in (401, 403) else CAPTCHA
+        if status in (401, 403):
+            return BLOCKED
+        if status >= 400:
+            return ERROR
+        return OK
+
+    def classify_driver(self, driver) -> str:
+        """Classifica a página aberta no navegador com um único script."""
+        url, title, strong, text, length = driver.execute_script(_DRIVER_PROBE_SCRIPT, 3000)
+        if strong or (url and _REDIRECT_MARKERS.search(url)):
+            return CAPTCHA
+        if _BLOCK_MARKERS.search(title) or (length < 3000 and _BLOCK_MARKERS.search(text)):
+            return CAPTCHA
+        return OK
@@ -0,0 +1,249 @@
+import gzip
+import json
+import os
+import struct
+import threading
+import time
+from importlib.util import find_spec
+
+from ..domain.entities.scraping import ScrapingData
+from .json_repository import JsonRepository
+from .profiler import profiled
+
+# Cabeçalho fixo de cada bloco: assinatura, codec, tamanho do cabeçalho JSON e do conteúdo comprimido
+_MAGIC = b'OLXB'
+_FRAME = struct.Struct('>4sBII')
+
+GZIP = 'gzip'
+ZSTD = 'zstd'
+_CODEC_IDS = {GZIP: 1, ZSTD: 2}
+_CODEC_NAMES = {value: key for key, value in _CODEC_IDS.items()}
+
+
+def available_codecs() -> list[str]:
+    """Codecs utilizáveis com os pacotes instalados (zstd requer `zstandard`)."""
+    return [GZIP] + ([ZSTD] if find_spec('zstandard') else [])
+
+
+def _compress(codec: str, payload: bytes) -> bytes:
+    if codec == ZSTD:
+        import zstandard
+        return zstandard.ZstdCompressor(level=6).compress(payload)
+    # mtime=0: o mesmo conteúdo gera sempre os mesmos bytes
+    return gzip.compress(payload, compresslevel=6, mtime=0)
+
+
+def _decompress(codec: str, payload: bytes) -> bytes:
+    if codec == ZSTD:
+        if not find_spec('zstandard'):
+            raise Exception("Bloco comprimido com zstd; instale o pacote zstandard para lê-lo")
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return gzip.decompress(payload)
+
+
+def encode_block(url: str, items: list[dict], codec: str = GZIP, saved: str | None = None) -> bytes:
+    """Monta o bloco de uma coleta: cabeçalho legível sem descompressão e itens em JSONL comprimido."""
+    lines = '\n'.join(json.dumps(item, ensure_ascii=False, separators=(',', ':')) for item in items)
+    payload = _compress(codec, lines.encode('utf-8'))
+    saved = saved or time.strftime('%Y-%m-%dT%H:%M:%S')
+    header = json.dumps({'url': url, 'items': len(items), 'saved': saved},
+                        ensure_ascii=False).encode('utf-8')
+    return _FRAME.pack(_MAGIC, _CODEC_IDS[codec], len(header), len(payload)) + header + payload
+
+
+class BlockInfo:
+    """Posição e cabeçalho de um bloco do arquivo."""
+
+    def __init__(self, offset: int, codec: str, header: dict, payload_offset: int, payload_size: int):
+        self.offset = offset
+        self.codec = codec
+        self.header = header
+        self.payload_offset = payload_offset
+        self.payload_size = payload_size
+
+    @property
+    def end(self) -> int:
+        return self.payload_offset + self.payload_size
+
+
+def scan_blocks(filename: str) -> tuple[list[BlockInfo], int]:
+    """Lê só os cabeçalhos dos blocos, pulando o conteúdo comprimido.
+
+    Returns:
+        tuple: Blocos completos e a posição onde termina o último deles. Um
+            bloco final incompleto (gravação interrompida) fica de fora.
+    """
+    blocks = []
+    valid_end = 0
+    try:
+        f = open(filename, 'rb')
+    except FileNotFoundError:
+        return blocks, 0
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        while True:
+            frame = f.read(_FRAME.size)
+            if len(frame) < _FRAME.size:
+                break
+            magic, codec_id, header_size, payload_size = _FRAME.unpack(frame)
+            if magic != _MAGIC or codec_id not in _CODEC_NAMES:
+                break
+            payload_offset = valid_end + _FRAME.size + header_size
+            if payload_offset + payload_size > size:
+                break
+            try:
+                header = json.loads(f.read(header_size))
+            except ValueError:
+                break
+            blocks.append(BlockInfo(valid_end, _CODEC_NAMES[codec_id], header, payload_offset, payload_size))
+            valid_end = payload_offset + payload_size
+            f.seek(valid_end)
+    return blocks, valid_end
+
+
+class BlockRepository(JsonRepository):
+    """Repositório em blocos comprimidos, um por coleta.
+
+    Cada bloco traz um cabeçalho pequeno (url, quantidade de itens, data) e
+    os itens da coleta em JSONL compacto comprimido com gzip ou zstd. Salvar
+    acrescenta um bloco ao fim do arquivo, sem ler nem reescrever o
+    histórico, e a leitura descomprime um bloco por vez. Um bloco
+    incompleto no fim do arquivo (gravação interrompida) é ignorado na
+    leitura e descartado no próximo salvamento.
+
+    Attributes:
+        filename (str): Arquivo de blocos
+        codec (str): Compressão dos novos blocos ('gzip' ou 'zstd')
+    """
+
+    def __init__(self, filename: str = "data.olxb", index_path: str | None = None, codec: str | None = None):
+        super().__init__(filename, index_path)
+        codec = codec or os.getenv('OLX_STORAGE_CODEC', GZIP)
+        if codec not in available_codecs():
+            print(f"[STORAGE] Codec {codec} indisponível (instale zstandard); usando gzip")
+            codec = GZIP
+        self.codec = codec
+        self._lock = threading.Lock()
+        self._blocks = None
+        self._blocks_signature = None
+
+    def blocks(self) -> list[BlockInfo]:
+        """Cabeçalhos dos blocos gravados (relidos só se o arquivo mudou)."""
+        signature = self._file_signature()
+        if self._blocks is None or signature != self._blocks_signature:
+            self._blocks, _ = scan_blocks(self.filename)
+            self._blocks_signature = signature
+        return self._blocks
+
+    @profiled('repository_save')
+    def save(self, data: ScrapingData) -> None:
+        print(f"\nIniciando salvamento dos dados no arquivo {self.filename}")
+        try:
+            block = encode_block(data.url, data.data, self.codec)
+            with self._lock:
+                blocks = self.blocks()
+                valid_end = blocks[-1].end if blocks else 0
+                with open(self.filename, 'ab') as f:
+                    if f.tell() > valid_end:
+                        print(f"[STORAGE] Descartando {f.tell() - valid_end} bytes de um bloco incompleto")
+                        f.truncate(valid_end)
+                    f.write(block)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # O bloco novo entra no cache sem reler os cabeçalhos do arquivo
+                _, _, header_size, payload_size = _FRAME.unpack_from(block)
+                payload_offset = valid_end + _FRAME.size + header_size
+                header = json.loads(block[_FRAME.size:_FRAME.size + header_size])
+                blocks.append(BlockInfo(valid_end, self.codec, header, payload_offset, payload_size))
+                self._blocks_signature = self._file_signature()
+            total = len(blocks)
+            print(f"Dados salvos com sucesso. Total de registros: {total}")
+        except Exception as e:
+            raise Exception(f"Erro ao salvar dados: {str(e)}")
+
+        self._update_index(total, self._read_runs)
+
+    def read_block(self, block: BlockInfo) -> list[dict]:
+        """Descomprime os itens de um único bloco."""
+        with open(self.filename, 'rb') as f:
+            f.seek(block.payload_offset)
+            payload = f.read(block.payload_size)
+        lines = _decompress(block.codec, payload).decode('utf-8')
+        # json.dumps escapa quebras de linha dentro dos valores, então cada \n separa um item
+        return json.loads('[' + lines.replace('\n', ',') + ']')
+
+    def _read_runs(self, start: int = 0):
+        for block in self.blocks()[start:]:
+            yield {'url': block.header['url'], 'saved': block.header.get('saved'), 'data': self.read_block(block)}
+
+    def iter_runs(self, start: int = 0):
+        """Itera as coletas bloco a bloco, sem manter o histórico inteiro na memória."""
+        for entry in self._read_runs(start):
+            yield ScrapingData(entry['url'], entry['data'])
+
+    def _index_source(self) -> tuple:
+        return len(self.blocks()), self._read_runs
+
+    def load(self) -> list[ScrapingData]:
+        print(f"\nCarregando dados do arquivo {self.filename}")
+        try:
+            result = list(self.iter_runs())
+            if not result and not os.path.exists(self.filename):
+                print("Arquivo não encontrado. Retornando lista vazia.")
+                return []
+            print(f"Dados carregados com sucesso. Total de registros: {len(result)}")
+            return result
+        except Exception as e:
+            raise Exception(f"Erro ao carregar dados: {str(e)}")
+
+
+def migrate_json(source: str = "data.json", target: str = "data.olxb", codec: str | None = None) -> dict:
+    """Converte um data.json para o formato em blocos, uma coleta por bloco.
+
+    O arquivo novo é gravado ao lado e só assume o nome final depois de
+    relido e conferido; o data.json original não é alterado.
+
+    Returns:
+        dict: Coletas, itens e tamanhos dos dois arquivos
+    """
+    if scan_blocks(target)[0]:
+        raise Exception(f"{target} já contém dados; remova-o antes de migrar")
+    with open(source, 'r') as f:
+        runs = json.load(f)
+    codec = codec or os.getenv('OLX_STORAGE_CODEC', GZIP)
+    if codec not in available_codecs():
+        raise Exception(f"Codec {codec} indisponível (instale zstandard)")
+
+    temporary = target + '.tmp'
+    with open(temporary, 'wb') as f:
+        for entry in runs:
+            # Coletas antigas do data.json não têm data de gravação; o bloco recebe a da migração
+            f.write(encode_block(entry['url'], entry['data'], codec, entry.get('saved')))
+        f.flush()
+        os.fsync(f.fileno())
+    blocks, _ = scan_blocks(temporary)
+    items = sum(len(entry['data']) for entry in runs)
+    if len(blocks) != len(runs) or sum(block.header['items'] for block in blocks) != items:
+        os.remove(temporary)
+        raise Exception("Conferência da migração falhou; o arquivo original foi mantido")
+    os.replace(temporary, target)
+    return {
+        'runs': len(runs),
+        'items': items,
+        'codec': codec,
+        'source_bytes': os.path.getsize(source),
+        'target_bytes': os.path.getsize(target),
+    }
+
+
+def open_repository(index_path: str | None = None) -> JsonRepository:
+    """Repositório configurado por OLX_STORAGE.
+
+    'json' usa o data.json, 'blocks' o data.olxb comprimido e 'auto' (padrão)
+    usa o data.olxb se ele existir (por exemplo, depois de migrar), senão o data.json.
+    """
+    storage = os.getenv('OLX_STORAGE', 'auto')
+    if storage == 'blocks' or (storage == 'auto' and os.path.exists("data.olxb")):
+        return BlockRepository(index_path=index_path)
+    return JsonRepository(index_path=index_path)
@@ -0,0 +1,249 @@
+import atexit
+import threading
+import time
+import weakref
+from importlib.util import find_spec
+
+_live_pools = weakref.WeakSet()
+
+
+@atexit.register
+def _close_live_pools() -> None:
+    """Proteção contra vazamento: fecha navegadores que ficaram abertos no fim do processo."""
+    for pool in list(_live_pools):
+        pool.close()
+
+
+def driver_rss(driver) -> int | None:
+    """Memória residente (bytes) do chromedriver e de todos os processos do Chrome abaixo dele.
+
+    Cobre o processo principal, os renderers e o processo de GPU, que o
+    heap JS de uma página não mostra. Retorna None sem o pacote `psutil` ou
+    quando o PID do driver não é conhecido.
+    """
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if process is None or not find_spec('psutil'):
+        return None
+    import psutil
+    try:
+        root = psutil.Process(process.pid)
+        tree = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    total = 0
+    for member in tree:
+        try:
+            total += member.memory_info().rss
+        except psutil.Error:
+            # Processos filhos podem terminar entre a listagem e a leitura
+            pass
+    return total
+
+
+class PooledBrowser:
+    """Navegador gerenciado pelo pool.
+
+    Attributes:
+        driver (webdriver.Chrome): Instância do Selenium
+        proxy (str): Proxy com que o navegador foi lançado (fixo até o recycle)
+        pages (int): Páginas carregadas desde o lançamento
+        created_at (float): Instante do lançamento (time.monotonic)
+        baseline_rss (int): Memória dos processos medida na primeira página, base do limite de crescimento
+    """
+
+    def __init__(self, driver, proxy: str | None):
+        self.driver = driver
+        self.proxy = proxy
+        self.pages = 0
+        self.created_at = time.monotonic()
+        self.baseline_rss = None
+
+    def __repr__(self):
+        return f"PooledBrowser(proxy={self.proxy!r}, pages={self.pages})"
+
+
+class BrowserPool:
+    """Pool de navegadores Chrome reaproveitados entre itens e execuções.
+
+    Abrir o Chrome custa segundos, então os navegadores são pré-aquecidos em
+    segundo plano e devolvidos ao pool em vez de fechados. Cada navegador é
+    reciclado depois de `max_pages` páginas ou quando a memória residente
+    dos seus processos (`driver_rss`) cresce mais que `max_rss_growth_mb`
+    desde a primeira página. Navegadores ociosos passam por um health check
+    antes de serem entregues, e os que sobrarem abertos são fechados no
+    `close` ou na saída do processo. Fechar um navegador pode levar
+    segundos, então nunca acontece com o lock do pool em mãos.
+
+    Attributes:
+        factory (callable): Cria um driver para o proxy informado
+        size (int): Navegadores mantidos pré-aquecidos
+        max_pages (int): Páginas por navegador antes do recycle
+        max_rss_growth_mb (float): Crescimento de memória residente tolerado antes do recycle
+    """
+
+    def __init__(self, factory, size: int = 1, max_pages: int = 200, max_rss_growth_mb: float = 500.0):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_growth_mb = max_rss_growth_mb
+        self._idle = []
+        self._in_use = set()
+        self._warming = {}
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {'launched': 0, 'reused': 0, 'recycled': 0, 'unhealthy': 0, 'launch_failures': 0}
+        _live_pools.add(self)
+
+    def _launch(self, proxy: str | None) -> PooledBrowser:
+        try:
+            browser = PooledBrowser(self.factory(proxy), proxy)
+        except Exception:
+            with self._cond:
+                self._stats['launch_failures'] += 1
+            raise
+        with self._cond:
+            self._stats['launched'] += 1
+        return browser
+
+    def _warm(self, proxy: str | None) -> None:
+        try:
+            browser = self._launch(proxy)
+        except Exception as e:
+            print(f"[BROWSER_POOL] Falha ao pré-aquecer navegador: {e}")
+            browser = None
+        surplus = []
+        with self._cond:
+            self._warming[proxy] -= 1
+            if browser and self._closed:
+                surplus.append(browser)
+            elif browser:
+                self._idle.append(browser)
+                surplus = self._trim()
+            self._cond.notify_all()
+        for browser in surplus:
+            self._quit(browser)
+
+    def prewarm(self, proxy: str | None = None, count: int | None = None) -> int:
+        """Lança navegadores em segundo plano até ter `count` (padrão: `size`) livres para o proxy."""
+        count = self.size if count is None else count
+        with self._cond:
+            if self._closed:
+                return 0
+            ready = sum(1 for b in self._idle if b.proxy == proxy) + self._warming.get(proxy, 0)
+            missing = max(count - ready, 0)
+            self._warming[proxy] = self._warming.get(proxy, 0) + missing
+        for _ in range(missing):
+            threading.Thread(target=self._warm, args=(proxy,), daemon=True).start()
+        return missing
+
+    def acquire(self, proxy: str | None = None, timeout: float = 60.0) -> PooledBrowser:
+        """Entrega um navegador saudável lançado com o proxy informado.
+
+        Reaproveita um ocioso, aguarda um que esteja sendo pré-aquecido ou
+        lança um novo.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Pool de navegadores encerrado")
+                browser = next((b for b in self._idle if b.proxy == proxy), None)
+                if browser is None and self._warming.get(proxy, 0) and time.monotonic() < deadline:
+                    self._cond.wait(min(deadline - time.monotonic(), 1.0))
+                    continue
+                if browser is not None:
+                    self._idle.remove(browser)
+            if browser is None:
+                browser = self._launch(proxy)
+            elif self.is_healthy(browser):
+                with self._cond:
+                    self._stats['reused'] += 1
+            else:
+                with self._cond:
+                    self._stats['unhealthy'] += 1
+                self._quit(browser)
+                continue
+            with self._cond:
+                self._in_use.add(browser)
+            return browser
+
+    def release(self, browser: PooledBrowser, discard: bool = False) -> None:
+        """Devolve o navegador ao pool, limpando cookies para não vazar sessão entre usos."""
+        if browser is None:
+            return
+        with self._cond:
+            self._in_use.discard(browser)
+        if not discard and not self._closed:
+            try:
+                browser.driver.delete_all_cookies()
+                browser.driver.get('about:blank')
+            except Exception:
+                discard = True
+        surplus = []
+        with self._cond:
+            if discard or self._closed:
+                surplus.append(browser)
+            else:
+                self._idle.append(browser)
+                surplus = self._trim()
+            self._cond.notify_all()
+        for browser in surplus:
+            self._quit(browser)
+
+    def _trim(self) -> list[PooledBrowser]:
+        """Mantém no máximo `size` ociosos; retorna os excedentes (os mais antigos) para fechar fora do lock."""
+        surplus = self._idle[:max(len(self._idle) - self.size, 0)]
+        del self._idle[:len(surplus)]
+        return surplus
+
+    def is_healthy(self, browser: PooledBrowser) -> bool:
+        """Verifica se a sessão do WebDriver ainda responde."""
+        try:
+            return browser.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def record_page(self, browser: PooledBrowser) -> bool:
+        """Conta uma página carregada e retorna True se o navegador deve ser reciclado."""
+        browser.pages += 1
+        if browser.pages >= self.max_pages:
+            return True
+        rss = driver_rss(browser.driver)
+        if not rss:
+            return False
+        if browser.baseline_rss is None:
+            browser.baseline_rss = rss
+            return False
+        return rss - browser.baseline_rss > self.max_rss_growth_mb * 1024 * 1024
+
+    def recycle(self, browser: PooledBrowser) -> None:
+        """Fecha o navegador e pré-aquece um substituto com o mesmo proxy."""
+        with self._cond:
+            self._stats['recycled'] += 1
+        print(f"[BROWSER_POOL] Reciclando navegador após {browser.pages} página(s)")
+        self.release(browser, discard=True)
+        self.prewarm(browser.proxy, count=1)
+
+    def _quit(self, browser: PooledBrowser) -> None:
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            print(f"[BROWSER_POOL] Erro ao fechar navegador: {e}")
+
+    def stats(self) -> dict:
+        with self._cond:
+            return dict(self._stats, idle=len(self._idle), in_use=len(self._in_use),
+                        warming=sum(self._warming.values()))
+
+    def close(self) -> None:
+        """Fecha todos os navegadores, ociosos e em uso."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            browsers = self._idle + list(self._in_use)
+            self._idle, self._in_use = [], set()
+            self._cond.notify_all()
+        for browser in browsers:
+            self._quit(browser)
+        _live_pools.discard(self)
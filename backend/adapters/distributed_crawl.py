@@ -0,0 +1,192 @@
+import os
+import socket
+import threading
+import time
+
+from ..domain.entities.scraping import ScrapingData
+from .work_queue import DETAIL, LISTING, SqliteWorkQueue, Task
+
+
+def open_queue(path: str | None = None) -> SqliteWorkQueue:
+    """Abre a fila compartilhada configurada pelas variáveis OLX_QUEUE_*."""
+    return SqliteWorkQueue(
+        path or os.getenv('OLX_QUEUE_FILE', 'crawl_queue.db'),
+        visibility_timeout=float(os.getenv('OLX_QUEUE_VISIBILITY', '300')),
+        max_attempts=int(os.getenv('OLX_QUEUE_MAX_ATTEMPTS', '5')),
+    )
+
+
+def start_crawl(queue: SqliteWorkQueue, url: str) -> str:
+    """Cria uma busca na fila a partir da primeira página de resultados."""
+    crawl = queue.create_crawl(url)
+    queue.enqueue(crawl, LISTING, '1', {'url': url, 'page': 1})
+    print(f"[QUEUE] Busca {crawl} criada para {url}")
+    return crawl
+
+
+def merge_results(queue: SqliteWorkQueue, crawl: str, repository) -> ScrapingData | None:
+    """Salva os resultados da busca no repositório uma única vez.
+
+    Os resultados já são únicos por link na fila; a busca é marcada como
+    salva para que um coordenador reiniciado não grave o mesmo lote de novo.
+    """
+    info = queue.crawl(crawl)
+    if info is None:
+        raise Exception(f"Busca {crawl} não encontrada na fila")
+    if info['status'] == 'saved':
+        print(f"[QUEUE] Busca {crawl} já foi salva no repositório")
+        return None
+    data = ScrapingData(info['url'], queue.results(crawl))
+    repository.save(data)
+    queue.set_crawl_status(crawl, 'saved')
+    return data
+
+
+class CrawlWorker:
+    """Processa tarefas da fila compartilhada com um BeautifulSoupAdapter.
+
+    Páginas de listagem enfileiram os anúncios encontrados e as próximas
+    páginas conhecidas (a fila descarta repetidos); anúncios têm o telefone
+    revelado e o resultado gravado na fila. Enquanto uma tarefa roda, o
+    arrendamento é renovado em segundo plano. Um anúncio cuja revelação
+    falha em todas as tentativas é gravado com telefone 'N/A', como no modo
+    de processo único.
+
+    A prioridade e o orçamento de revelações (RevealScheduler) não valem
+    neste modo: cada anúncio é uma tarefa da fila, revelada na ordem em que
+    é arrendada.
+
+    Attributes:
+        adapter (BeautifulSoupAdapter): Adaptador que faz as requisições e revelações
+        queue (SqliteWorkQueue): Fila compartilhada
+        worker_id (str): Identificação do worker nos arrendamentos
+        threads (int): Tarefas processadas em paralelo
+        idle_timeout (float): Tempo sem tarefas até encerrar (0 = nunca)
+    """
+
+    def __init__(self, adapter, queue: SqliteWorkQueue, worker_id: str | None = None, threads: int = 1,
+                 idle_timeout: float = 30.0, poll_interval: float = 1.0):
+        self.adapter = adapter
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.threads = max(threads, 1)
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.processed = {LISTING: 0, DETAIL: 0, 'failed': 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run(self, crawl: str | None = None) -> dict:
+        """Processa tarefas até a busca terminar (ou a fila ficar ociosa por `idle_timeout`)."""
+        print(f"[WORKER] {self.worker_id} iniciado com {self.threads} thread(s)")
+        with self.adapter.work_session():
+            loops = [threading.Thread(target=self._loop, args=(crawl,), daemon=True) for _ in range(self.threads)]
+            for loop in loops:
+                loop.start()
+            try:
+                for loop in loops:
+                    while loop.is_alive():
+                        loop.join(0.5)
+            except KeyboardInterrupt:
+                print("[WORKER] Interrompido; tarefas em andamento voltam para a fila ao expirar o arrendamento")
+                self._stop.set()
+                raise
+        print(f"[WORKER] {self.worker_id} encerrado: {self.processed}")
+        return dict(self.processed)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self, crawl: str | None) -> None:
+        idle_since = None
+        while not self._stop.is_set():
+            task = self.queue.lease(self.worker_id, crawl)
+            if task is None:
+                if crawl and self.queue.is_finished(crawl):
+                    return
+                idle_since = idle_since or time.monotonic()
+                if self.idle_timeout and time.monotonic() - idle_since > self.idle_timeout:
+                    return
+                self._stop.wait(self.poll_interval)
+                continue
+            idle_since = None
+            self._execute(task)
+
+    def _execute(self, task: Task) -> None:
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(self.queue.visibility_timeout / 3):
+                if not self.queue.extend(task, self.worker_id):
+                    print(f"[WORKER] Arrendamento de {task} perdido")
+                    return
+
+        threading.Thread(target=heartbeat, daemon=True).start()
+        try:
+            if task.kind == LISTING:
+                self._process_listing(task)
+            else:
+                self._process_detail(task)
+            self.queue.complete(task, self.worker_id)
+            with self._lock:
+                self.processed[task.kind] += 1
+        except Exception as e:
+            print(f"[WORKER] Falha em {task}: {e}")
+            if task.kind == DETAIL and task.attempts >= self.queue.max_attempts:
+                # Última tentativa: o anúncio entra no resultado sem telefone em vez de sumir
+                self._save_detail(task, None)
+            self.queue.fail(task, self.worker_id, str(e))
+            with self._lock:
+                self.processed['failed'] += 1
+        finally:
+            done.set()
+
+    def _process_listing(self, task: Task) -> None:
+        url, page = task.payload['url'], task.payload['page']
+        items, info = self.adapter.fetch_listing_page(url, page)
+        if not items:
+            print(f"[WORKER] Página {page} sem itens, fim dos resultados")
+            return
+        if info.current is not None and info.current != page:
+            print(f"[WORKER] Pedida a página {page}, o site devolveu a {info.current}; fim dos resultados")
+            return
+        new = self.queue.enqueue_many(task.crawl, DETAIL, [(item['link'], item) for item in items])
+        print(f"[WORKER] Página {page}: {len(items)} anúncios, {new} novos")
+        if not new:
+            print(f"[WORKER] Página {page} só repete anúncios já vistos; fim dos resultados")
+            return
+        if not info.has_next:
+            return
+        last = max(info.total or 0, page + 1)
+        if self.adapter.max_pages:
+            last = min(last, self.adapter.max_pages)
+        self.queue.enqueue_many(task.crawl, LISTING,
+                                [(str(n), {'url': url, 'page': n}) for n in range(page + 1, last + 1)])
+
+    def _process_detail(self, task: Task) -> None:
+        self._save_detail(task, self.adapter.reveal_phone(task.payload))
+
+    def _save_detail(self, task: Task, phone: str | None) -> None:
+        item = task.payload
+        item['phone'] = phone if phone else 'N/A'
+        self.queue.add_result(task.crawl, task.key, item, self.worker_id)
+
+
+def run_coordinator(adapter, repository, queue: SqliteWorkQueue, url: str | None = None,
+                    crawl: str | None = None, work: bool = True, threads: int = 1,
+                    poll_interval: float = 5.0) -> ScrapingData | None:
+    """Cria (ou retoma) uma busca, acompanha os workers e salva o resultado ao final.
+
+    Com `work`, o próprio coordenador também processa tarefas.
+    """
+    if crawl is None:
+        crawl = start_crawl(queue, url)
+    else:
+        print(f"[QUEUE] Retomando busca {crawl}")
+    if work:
+        CrawlWorker(adapter, queue, threads=threads, idle_timeout=0).run(crawl)
+    while not queue.is_finished(crawl):
+        print(f"[QUEUE] Busca {crawl}: {queue.counts(crawl)}")
+        time.sleep(poll_interval)
+    print(f"[QUEUE] Busca {crawl} concluída: {queue.counts(crawl)}")
+    return merge_results(queue, crawl, repository)
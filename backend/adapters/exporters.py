@@ -0,0 +1,56 @@
+import csv
+import json
+import os
+
+# Formatos aceitos, escolhidos pela extensão do arquivo
+FORMATS = {'.xlsx': 'excel', '.csv': 'csv', '.jsonl': 'jsonl'}
+
+
+def export_format(filename: str, fmt: str | None = None) -> str:
+    """Formato da exportação: o informado ou o da extensão do arquivo."""
+    fmt = fmt or FORMATS.get(os.path.splitext(filename)[1].lower())
+    if fmt not in FORMATS.values():
+        raise Exception(f"Formato de exportação não suportado: {filename} (use .xlsx, .csv ou .jsonl)")
+    return fmt
+
+
+def _columns(rows: list[dict]) -> list[str]:
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def write_rows(rows, filename: str, fmt: str | None = None) -> int:
+    """Grava as linhas em Excel, CSV ou JSONL; retorna quantas foram gravadas.
+
+    O arquivo é gravado ao lado e só substitui o destino quando termina,
+    então uma exportação interrompida não deixa um arquivo pela metade.
+    """
+    fmt = export_format(filename, fmt)
+    root, extension = os.path.splitext(filename)
+    temporary = f"{root}.tmp{extension}"
+    count = 0
+    try:
+        if fmt == 'jsonl':
+            with open(temporary, 'w', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + '\n')
+                    count += 1
+        else:
+            rows = list(rows)
+            count = len(rows)
+            if fmt == 'csv':
+                with open(temporary, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=_columns(rows))
+                    writer.writeheader()
+                    writer.writerows(rows)
+            else:
+                import pandas as pd  # importado apenas na exportação
+                pd.DataFrame(rows, columns=_columns(rows)).to_excel(temporary, index=False, engine='openpyxl')
+        os.replace(temporary, filename)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return count
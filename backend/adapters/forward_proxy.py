@@ -0,0 +1,361 @@
+import asyncio
+import base64
+import itertools
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Cabeçalhos hop-by-hop removidos das requisições HTTP simples encaminhadas
+_HOP_HEADERS = (b'connection', b'proxy-connection', b'keep-alive', b'proxy-authorization')
+# Respostas que indicam falha do próprio proxy de saída (não do destino)
+_PROXY_ERROR_STATUS = (b'407', b'502')
+
+
+class UpstreamProxy:
+    """Proxy de saída com estado de saúde e estatísticas.
+
+    Attributes:
+        address (str): host:porta do proxy
+        active (int): Conexões abertas no momento
+        failures (int): Falhas consecutivas
+        cooldown_until (float): Instante (time.monotonic) até o qual o proxy fica fora de rotação
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        host, _, port = address.rpartition(':')
+        self.host = host
+        self.port = int(port)
+        self.active = 0
+        self.failures = 0
+        self.cooldown_until = 0.0
+        self.stats = {'connections': 0, 'failures': 0, 'bytes_up': 0, 'bytes_down': 0, 'connect_seconds': 0.0}
+
+    def __repr__(self):
+        return f"UpstreamProxy({self.address!r})"
+
+
+class LocalForwardingProxy:
+    """Proxy HTTP/CONNECT local que distribui conexões entre os proxies de saída.
+
+    O Chrome fixa o `--proxy-server` no lançamento; apontando navegadores e
+    sessões `requests` para este proxy local, a troca de proxy de saída vira
+    uma decisão por conexão, sem relançar o navegador. Cada conexão escolhe
+    o proxy saudável com menos conexões ativas; falhas ao conectar ou no
+    CONNECT são repetidas de forma transparente no próximo proxy, e proxies
+    com falhas seguidas ficam em cooldown. Sem proxies de saída, conecta
+    direto ao destino.
+
+    Sessões HTTP podem se fixar em um proxy de saída usando o endereço de
+    `route` (o proxy vai no usuário do Proxy-Authorization); assim cookies,
+    fingerprint e throttle da sessão acompanham o IP de saída. O failover
+    continua valendo para elas.
+
+    Roda um loop asyncio em uma thread própria.
+
+    Attributes:
+        host (str): Interface de escuta
+        port (int): Porta de escuta (0 escolhe uma livre)
+        connect_timeout (float): Tempo limite para conectar e negociar com o proxy de saída
+        max_attempts (int): Proxies tentados por conexão antes de desistir
+        max_failures (int): Falhas seguidas até o cooldown do proxy
+        cooldown (float): Duração do cooldown em segundos
+    """
+
+    def __init__(self, upstreams: list[str] | None = None, host: str = '127.0.0.1', port: int = 0,
+                 connect_timeout: float = 5.0, max_attempts: int = 3, max_failures: int = 3,
+                 cooldown: float = 60.0):
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.max_attempts = max_attempts
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self._upstreams = {}
+        self._rotation = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {'connections': 0, 'failovers': 0, 'errors': 0, 'direct': 0}
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self.set_upstreams(upstreams or [])
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def set_upstreams(self, addresses: list[str]) -> None:
+        """Atualiza os proxies de saída mantendo o estado dos que continuam na lista."""
+        with self._lock:
+            self._upstreams = {a: self._upstreams.get(a) or UpstreamProxy(a) for a in addresses}
+
+    def pick(self) -> str | None:
+        """Próximo proxy de saída fora de cooldown, em rodízio; None sem proxies de saída."""
+        now = time.monotonic()
+        with self._lock:
+            pool = [u for u in self._upstreams.values() if u.cooldown_until <= now] or list(self._upstreams.values())
+            if not pool:
+                return None
+            return pool[next(self._rotation) % len(pool)].address
+
+    def route(self, upstream: str) -> str:
+        """Endereço do proxy local fixado no proxy de saída `upstream` (host:porta)."""
+        host, _, port = upstream.rpartition(':')
+        return f"{host}_{port}@{self.address}"
+
+    @staticmethod
+    def _pinned(head: bytes) -> str | None:
+        """Proxy de saída pedido pela sessão no Proxy-Authorization (ver `route`)."""
+        for line in head.split(b'\r\n')[1:]:
+            name, _, value = line.partition(b':')
+            if name.strip().lower() != b'proxy-authorization':
+                continue
+            scheme, _, credentials = value.strip().partition(b' ')
+            if scheme.lower() != b'basic':
+                return None
+            try:
+                user = base64.b64decode(credentials).decode('latin-1').partition(':')[0]
+            except ValueError:
+                return None
+            host, _, port = user.rpartition('_')
+            return f"{host}:{port}" if host else None
+        return None
+
+    def _choose(self, tried: set, pinned: str | None = None) -> UpstreamProxy | None:
+        now = time.monotonic()
+        with self._lock:
+            upstream = self._upstreams.get(pinned)
+            if upstream and pinned not in tried and upstream.cooldown_until <= now:
+                upstream.active += 1
+                return upstream
+            candidates = [u for u in self._upstreams.values() if u.address not in tried]
+            healthy = [u for u in candidates if u.cooldown_until <= now]
+            # Se todos estão em cooldown, tenta o que sai primeiro em vez de falhar
+            pool = healthy or sorted(candidates, key=lambda u: u.cooldown_until)[:1]
+            if not pool:
+                return None
+            turn = next(self._rotation)
+            upstream = min(pool, key=lambda u: (u.active, (pool.index(u) - turn) % len(pool)))
+            upstream.active += 1
+            return upstream
+
+    def _finish(self, upstream: UpstreamProxy, ok: bool) -> None:
+        with self._lock:
+            upstream.active -= 1
+            if ok:
+                upstream.failures = 0
+                return
+            upstream.failures += 1
+            upstream.stats['failures'] += 1
+            if upstream.failures >= self.max_failures:
+                upstream.cooldown_until = time.monotonic() + self.cooldown
+                upstream.failures = 0
+                print(f"[LOCAL_PROXY] {upstream.address} com falhas seguidas, em cooldown por {self.cooldown:.0f}s")
+
+    def _count(self, name: str, amount=1, upstream: UpstreamProxy | None = None) -> None:
+        with self._lock:
+            if upstream is None:
+                self._stats[name] += amount
+            else:
+                upstream.stats[name] += amount
+
+    async def _open_upstream(self, upstream: UpstreamProxy, connect_target: str | None,
+                             http_head: bytes | None):
+        """Conecta ao proxy de saída e negocia o túnel CONNECT ou envia a requisição HTTP.
+
+        Requisições HTTP sem corpo têm o cabeçalho da resposta lido aqui, para
+        que um 502/407 do proxy ainda possa ser repetido em outro proxy.
+
+        Returns:
+            tuple: (reader, writer, bytes já lidos da resposta a repassar ao cliente)
+        """
+        start = time.perf_counter()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(upstream.host, upstream.port), self.connect_timeout)
+        prelude = b''
+        try:
+            if connect_target:
+                writer.write(f"CONNECT {connect_target} HTTP/1.1\r\nHost: {connect_target}\r\n\r\n".encode())
+                head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.connect_timeout)
+                status = head.split(b' ', 2)[1]
+                if status != b'200':
+                    raise ConnectionError(f"CONNECT recusado pelo proxy ({status.decode()})")
+            elif http_head is not None:
+                writer.write(http_head)
+                if not self._has_body(http_head):
+                    prelude = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 30)
+                    if prelude.split(b' ', 2)[1] in _PROXY_ERROR_STATUS:
+                        raise ConnectionError("Proxy de saída recusou a requisição")
+        except Exception:
+            writer.close()
+            raise
+        self._count('connect_seconds', time.perf_counter() - start, upstream)
+        return reader, writer, prelude
+
+    @staticmethod
+    def _has_body(head: bytes) -> bool:
+        lowered = head.lower()
+        return b'\r\ncontent-length:' in lowered or b'\r\ntransfer-encoding:' in lowered
+
+    async def _connect(self, target_host: str, target_port: int, tunnel: bool, http_head: bytes | None,
+                       pinned: str | None = None):
+        """Abre a conexão de saída com failover entre proxies, começando pelo fixado (`pinned`).
+
+        Returns:
+            tuple: (reader, writer, upstream, prelude) ou None se todas as tentativas falharem
+        """
+        with self._lock:
+            has_upstreams = bool(self._upstreams)
+        if not has_upstreams:
+            self._count('direct')
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(target_host, target_port), self.connect_timeout)
+            if http_head is not None:
+                writer.write(self._rewrite_http_head(http_head, origin_form=True))
+            return reader, writer, None, b''
+
+        tried = set()
+        for attempt in range(self.max_attempts):
+            upstream = self._choose(tried, pinned)
+            if upstream is None:
+                break
+            tried.add(upstream.address)
+            if attempt:
+                self._count('failovers')
+            try:
+                reader, writer, prelude = await self._open_upstream(
+                    upstream, f"{target_host}:{target_port}" if tunnel else None,
+                    None if tunnel else self._rewrite_http_head(http_head, origin_form=False))
+                self._count('connections', 1, upstream)
+                return reader, writer, upstream, prelude
+            except Exception:
+                self._finish(upstream, ok=False)
+        return None
+
+    async def _pipe(self, reader, writer, upstream: UpstreamProxy | None, counter: str) -> None:
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+                if upstream:
+                    self._count(counter, len(data), upstream)
+        except Exception:
+            pass
+        finally:
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _rewrite_http_head(head: bytes, origin_form: bool) -> bytes:
+        """Força uma requisição por conexão (assim cada requisição escolhe seu proxy)."""
+        lines = head.split(b'\r\n')
+        method, target, version = lines[0].split(b' ', 2)
+        if origin_form:
+            parts = urlsplit(target.decode('latin-1'))
+            path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+            target = path.encode('latin-1')
+        headers = [line for line in lines[1:] if line and line.split(b':', 1)[0].strip().lower() not in _HOP_HEADERS]
+        return b'\r\n'.join([b' '.join([method, target, version])] + headers + [b'Connection: close', b'', b''])
+
+    async def _handle(self, client_reader, client_writer) -> None:
+        self._count('connections')
+        upstream = None
+        ok = False
+        try:
+            head = await asyncio.wait_for(client_reader.readuntil(b'\r\n\r\n'), 30)
+            method, target, _ = head.split(b'\r\n', 1)[0].split(b' ', 2)
+            tunnel = method.upper() == b'CONNECT'
+            if tunnel:
+                host, _, port = target.decode('latin-1').rpartition(':')
+                port = int(port)
+            else:
+                parts = urlsplit(target.decode('latin-1'))
+                host, port = parts.hostname, parts.port or 80
+
+            connection = await self._connect(host, port, tunnel, None if tunnel else head, self._pinned(head))
+            if connection is None:
+                self._count('errors')
+                client_writer.write(b'HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+                await client_writer.drain()
+                return
+            upstream_reader, upstream_writer, upstream, prelude = connection
+
+            if tunnel:
+                client_writer.write(b'HTTP/1.1 200 Connection established\r\n\r\n')
+            elif prelude:
+                client_writer.write(prelude)
+            await asyncio.gather(
+                self._pipe(client_reader, upstream_writer, upstream, 'bytes_up'),
+                self._pipe(upstream_reader, client_writer, upstream, 'bytes_down'),
+            )
+            ok = True
+        except (Exception, asyncio.CancelledError):
+            self._count('errors')
+        finally:
+            if upstream:
+                self._finish(upstream, ok)
+            try:
+                client_writer.close()
+            except Exception:
+                pass
+
+    def start(self) -> 'LocalForwardingProxy':
+        """Inicia o loop asyncio em segundo plano e aguarda a porta ficar disponível."""
+        if self._thread:
+            return self
+        self._thread = threading.Thread(target=self._run, daemon=True, name='local-proxy')
+        self._thread.start()
+        self._ready.wait()
+        if self._server is None:
+            raise RuntimeError("Falha ao iniciar o proxy local")
+        print(f"[LOCAL_PROXY] Escutando em {self.address} com {len(self._upstreams)} proxy(s) de saída")
+        return self
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port))
+            self.port = self._server.sockets[0].getsockname()[1]
+        except Exception as e:
+            print(f"[LOCAL_PROXY] Erro ao abrir a porta: {e}")
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.close()
+
+    def stop(self) -> None:
+        if self._loop and self._thread and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return dict(self._stats, upstreams={
+                u.address: dict(u.stats, active=u.active, connect_seconds=round(u.stats['connect_seconds'], 3),
+                                cooldown_seconds=round(max(u.cooldown_until - now, 0.0), 1))
+                for u in self._upstreams.values()
+            })
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,158 @@
+import os
+import threading
+from importlib.util import find_spec
+
+_DIRECT = 'direct'
+
+
+def _accept_encoding() -> str:
+    """Codificações que o urllib3 consegue descompactar com os pacotes instalados."""
+    encodings = ['gzip', 'deflate']
+    if find_spec('brotli') or find_spec('brotlicffi'):
+        encodings.append('br')
+    if find_spec('zstandard'):
+        encodings.append('zstd')
+    return ', '.join(encodings)
+
+
+class _HttpxResponse:
+    """Expõe uma resposta do httpx com a mesma interface usada da resposta do requests."""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.url = str(response.url)
+        self.headers = response.headers
+        self.content = response.content
+        self.text = response.text
+        self.encoding = response.encoding
+        self.http_version = response.http_version
+
+
+class HttpClient:
+    """Cliente HTTP compartilhado com conexões keep-alive por proxy.
+
+    Cada proxy (ou acesso direto) tem sua própria sessão, com o pool de
+    conexões do urllib3 dimensionado por `pool_connections`/`pool_maxsize`.
+    Assim páginas seguidas pelo mesmo proxy reaproveitam as conexões TCP/TLS
+    em vez de refazer o handshake. Com `http2` e o pacote `httpx[http2]`
+    instalado, as sessões usam HTTP/2 (várias requisições multiplexadas em
+    uma conexão); sem ele, o cliente continua em HTTP/1.1.
+
+    Attributes:
+        pool_connections (int): Hosts com pool de conexões mantido por sessão
+        pool_maxsize (int): Conexões keep-alive por host
+        connect_timeout (float): Tempo máximo para conectar (s)
+        read_timeout (float): Tempo máximo sem receber dados (s)
+        http2 (bool): Se as sessões usam HTTP/2
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, connect_timeout: float = 5.0,
+                 read_timeout: float = 15.0, http2: bool = False):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.http2 = http2
+        if http2 and not (find_spec('httpx') and find_spec('h2')):
+            print("[HTTP] HTTP/2 indisponível (instale httpx[http2]); usando HTTP/1.1")
+            self.http2 = False
+        self.accept_encoding = _accept_encoding()
+        self._sessions = {}
+        self._requests = {}
+        self._lock = threading.Lock()
+
+    def timeout(self, connect: float | None = None, read: float | None = None) -> tuple[float, float]:
+        return (self.connect_timeout if connect is None else connect,
+                self.read_timeout if read is None else read)
+
+    def _new_session(self, proxy: str | None):
+        proxy_url = f"http://{proxy}" if proxy else None
+        if self.http2:
+            import httpx
+            return httpx.Client(
+                http2=True, proxy=proxy_url, follow_redirects=True,
+                headers={'Accept-Encoding': self.accept_encoding},
+                limits=httpx.Limits(max_connections=self.pool_connections * self.pool_maxsize,
+                                    max_keepalive_connections=self.pool_maxsize))
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Accept-Encoding'] = self.accept_encoding
+        if proxy_url:
+            session.proxies = {'http': proxy_url, 'https': proxy_url}
+        # Não herdar HTTP(S)_PROXY do ambiente: o proxy é sempre o da chave
+        session.trust_env = False
+        return session
+
+    def session(self, proxy: str | None = None):
+        """Sessão persistente do proxy (None para acesso direto)."""
+        key = proxy or _DIRECT
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = self._new_session(proxy)
+                self._requests[key] = 0
+            self._requests[key] += 1
+            return session
+
+    def get(self, url: str, proxy: str | None = None, headers: dict | None = None,
+            timeout: float | tuple[float, float] | None = None):
+        """GET pela sessão do proxy; `timeout` aceita um número (leitura) ou (conexão, leitura)."""
+        if timeout is None:
+            timeout = self.timeout()
+        elif not isinstance(timeout, tuple):
+            timeout = self.timeout(min(self.connect_timeout, timeout), timeout)
+        session = self.session(proxy)
+        if self.http2:
+            import httpx
+            connect, read = timeout
+            response = session.get(url, headers=headers,
+                                   timeout=httpx.Timeout(read, connect=connect))
+            return _HttpxResponse(response)
+        return session.get(url, headers=headers, timeout=timeout)
+
+    def discard(self, proxy: str | None) -> None:
+        """Fecha as conexões de um proxy que deixou de ser usado."""
+        with self._lock:
+            session = self._sessions.pop(proxy or _DIRECT, None)
+            self._requests.pop(proxy or _DIRECT, None)
+        if session is not None:
+            session.close()
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._requests.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'protocol': 'HTTP/2' if self.http2 else 'HTTP/1.1',
+                'sessions': len(self._sessions),
+                'requests': sum(self._requests.values()),
+            }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Cliente compartilhado do processo, configurado pelas variáveis OLX_HTTP_*."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(
+                pool_connections=int(os.getenv('OLX_HTTP_POOL_CONNECTIONS', '10')),
+                pool_maxsize=int(os.getenv('OLX_HTTP_POOL_SIZE', '10')),
+                connect_timeout=float(os.getenv('OLX_HTTP_CONNECT_TIMEOUT', '5')),
+                read_timeout=float(os.getenv('OLX_HTTP_READ_TIMEOUT', '15')),
+                http2=os.getenv('OLX_HTTP2', '0') == '1',
+            )
+        return _client
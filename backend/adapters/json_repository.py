@@ -1,12 +1,20 @@
 import json
-import pandas as pd
+import os
+import time
 from ..domain.ports.repository import RepositoryPort
 from ..domain.entities.scraping import ScrapingData
+from .exporters import export_format, write_rows
+from .profiler import profiled
+from .search_index import SearchIndex
 
 class JsonRepository(RepositoryPort):
-    def __init__(self, filename: str = "data.json"):
+    def __init__(self, filename: str = "data.json", index_path: str | None = None):
         self.filename = filename
+        # Índice de busca ao lado do arquivo de dados (OLX_SEARCH_INDEX=0 desativa)
+        index_path = index_path or os.getenv('OLX_SEARCH_INDEX') or f"{os.path.splitext(filename)[0]}.index.db"
+        self.index = SearchIndex(index_path) if index_path != '0' else None
 
+    @profiled('repository_save')
     def save(self, data: ScrapingData) -> None:
         print(f"\nIniciando salvamento dos dados no arquivo {self.filename}")
         try:
@@ -20,6 +28,7 @@ class JsonRepository(RepositoryPort):
             # Adiciona novo dado
             existing_data.append({
                 'url': data.url,
+                'saved': time.strftime('%Y-%m-%dT%H:%M:%S'),
                 'data': data.data
             })
 
@@ -31,6 +40,73 @@ class JsonRepository(RepositoryPort):
         except Exception as e:
             raise Exception(f"Erro ao salvar dados: {str(e)}")
 
+        self._update_index(len(existing_data), lambda start: existing_data[start:])
+
+    def _file_signature(self) -> str | None:
+        try:
+            stat = os.stat(self.filename)
+            return f"{stat.st_mtime_ns}:{stat.st_size}"
+        except FileNotFoundError:
+            return None
+
+    def _update_index(self, total: int, read_runs) -> None:
+        """Indexa as coletas ainda não indexadas; falhas no índice não impedem o salvamento.
+
+        Args:
+            total (int): Coletas gravadas no arquivo de dados
+            read_runs: Função que recebe o índice da primeira coleta e itera as coletas
+                ({'url', 'data', 'saved'}; 'saved' ausente em coletas antigas) a partir dela
+        """
+        if self.index is None:
+            return
+        try:
+            indexed = int(self.index.get_meta('runs') or 0)
+            if indexed > total:
+                # O arquivo de dados foi substituído: o índice é refeito
+                self.index.clear()
+                indexed = 0
+            for run, entry in enumerate(read_runs(indexed) if indexed < total else [], indexed):
+                self.index.add_run(run, entry['url'], entry['data'], entry.get('saved'))
+            self.index.set_meta('runs', str(total))
+            self.index.set_meta('signature', self._file_signature() or '')
+            if total - indexed > 1:
+                print(f"[INDEX] {total - indexed} coletas indexadas")
+        except Exception as e:
+            print(f"[INDEX] Erro ao atualizar o índice de busca: {str(e)}")
+
+    def sync_index(self) -> None:
+        """Atualiza o índice se o arquivo de dados mudou fora deste repositório."""
+        if self.index is None:
+            raise Exception("Índice de busca desativado (OLX_SEARCH_INDEX=0)")
+        if self.index.get_meta('signature') == (self._file_signature() or ''):
+            return
+        self._update_index(*self._index_source())
+
+    def _index_source(self) -> tuple:
+        """Total de coletas no arquivo e a função que as lê a partir de uma posição."""
+        try:
+            with open(self.filename, 'r') as f:
+                runs = json.load(f)
+        except FileNotFoundError:
+            runs = []
+        return len(runs), lambda start: runs[start:]
+
+    def rebuild_index(self) -> None:
+        """Refaz o índice de busca a partir do arquivo de dados."""
+        if self.index is None:
+            raise Exception("Índice de busca desativado (OLX_SEARCH_INDEX=0)")
+        self.index.clear()
+        self.sync_index()
+
+    def search(self, query: str = '', **filters) -> list[dict]:
+        """Busca anúncios salvos pelo índice (ver SearchIndex.search)."""
+        self.sync_index()
+        return self.index.search(query, **filters)
+
+    def count(self, query: str = '', **filters) -> int:
+        self.sync_index()
+        return self.index.count(query, **filters)
+
     def load(self) -> list[ScrapingData]:
         print(f"\nCarregando dados do arquivo {self.filename}")
         try:
@@ -48,9 +124,54 @@ class JsonRepository(RepositoryPort):
     def export_to_excel(self, filename: str) -> None:
         print(f"\nIniciando exportação para Excel: {filename}")
         try:
+            import pandas as pd  # importado apenas na exportação
             data = self.load()
             df = pd.DataFrame([item.data for item in data])
             df.to_excel(filename, index=False)
             print(f"Dados exportados com sucesso para {filename}. Total de registros: {len(df)}")
         except Exception as e:
-            raise Exception(f"Erro ao exportar para Excel: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Erro ao exportar para Excel: {str(e)}")
+
+    def export(self, filename: str, target: str | None = None, fmt: str | None = None) -> dict:
+        """Exporta para Excel, CSV ou JSONL (formato pela extensão ou por `fmt`).
+
+        Sem `target`, exporta o histórico inteiro. Com `target`, exporta só os
+        anúncios novos ou alterados desde a última exportação desse destino,
+        com a coluna `change` ('new' ou 'changed'), e avança a marca do
+        destino depois que o arquivo é gravado.
+
+        Returns:
+            dict: Linhas exportadas, novas, alteradas e a sequência entregue
+        """
+        fmt = export_format(filename, fmt)
+        print(f"\nIniciando exportação ({fmt}): {filename}")
+        try:
+            if target is None:
+                rows = write_rows((item for entry in self.load() for item in entry.data), filename, fmt)
+                print(f"Dados exportados com sucesso para {filename}. Total de registros: {rows}")
+                return {'rows': rows}
+
+            if self.index is None:
+                raise Exception("Exportação incremental requer o índice de busca (OLX_SEARCH_INDEX)")
+            self.sync_index()
+            mark = self.index.get_watermark(target)
+            since = mark['seq'] if mark else 0
+            until = self.index.last_seq()
+            stats = {'rows': 0, 'new': 0, 'changed': 0, 'since': since, 'seq': until}
+
+            def changed_rows():
+                for item, change in self.index.changes(since, until):
+                    stats[change] += 1
+                    yield dict(item, change=change)
+
+            stats['rows'] = write_rows(changed_rows(), filename, fmt)
+            self.index.set_watermark(target, until, stats['rows'])
+            print(f"Exportação '{target}': {stats['new']} novos e {stats['changed']} alterados "
+                  f"desde {mark['updated'] if mark else 'o início'}")
+            return stats
+        except Exception as e:
+            raise Exception(f"Erro ao exportar dados: {str(e)}")
+
+    def export_targets(self) -> dict:
+        """Destinos de exportação incremental e a última exportação de cada um."""
+        return self.index.watermarks() if self.index is not None else {}
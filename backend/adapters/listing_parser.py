@@ -0,0 +1,373 @@
+import cProfile
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from urllib.parse import urljoin, urlparse
+
+from .listing_state import parse_listing_state
+from .listing_stream import split_fragments
+from .pagination import PageInfo, dom_page_info
+
+# Campos dos itens na ordem das tuplas compactas devolvidas pelos processos.
+# Os itens do DOM têm os quatro primeiros e o link do perfil do vendedor.
+ITEM_FIELDS = ('name', 'price', 'seller_name', 'link', 'id', 'price_value', 'currency',
+               'city', 'region', 'category', 'created', 'refreshed', 'seller_id', 'description')
+DOM_FIELDS = ITEM_FIELDS[:4] + ('seller_link',)
+
+
+class SelectorRecorder:
+    """Substituto do SelectorRegistry nos processos de parsing.
+
+    Entrega os seletores na ordem recebida do processo principal e anota os
+    acertos, que depois são repassados ao registro verdadeiro.
+    """
+
+    def __init__(self, order: dict):
+        self.order = order
+        self.records = []
+
+    def candidates(self, group: str) -> list[str]:
+        return self.order.get(group, [])
+
+    def record(self, group: str, selector: str | None) -> None:
+        self.records.append((group, selector))
+
+
+def _free_tree(soup) -> None:
+    """Desmonta a árvore do BeautifulSoup para liberar a memória sem esperar o coletor de ciclos.
+
+    Os nós têm referências circulares (pai <-> filhos, anterior <-> próximo).
+    O decompose do próprio documento não percorre os filhos, então cada nó
+    de primeiro nível é desmontado antes.
+    """
+    for element in list(soup.contents):
+        element.decompose()
+    soup.decompose()
+
+
+def _card_item(item_elem, base_url: str, base_domain: str, registry) -> dict | None:
+    """Extrai os campos de um cartão de anúncio; None se o cartão não tem os dados mínimos."""
+    item_data = {'name': 'N/A', 'price': 'N/A', 'seller_name': 'N/A', 'link': None, 'seller_link': None}
+
+    try:
+        # 1. Extrair e validar link
+        link_hit = None
+        for selector in registry.candidates('link'):
+            try:
+                link_elem = item_elem.select_one(selector)
+                if link_elem and link_elem.has_attr('href'):
+                    link = link_elem['href']
+                    if not link.startswith('http'):
+                        link = f"{base_url}{link}"
+                    if base_domain in link:
+                        item_data['link'] = link
+                        link_hit = selector
+                        print(f"[EXTRACT] Link encontrado: {link}")
+                        break
+            except Exception as e:
+                print(f"[EXTRACT] Erro ao extrair link com seletor {selector}: {e}")
+                continue
+        registry.record('link', link_hit)
+
+        if not item_data['link']:
+            print("[EXTRACT] Link inválido, pulando item")
+            return None
+
+        # 2. Extrair outros dados
+        for field in ['name', 'price', 'seller_name']:
+            field_hit = None
+            for selector in registry.candidates(field):
+                try:
+                    elem = item_elem.select_one(selector)
+                    if elem:
+                        text = elem.get_text(strip=True)
+                        if text:
+                            item_data[field] = text
+                            field_hit = selector
+                            print(f"[EXTRACT] {field}: {text}")
+                            break
+                except Exception as e:
+                    print(f"[EXTRACT] Erro ao extrair {field}: {e}")
+                    continue
+            registry.record(field, field_hit)
+
+        # 3. Link do perfil do vendedor, quando o cartão traz (identifica o vendedor no cache de telefones)
+        profile_hit = None
+        for selector in registry.candidates('seller_link'):
+            elem = item_elem.select_one(selector)
+            if elem and elem.get('href'):
+                item_data['seller_link'] = urljoin(base_url, elem['href'])
+                profile_hit = selector
+                break
+        registry.record('seller_link', profile_hit)
+
+        # 4. Validar e adicionar item
+        required_fields = ['name', 'link']
+        optional_fields = ['price', 'seller_name']
+
+        # Verificar campos obrigatórios
+        if all(item_data[field] != 'N/A' and item_data[field] is not None for field in required_fields):
+            # Garantir que pelo menos um campo opcional tem valor
+            if any(item_data[field] != 'N/A' for field in optional_fields):
+                print(f"[EXTRACT] Item adicionado: {item_data['name'][:30]}...")
+                return item_data
+            print("[EXTRACT] Item sem dados opcionais, ignorando")
+        else:
+            print("[EXTRACT] Item sem dados obrigatórios, ignorando")
+
+    except Exception as e:
+        print(f"[EXTRACT] Erro ao extrair item: {str(e)}")
+    return None
+
+
+def parse_listing_dom(html: str, base_url: str, registry) -> tuple[list, PageInfo]:
+    """Extrai os anúncios percorrendo os cartões do DOM com os seletores do registro.
+
+    `registry` é o SelectorRegistry ou, nos processos de parsing, um
+    SelectorRecorder com a ordem dos seletores do processo principal.
+
+    Returns:
+        tuple: Lista de itens válidos e a paginação da página
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    try:
+        base_domain = urlparse(base_url).hostname.removeprefix('www.')
+
+        # Tentar cada seletor (o mais bem-sucedido primeiro) até encontrar itens
+        item_elements = []
+        container_hit = None
+        for container in registry.candidates('container'):
+            found = soup.select(container)
+            if found:
+                item_elements = found
+                container_hit = container
+                print(f"[EXTRACT] Encontrados {len(found)} itens usando seletor {container}")
+                break
+        registry.record('container', container_hit)
+
+        if not item_elements:
+            print("[EXTRACT] Nenhum item encontrado nesta página")
+            return [], PageInfo()
+
+        items = []
+        for item_elem in item_elements:
+            item = _card_item(item_elem, base_url, base_domain, registry)
+            if item is not None:
+                items.append(item)
+        return items, dom_page_info(soup, registry, base_url)
+    finally:
+        # Só os itens (strings) sobrevivem à página
+        _free_tree(soup)
+
+
+def parse_listing_stream(html: str, base_url: str, registry) -> tuple[list, PageInfo] | None:
+    """Como `parse_listing_dom`, sem montar a árvore da página inteira.
+
+    O HTMLParser percorre a página e recorta só os cartões e a paginação
+    (pela raiz dos seletores de container, next e page_links); cada recorte
+    vira uma árvore pequena, desmontada logo após a leitura. Entre os
+    seletores de cada grupo vale o de maior prioridade que encontrar algo
+    em qualquer recorte, como na árvore completa.
+
+    Returns:
+        tuple: Itens e paginação, ou None se algum seletor não é suportado
+            pelo recorte (quem chama cai para `parse_listing_dom`)
+    """
+    from bs4 import BeautifulSoup
+    containers = registry.candidates('container')
+    nexts = registry.candidates('next')
+    page_links = registry.candidates('page_links')
+    fragments = split_fragments(html, {'container': containers, 'next': nexts, 'page_links': page_links})
+    if fragments is None:
+        return None
+
+    base_domain = urlparse(base_url).hostname.removeprefix('www.')
+    order = {group: registry.candidates(group) for group in ('link', 'name', 'price', 'seller_name', 'seller_link')}
+    items, records, found = [], [], 0
+    container_rank = next_rank = links_rank = None
+    next_url = None
+    numbers = []
+    for fragment, groups in fragments:
+        soup = BeautifulSoup(fragment, 'html.parser')
+        try:
+            candidates = containers if 'container' in groups else []
+            for rank, container in enumerate(candidates[:None if container_rank is None else container_rank + 1]):
+                elements = soup.select(container)
+                if not elements:
+                    continue
+                # Um seletor mais prioritário descarta o que os outros encontraram antes
+                if container_rank is None or rank < container_rank:
+                    container_rank, items, records, found = rank, [], [], 0
+                # Os acertos dos campos só valem para o container escolhido no fim
+                recorder = SelectorRecorder(order)
+                for item_elem in elements:
+                    item = _card_item(item_elem, base_url, base_domain, recorder)
+                    if item is not None:
+                        items.append(item)
+                records.extend(recorder.records)
+                found += len(elements)
+                break
+
+            for rank, selector in enumerate(nexts[:next_rank] if 'next' in groups else []):
+                elem = soup.select_one(selector)
+                if elem:
+                    next_rank = rank
+                    next_url = urljoin(base_url, elem['href']) if elem.get('href') else None
+                    break
+
+            candidates = page_links if 'page_links' in groups else []
+            for rank, selector in enumerate(candidates[:None if links_rank is None else links_rank + 1]):
+                texts = (a.get_text(strip=True) for a in soup.select(selector))
+                page_numbers = [int(text) for text in texts if text.isdigit()]
+                if not page_numbers:
+                    continue
+                if links_rank is None or rank < links_rank:
+                    links_rank, numbers = rank, []
+                numbers.extend(page_numbers)
+                break
+        finally:
+            _free_tree(soup)
+
+    registry.record('container', containers[container_rank] if container_rank is not None else None)
+    if container_rank is None:
+        print("[EXTRACT] Nenhum item encontrado nesta página")
+        return [], PageInfo()
+    print(f"[EXTRACT] Encontrados {found} itens usando seletor {containers[container_rank]}")
+    for group, selector in records:
+        registry.record(group, selector)
+    registry.record('next', nexts[next_rank] if next_rank is not None else None)
+    registry.record('page_links', page_links[links_rank] if links_rank is not None else None)
+    return items, PageInfo(total=max(numbers) if numbers else None, next_url=next_url,
+                           has_next=next_rank is not None)
+
+
+def parse_listing(html: str, base_url: str, mode: str, registry) -> tuple[list, PageInfo, str | None]:
+    """Extrai os anúncios de uma página de listagem.
+
+    Usa o estado JSON pré-renderizado quando disponível (mais rápido e com
+    mais campos) e cai para a raspagem por DOM caso contrário. No modo
+    'stream' a raspagem por DOM recorta os cartões sem montar a árvore da
+    página inteira.
+
+    Returns:
+        tuple: Itens, paginação e o parser usado ('state', 'dom' ou None)
+    """
+    if mode == 'stream':
+        parsed = parse_listing_stream(html, base_url, registry)
+        if parsed is not None:
+            return parsed[0], parsed[1], 'dom'
+        print("[EXTRACT] Seletores não suportados pelo recorte, usando a árvore completa")
+    elif mode in ('auto', 'state'):
+        parsed = parse_listing_state(html, base_url)
+        if parsed is not None:
+            return parsed[0], parsed[1], 'state'
+        if mode == 'state':
+            print("[EXTRACT] Estado JSON não encontrado na página")
+            return [], PageInfo(), None
+        print("[EXTRACT] Estado JSON não encontrado, usando seletores do DOM")
+    items, info = parse_listing_dom(html, base_url, registry)
+    return items, info, 'dom'
+
+
+def parse_worker(raw: bytes, encoding: str | None, base_url: str, mode: str, order: dict,
+                 profile: bool = False) -> tuple:
+    """Parsing executado num processo do ParsePool.
+
+    Recebe os bytes crus da página e devolve só tuplas: as linhas dos itens
+    (na ordem de ITEM_FIELDS ou DOM_FIELDS), a paginação, o parser usado, os
+    acertos de seletores, o tempo gasto e, com `profile`, as estatísticas do
+    cProfile do parsing (senão None). Nada de objetos do BeautifulSoup
+    atravessa o limite entre processos.
+    """
+    profiler = cProfile.Profile() if profile else None
+    if profiler is not None:
+        profiler.enable()
+    start = time.perf_counter()
+    html = raw.decode(encoding or 'utf-8', errors='replace')
+    recorder = SelectorRecorder(order)
+    items, info, used = parse_listing(html, base_url, mode, recorder)
+    fields = DOM_FIELDS if used == 'dom' else ITEM_FIELDS
+    rows = tuple(tuple(item.get(field) for field in fields) for item in items)
+    page = (info.current, info.total, info.next_url, info.has_next)
+    seconds = time.perf_counter() - start
+    if profiler is not None:
+        profiler.disable()
+        profiler.create_stats()
+    return rows, page, used, tuple(recorder.records), seconds, profiler.stats if profiler else None
+
+
+def _silence_worker() -> None:
+    sys.stdout = open(os.devnull, 'w')
+
+
+def unpack_parsed(rows: tuple, page: tuple, used: str | None) -> tuple[list, PageInfo]:
+    """Reconstrói itens e paginação a partir do resultado de `parse_worker`."""
+    fields = DOM_FIELDS if used == 'dom' else ITEM_FIELDS
+    current, total, next_url, has_next = page
+    return [dict(zip(fields, row)) for row in rows], PageInfo(current, total, next_url, has_next)
+
+
+class ParsePool:
+    """Processos dedicados ao parsing das páginas de listagem.
+
+    O html.parser do BeautifulSoup é Python puro e disputa o GIL com as
+    threads de download; em processos separados o parsing usa todos os
+    núcleos. No máximo `max_pending` páginas ficam na fila: quando o parsing
+    atrasa, `submit` bloqueia a thread de download (backpressure), em vez de
+    acumular páginas na memória.
+
+    Attributes:
+        workers (int): Processos de parsing
+        max_pending (int): Páginas aguardando ou em parsing antes de bloquear o download
+        quiet (bool): Descarta os prints dos processos de parsing
+    """
+
+    def __init__(self, workers: int, max_pending: int | None = None, quiet: bool = False):
+        self.workers = workers
+        self.max_pending = max_pending or workers * 2
+        self.quiet = quiet
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pages = 0
+        self._blocked = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: o processo principal tem threads (proxy local, Tk), e fork com threads é inseguro
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=get_context('spawn'),
+                                                     initializer=_silence_worker if self.quiet else None)
+            return self._executor
+
+    def submit(self, raw: bytes, encoding: str | None, base_url: str, mode: str, order: dict,
+               profile: bool = False) -> Future:
+        """Agenda o parsing de uma página; bloqueia enquanto houver `max_pending` na fila."""
+        start = time.perf_counter()
+        self._slots.acquire()
+        waited = time.perf_counter() - start
+        try:
+            future = self._get_executor().submit(parse_worker, raw, encoding, base_url, mode, order, profile)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pages += 1
+            self._blocked += waited
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'workers': self.workers, 'max_pending': self.max_pending, 'pages': self._pages,
+                    'blocked_seconds': round(self._blocked, 3)}
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
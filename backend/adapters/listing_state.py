@@ -0,0 +1,95 @@
+import json
+import sys
+from urllib.parse import urlparse
+
+from .pagination import PageInfo
+
+# Estado pré-renderizado que a OLX injeta nas páginas de listagem. O valor
+# costuma ser uma string com o JSON (codificado duas vezes), mas um objeto
+# literal também é aceito.
+STATE_MARKER = 'window.__PRERENDERED_STATE__'
+
+_decoder = json.JSONDecoder()
+
+
+def extract_state(html: str) -> dict | None:
+    """Localiza e decodifica o estado pré-renderizado da página."""
+    start = html.find(STATE_MARKER)
+    if start < 0:
+        return None
+    pos = html.find('=', start + len(STATE_MARKER))
+    if pos < 0:
+        return None
+    pos += 1
+    while pos < len(html) and html[pos].isspace():
+        pos += 1
+    try:
+        state, _ = _decoder.raw_decode(html, pos)
+        if isinstance(state, str):
+            state = json.loads(state)
+    except ValueError:
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _shared(value):
+    """Valores que se repetem entre anúncios (cidade, categoria...) passam a compartilhar uma única string."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _listing(state: dict) -> dict | None:
+    listing = state.get('listing')
+    if isinstance(listing, dict) and isinstance(listing.get('listing'), dict):
+        listing = listing['listing']
+    return listing if isinstance(listing, dict) and isinstance(listing.get('ads'), list) else None
+
+
+def parse_listing_state(html: str, base_url: str) -> tuple[list, PageInfo] | None:
+    """Extrai os anúncios do estado JSON da página.
+
+    Além dos campos da raspagem por DOM (name, price, seller_name, link),
+    traz id, preço numérico, localização, datas, vendedor e descrição.
+
+    Returns:
+        tuple: (itens, paginação) ou None se a página não tem estado utilizável
+    """
+    state = extract_state(html)
+    listing = _listing(state) if state else None
+    if listing is None:
+        return None
+
+    base_domain = urlparse(base_url).hostname.removeprefix('www.')
+    items = []
+    for ad in listing['ads']:
+        if not isinstance(ad, dict):
+            continue
+        link = ad.get('url') or ''
+        if link and not link.startswith('http'):
+            link = f"{base_url}{link}"
+        if not ad.get('title') or base_domain not in link:
+            continue
+        price = ad.get('price') or {}
+        regular = price.get('regularPrice') or {}
+        location = ad.get('location') or {}
+        user = ad.get('user') or {}
+        category = ad.get('category') or {}
+        items.append({
+            'name': ad['title'],
+            'price': price.get('displayValue') or 'N/A',
+            'seller_name': _shared(user.get('name')) or 'N/A',
+            'link': link,
+            'id': ad.get('id'),
+            'price_value': regular.get('value'),
+            'currency': _shared(regular.get('currencyCode')),
+            'city': _shared(location.get('cityName')),
+            'region': _shared(location.get('regionName')),
+            'category': _shared(category.get('type')),
+            'created': ad.get('createdTime'),
+            'refreshed': ad.get('lastRefreshTime'),
+            'seller_id': user.get('id'),
+            'description': ad.get('description'),
+        })
+
+    page, total = listing.get('pageNumber'), listing.get('totalPages')
+    return items, PageInfo(current=page if isinstance(page, int) else None,
+                           total=total if isinstance(total, int) else None)
@@ -0,0 +1,183 @@
+import re
+from html.parser import HTMLParser
+
+# Elementos sem tag de fechamento
+VOID_ELEMENTS = frozenset(('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                           'param', 'source', 'track', 'wbr'))
+
+_IDENT = r'-?[_a-zA-Z][\w-]*'
+_SIMPLE = re.compile(rf'''
+    \#(?P<id>{_IDENT})
+  | \.(?P<cls>{_IDENT})
+  | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[~|^$*]?=)\s*(?P<value>"[^"]*"|'[^']*'|[^\]\s]+)\s*)?\]
+  | (?P<not>:not\([^()]*\))
+''', re.X)
+_TAG = re.compile(rf'{_IDENT}|\*')
+
+
+class RootMatcher:
+    """Primeiro seletor simples composto (ex.: `div[data-cy="l-card"]`) de um seletor CSS.
+
+    Casa só com a tag de abertura e seus atributos, sem ancestrais nem
+    irmãos; `:not(...)` é ignorado, então o casamento pode incluir a mais
+    (o seletor completo é conferido depois, no fragmento).
+    """
+
+    def __init__(self, tag: str | None, checks: list[tuple[str, str | None, str | None]], group: str | None = None):
+        self.tag = tag
+        self.checks = checks
+        self.group = group
+
+    def matches(self, tag: str, values: dict) -> bool:
+        if self.tag and self.tag != tag:
+            return False
+        for name, op, expected in self.checks:
+            value = values.get(name)
+            if value is None:
+                return False
+            if op is None:
+                continue
+            if op == '=' and value != expected:
+                return False
+            if op == '~=' and expected not in value.split():
+                return False
+            if op == '^=' and not value.startswith(expected):
+                return False
+            if op == '$=' and not value.endswith(expected):
+                return False
+            if op == '*=' and expected not in value:
+                return False
+            if op == '|=' and value != expected and not value.startswith(expected + '-'):
+                return False
+        return True
+
+
+def root_matchers(selector: str, group: str | None = None) -> list[RootMatcher] | None:
+    """Matchers da raiz de cada seletor da lista; None se algum usa sintaxe não suportada.
+
+    Pseudo-classes de posição e combinadores de irmão (`+`, `~`) na raiz
+    dependem do que está fora do fragmento e não são suportados.
+    """
+    matchers = []
+    for part in selector.split(','):
+        part = part.strip()
+        tag_match = _TAG.match(part)
+        tag = tag_match.group(0).lower() if tag_match else None
+        pos = tag_match.end() if tag_match else 0
+        checks = []
+        while pos < len(part):
+            simple = _SIMPLE.match(part, pos)
+            if not simple:
+                break
+            if simple.group('id'):
+                checks.append(('id', '=', simple.group('id')))
+            elif simple.group('cls'):
+                checks.append(('class', '~=', simple.group('cls')))
+            elif simple.group('attr'):
+                value = simple.group('value')
+                if value and value[0] in '"\'':
+                    value = value[1:-1]
+                checks.append((simple.group('attr').lower(), simple.group('op'), value))
+            pos = simple.end()
+        rest = part[pos:]
+        if (tag is None and not checks) or (rest and not rest[0].isspace() and rest[0] != '>') \
+                or rest.lstrip()[:1] in ('+', '~'):
+            return None
+        matchers.append(RootMatcher(None if tag == '*' else tag, checks, group))
+    return matchers
+
+
+class FragmentSplitter(HTMLParser):
+    """Tokeniza a página e recorta o HTML dos elementos cuja tag de abertura casa com algum matcher.
+
+    Nenhuma árvore é montada: só a pilha de tags abertas dentro do fragmento
+    atual. Um elemento que casa dentro de outro fragmento já está contido
+    nele e não gera um fragmento próprio, mas o grupo dele é anotado no
+    fragmento. O conteúdo de <script> e <style> (como o estado JSON) é
+    pulado pelo próprio HTMLParser.
+    """
+
+    def __init__(self, html: str, matchers: list[RootMatcher]):
+        super().__init__(convert_charrefs=True)
+        self.html = html
+        self.matchers = matchers
+        self.fragments = []
+        self._line_starts = [0] + [match.end() for match in re.finditer('\n', html)]
+        self._open = None
+        self._groups = None
+        self._start = 0
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self._line_starts[line - 1] + column
+
+    def _matched_groups(self, tag: str, attrs: list, known: set) -> set:
+        values = dict(attrs)
+        return {matcher.group for matcher in self.matchers
+                if matcher.group not in known and matcher.matches(tag, values)}
+
+    def handle_starttag(self, tag, attrs):
+        if self._open is not None:
+            self._groups |= self._matched_groups(tag, attrs, self._groups)
+            if tag not in VOID_ELEMENTS:
+                self._open.append(tag)
+            return
+        groups = self._matched_groups(tag, attrs, set())
+        if not groups:
+            return
+        start = self._offset()
+        if tag in VOID_ELEMENTS:
+            self.fragments.append((self.html[start:start + len(self.get_starttag_text())], groups))
+            return
+        self._start = start
+        self._open = [tag]
+        self._groups = groups
+
+    def handle_startendtag(self, tag, attrs):
+        if self._open is not None:
+            self._groups |= self._matched_groups(tag, attrs, self._groups)
+            return
+        groups = self._matched_groups(tag, attrs, set())
+        if groups:
+            start = self._offset()
+            self.fragments.append((self.html[start:start + len(self.get_starttag_text())], groups))
+
+    def handle_endtag(self, tag):
+        # Tags de fechamento sem abertura correspondente (HTML malformado) são ignoradas
+        if self._open is None or tag not in self._open:
+            return
+        while self._open.pop() != tag:
+            pass
+        if not self._open:
+            end = self.html.find('>', self._offset()) + 1
+            self.fragments.append((self.html[self._start:end], self._groups))
+            self._open = None
+
+    def close(self):
+        super().close()
+        if self._open is not None:
+            self.fragments.append((self.html[self._start:], self._groups))
+            self._open = None
+
+
+def split_fragments(html: str, groups: dict[str, list[str]]) -> list[tuple[str, set]] | None:
+    """Fragmentos da página que podem conter elementos dos seletores, na ordem do documento.
+
+    Args:
+        groups (dict): Seletores CSS por grupo (ex.: {'container': [...], 'next': [...]})
+
+    Returns:
+        list: (HTML do fragmento, grupos com alguma raiz dentro dele), ou
+            None se algum seletor não é suportado
+    """
+    matchers = []
+    for group, selectors in groups.items():
+        for selector in selectors:
+            roots = root_matchers(selector, group)
+            if roots is None:
+                return None
+            matchers.extend(roots)
+    splitter = FragmentSplitter(html, matchers)
+    splitter.feed(html)
+    splitter.close()
+    return splitter.fragments
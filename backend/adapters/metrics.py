@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ScrapingMetrics:
+    """Coleta métricas por etapa do pipeline de scraping.
+
+    Registra tempo gasto em cada etapa (proxies, listagem, parsing, login,
+    detalhes), contadores (requisições, bytes, retries, falhas de proxy,
+    bloqueios/captcha) e o tempo de espera do WebDriverWait por seletor.
+    É thread-safe para permitir uso a partir de workers paralelos.
+
+    Attributes:
+        started_at (float): Momento de início da execução (time.time)
+        stages (dict): Tempo acumulado e número de chamadas por etapa
+        counters (dict): Contadores livres (requests, bytes, retries...)
+        waits (dict): Tempo acumulado e ocorrências de espera por seletor
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reinicia todas as métricas para uma nova execução."""
+        with self._lock:
+            self.started_at = time.time()
+            self._started_perf = time.perf_counter()
+            self.finished_at = None
+            self.stages = {}
+            self.counters = {}
+            self.waits = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mede o tempo gasto dentro do bloco e acumula na etapa informada."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Acumula tempo em uma etapa."""
+        with self._lock:
+            stage = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stage['seconds'] += seconds
+            stage['calls'] += 1
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """Incrementa um contador."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_wait(self, selector: str, seconds: float, found: bool = True) -> None:
+        """Registra o tempo gasto esperando por um seletor."""
+        with self._lock:
+            wait = self.waits.setdefault(selector, {'seconds': 0.0, 'calls': 0, 'timeouts': 0})
+            wait['seconds'] += seconds
+            wait['calls'] += 1
+            if not found:
+                wait['timeouts'] += 1
+
+    def finish(self) -> None:
+        """Marca o fim da execução."""
+        with self._lock:
+            self.finished_at = time.time()
+            self._elapsed = time.perf_counter() - self._started_perf
+
+    @property
+    def elapsed(self) -> float:
+        if self.finished_at is not None:
+            return self._elapsed
+        return time.perf_counter() - self._started_perf
+
+    def snapshot(self) -> dict:
+        """Retorna uma cópia serializável das métricas atuais."""
+        elapsed = self.elapsed
+        with self._lock:
+            items = self.counters.get('items', 0)
+            return {
+                'started_at': self.started_at,
+                'elapsed_seconds': round(elapsed, 4),
+                'items_per_second': round(items / elapsed, 4) if elapsed > 0 else 0.0,
+                'stages': {k: dict(v) for k, v in self.stages.items()},
+                'counters': dict(self.counters),
+                'waits': {k: dict(v) for k, v in self.waits.items()},
+            }
+
+    def summary(self) -> str:
+        """Gera um resumo legível para o fim da execução."""
+        snap = self.snapshot()
+        lines = [f"[METRICS] Duração total: {snap['elapsed_seconds']:.2f}s "
+                 f"({snap['items_per_second']:.2f} itens/s)"]
+        for name, stage in sorted(snap['stages'].items(), key=lambda kv: -kv[1]['seconds']):
+            lines.append(f"[METRICS]   etapa {name}: {stage['seconds']:.2f}s em {stage['calls']} chamada(s)")
+        for name, value in sorted(snap['counters'].items()):
+            lines.append(f"[METRICS]   {name}: {value}")
+        for selector, wait in sorted(snap['waits'].items(), key=lambda kv: -kv[1]['seconds']):
+            lines.append(f"[METRICS]   espera {selector}: {wait['seconds']:.2f}s "
+                         f"({wait['calls']} chamada(s), {wait['timeouts']} timeout(s))")
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Exporta as métricas no formato texto do Prometheus."""
+        snap = self.snapshot()
+        lines = [
+            '# TYPE olx_scrape_elapsed_seconds gauge',
+            f"olx_scrape_elapsed_seconds {snap['elapsed_seconds']}",
+            '# TYPE olx_scrape_items_per_second gauge',
+            f"olx_scrape_items_per_second {snap['items_per_second']}",
+            '# TYPE olx_scrape_stage_seconds gauge',
+        ]
+        for name, stage in snap['stages'].items():
+            lines.append(f'olx_scrape_stage_seconds{{stage="{name}"}} {stage["seconds"]:.6f}')
+        lines.append('# TYPE olx_scrape_stage_calls counter')
+        for name, stage in snap['stages'].items():
+            lines.append(f'olx_scrape_stage_calls{{stage="{name}"}} {stage["calls"]}')
+        lines.append('# TYPE olx_scrape_counter counter')
+        for name, value in snap['counters'].items():
+            lines.append(f'olx_scrape_counter{{name="{name}"}} {value}')
+        lines.append('# TYPE olx_scrape_wait_seconds gauge')
+        for selector, wait in snap['waits'].items():
+            label = selector.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'olx_scrape_wait_seconds{{selector="{label}"}} {wait["seconds"]:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Salva as métricas em arquivo (.prom/.txt para Prometheus, demais em JSON)."""
+        content = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        print(f"[METRICS] Métricas salvas em {path}")
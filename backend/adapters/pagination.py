@@ -0,0 +1,65 @@
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+PAGE_PARAM = 'page'
+
+
+class PageInfo:
+    """Paginação de uma página de listagem.
+
+    Attributes:
+        current (int): Número da página segundo o próprio site (None se desconhecido)
+        total (int): Última página conhecida; exata no estado JSON, limite inferior no DOM
+        next_url (str): Link para a próxima página, se a página tiver um
+        has_next (bool): Se o site indica que há mais páginas
+    """
+
+    def __init__(self, current: int | None = None, total: int | None = None,
+                 next_url: str | None = None, has_next: bool = False):
+        self.current = current
+        self.total = total
+        self.next_url = next_url
+        self.has_next = has_next or bool(next_url) or bool(current and total and current < total)
+
+    def __repr__(self):
+        return f"PageInfo(current={self.current}, total={self.total}, has_next={self.has_next})"
+
+
+def page_url(url: str, page: int) -> str:
+    """Monta a URL da página `page` preservando os demais parâmetros da busca."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != PAGE_PARAM]
+    if page > 1:
+        query.append((PAGE_PARAM, str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query, safe=':[]')))
+
+
+def page_number(url: str) -> int:
+    """Número da página indicado na URL (1 se ausente)."""
+    for key, value in parse_qsl(urlsplit(url).query):
+        if key == PAGE_PARAM and value.isdigit():
+            return int(value)
+    return 1
+
+
+def dom_page_info(soup, registry, base_url: str) -> PageInfo:
+    """Lê o link de próxima página e os números de página visíveis no DOM."""
+    next_url = None
+    next_hit = None
+    for selector in registry.candidates('next'):
+        elem = soup.select_one(selector)
+        if elem:
+            next_hit = selector
+            if elem.get('href'):
+                next_url = urljoin(base_url, elem['href'])
+            break
+    registry.record('next', next_hit)
+
+    numbers = []
+    links_hit = None
+    for selector in registry.candidates('page_links'):
+        numbers = [int(text) for text in (a.get_text(strip=True) for a in soup.select(selector)) if text.isdigit()]
+        if numbers:
+            links_hit = selector
+            break
+    registry.record('page_links', links_hit)
+    return PageInfo(total=max(numbers) if numbers else None, next_url=next_url, has_next=next_hit is not None)
@@ -0,0 +1,275 @@
+import atexit
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+_NULL_STAGE = nullcontext()
+
+
+def _enable(profile: cProfile.Profile) -> cProfile.Profile | None:
+    """Ativa o cProfile; None se outro profiler já está ativo (no Python 3.12+ só um por vez)."""
+    try:
+        profile.enable()
+        return profile
+    except ValueError:
+        return None
+
+
+class _ImportedProfile:
+    """Estatísticas do cProfile vindas de outro processo, no formato que o pstats aceita."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class NullProfiler:
+    """Profiler desativado: as etapas não fazem nada além de um contexto vazio."""
+
+    enabled = False
+
+    def stage(self, name: str):
+        return _NULL_STAGE
+
+    def add_stats(self, name: str, stats: dict, seconds: float) -> None:
+        pass
+
+    def finish(self) -> str | None:
+        return None
+
+
+class RunProfiler:
+    """Perfil de CPU e memória de uma execução, gravado num diretório próprio.
+
+    Cada etapa (`stage`) tem seu próprio cProfile, por thread, somado ao
+    final em `<etapa>.prof` (abre no snakeviz/pstats) e `<etapa>.txt`. Etapas
+    aninhadas pausam a externa, então cada arquivo traz só o tempo da
+    própria etapa. Em paralelo, o tracemalloc registra as alocações (top-N
+    por linha em `allocations.txt`, e a memória retida por etapa no
+    `summary.json`, aproximada quando há threads) e uma thread amostra as
+    pilhas de todas as threads a cada `sample_interval` segundos, gravadas
+    em `stacks.collapsed` (formato do flamegraph.pl e do speedscope).
+
+    Trabalho feito em outros processos (os workers do ParsePool) entra no
+    perfil de CPU pela `add_stats`; a memória e as pilhas desses processos
+    não são rastreadas, e os relatórios avisam quando houve trabalho assim.
+
+    A execução começa na primeira etapa e termina em `finish()`, que grava
+    os arquivos; a etapa seguinte abre um novo diretório.
+
+    Attributes:
+        output_dir (str): Diretório onde cada execução cria sua pasta
+        top_n (int): Linhas nos relatórios de funções e de alocações
+        sample_interval (float): Intervalo entre amostras de pilha (s)
+        trace_frames (int): Quadros guardados por alocação no tracemalloc
+    """
+
+    enabled = True
+
+    def __init__(self, output_dir: str = 'profiles', top_n: int = 30, sample_interval: float = 0.01,
+                 trace_frames: int = 10):
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self.trace_frames = trace_frames
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._running = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._profiles = {}
+        self._stage_times = {}
+        self._stacks = {}
+        self._samples = 0
+        self._started = None
+        self._sampler = None
+        self._stop = threading.Event()
+        self._owns_tracemalloc = False
+
+    def _start_run(self) -> None:
+        self._reset()
+        self._started = time.time()
+        self._running = True
+        # Um tracemalloc já ativo (ex.: python -X tracemalloc) é de quem o ligou e continua ligado no fim
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._owns_tracemalloc = True
+        self._sampler = threading.Thread(target=self._sample_loop, name='profiler-sampler', daemon=True)
+        self._sampler.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Perfila o bloco como a etapa `name`."""
+        with self._lock:
+            if not self._running:
+                self._start_run()
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        if stack and stack[-1] is not None:
+            stack[-1].disable()
+        profile = _enable(cProfile.Profile())
+        if profile is not None:
+            with self._lock:
+                self._profiles.setdefault(name, []).append(profile)
+        stack.append(profile)
+        allocated = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            stack.pop()
+            with self._lock:
+                times = self._stage_times.setdefault(name, {'seconds': 0.0, 'calls': 0, 'net_bytes': 0})
+                times['seconds'] += time.perf_counter() - start
+                times['calls'] += 1
+                times['net_bytes'] += tracemalloc.get_traced_memory()[0] - allocated
+            if stack and stack[-1] is not None:
+                _enable(stack[-1])
+
+    def add_stats(self, name: str, stats: dict, seconds: float) -> None:
+        """Soma à etapa `name` o perfil de uma chamada feita em outro processo.
+
+        Args:
+            stats (dict): `cProfile.Profile.stats` do processo, depois de `create_stats()`
+            seconds (float): Duração da chamada no outro processo
+        """
+        with self._lock:
+            if not self._running:
+                self._start_run()
+            self._profiles.setdefault(name, []).append(_ImportedProfile(stats))
+            times = self._stage_times.setdefault(name, {'seconds': 0.0, 'calls': 0, 'net_bytes': 0})
+            times['seconds'] += seconds
+            times['calls'] += 1
+            times['worker_calls'] = times.get('worker_calls', 0) + 1
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.sample_interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                parts.append(names.get(ident, str(ident)).replace(';', ','))
+                key = ';'.join(reversed(parts))
+                self._stacks[key] = self._stacks.get(key, 0) + 1
+            self._samples += 1
+
+    def finish(self) -> str | None:
+        """Grava os relatórios da execução; retorna o diretório (None se nada foi perfilado)."""
+        with self._lock:
+            if not self._running:
+                return None
+            self._running = False
+        self._stop.set()
+        self._sampler.join()
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        current, peak = tracemalloc.get_traced_memory() if snapshot else (0, 0)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+        worker_calls = sum(times.get('worker_calls', 0) for times in self._stage_times.values())
+
+        base = os.path.join(self.output_dir, time.strftime('%Y%m%d-%H%M%S', time.localtime(self._started)))
+        run_dir = base
+        suffix = 1
+        while os.path.exists(run_dir):
+            suffix += 1
+            run_dir = f"{base}-{suffix}"
+        os.makedirs(run_dir)
+        summary = {'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self._started)),
+                   'seconds': round(time.time() - self._started, 3), 'samples': self._samples,
+                   'traced_current_bytes': current, 'traced_peak_bytes': peak, 'stages': {}}
+        if worker_calls:
+            summary['note'] = ("Etapas com worker_calls incluem CPU de outros processos; a memória (net_bytes, "
+                               "allocations.txt) e as pilhas amostradas cobrem só o processo principal")
+
+        for name, profiles in self._profiles.items():
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(os.path.join(run_dir, f'{name}.prof'))
+            report = io.StringIO()
+            stats.stream = report
+            stats.sort_stats('cumulative').print_stats(self.top_n)
+            with open(os.path.join(run_dir, f'{name}.txt'), 'w') as f:
+                f.write(report.getvalue())
+            times = self._stage_times[name]
+            summary['stages'][name] = {'seconds': round(times['seconds'], 4), 'calls': times['calls'],
+                                       'cpu_seconds': round(stats.total_tt, 4), 'net_bytes': times['net_bytes']}
+            if times.get('worker_calls'):
+                summary['stages'][name]['worker_calls'] = times['worker_calls']
+
+        if snapshot is not None:
+            snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                                tracemalloc.Filter(False, __file__)])
+            with open(os.path.join(run_dir, 'allocations.txt'), 'w') as f:
+                f.write(f"Memória rastreada: atual {current / 2**20:.1f} MB, pico {peak / 2**20:.1f} MB\n")
+                if worker_calls:
+                    f.write(f"Só o processo principal: {worker_calls} chamada(s) em processos de parsing não "
+                            f"entram neste relatório\n")
+                f.write("\n")
+                for stat in snapshot.statistics('lineno')[:self.top_n]:
+                    frame = stat.traceback[0]
+                    f.write(f"{stat.size / 1024:10.1f} KB {stat.count:8d} blocos  {frame.filename}:{frame.lineno}\n")
+
+        with open(os.path.join(run_dir, 'stacks.collapsed'), 'w') as f:
+            for key, count in sorted(self._stacks.items()):
+                f.write(f"{key} {count}\n")
+        with open(os.path.join(run_dir, 'summary.json'), 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"[PROFILE] Relatórios da execução em {run_dir}")
+        return run_dir
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler():
+    """Profiler do processo: RunProfiler com OLX_PROFILE=1, senão um NullProfiler."""
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                if os.getenv('OLX_PROFILE', '0') == '1':
+                    _profiler = RunProfiler(
+                        output_dir=os.getenv('OLX_PROFILE_DIR', 'profiles'),
+                        top_n=int(os.getenv('OLX_PROFILE_TOP', '30')),
+                        sample_interval=float(os.getenv('OLX_PROFILE_INTERVAL', '0.01')),
+                    )
+                    # Execuções sem finish() explícito são gravadas ao sair
+                    atexit.register(_profiler.finish)
+                else:
+                    _profiler = NullProfiler()
+    return _profiler
+
+
+def profiled(name: str):
+    """Decorador que perfila cada chamada da função como a etapa `name`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_profiler().stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,209 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from .search_index import parse_price
+from .seller_cache import seller_key
+
+# Pesos padrão de cada critério de prioridade
+DEFAULT_WEIGHTS = {'newest': 3.0, 'price': 1.0, 'category': 1.0, 'new_seller': 2.0, 'deferred': 1.0}
+
+
+def parse_weights(text: str | None) -> dict:
+    """Lê pesos no formato 'newest=3,price=1,new_seller=2'; critérios omitidos mantêm o padrão."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in (text or '').split(','):
+        if '=' not in part:
+            continue
+        key, value = (piece.strip() for piece in part.split('=', 1))
+        if key not in DEFAULT_WEIGHTS:
+            raise Exception(f"Critério de prioridade desconhecido: {key} (use {', '.join(DEFAULT_WEIGHTS)})")
+        weights[key] = float(value)
+    return weights
+
+
+def parse_band(text: str | None) -> tuple[float | None, float | None] | None:
+    """Faixa de preço 'min-max' (um dos lados pode ficar vazio: '100-' ou '-500')."""
+    if not text or '-' not in text:
+        return None
+    low, high = (piece.strip() for piece in text.split('-', 1))
+    return (float(low) if low else None, float(high) if high else None)
+
+
+def _age_hours(item: dict, now: float) -> float | None:
+    for key in ('refreshed', 'created'):
+        value = item.get(key)
+        if not isinstance(value, str) or not value:
+            continue
+        try:
+            moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            continue
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return max((now - moment.timestamp()) / 3600, 0.0)
+    return None
+
+
+class RevealScheduler:
+    """Ordena e limita as revelações de telefone de uma execução.
+
+    Cada anúncio recebe uma pontuação ponderada: mais recente (decai em
+    ~1 dia), preço dentro da faixa, categoria preferida, primeiro anúncio de
+    um vendedor ainda desconhecido e anúncios adiados de execuções
+    anteriores (para que não fiquem sempre para trás). As revelações seguem
+    a ordem da pontuação até atingir `max_reveals` ou `max_seconds`; o que
+    sobrar é gravado em `deferred_file` e volta na próxima execução da mesma
+    busca, em vez de ser descartado.
+
+    Attributes:
+        weights (dict): Peso de cada critério (ver DEFAULT_WEIGHTS)
+        price_band (tuple): Faixa de preço (mín, máx) que pontua, ou None
+        categories (set): Categorias que pontuam
+        max_reveals (int): Revelações por execução (0 = sem limite)
+        max_seconds (float): Tempo da fase de revelação (0 = sem limite); revelações
+            em andamento terminam, novas não começam
+        deferred_file (str): Arquivo JSONL com os anúncios adiados (None desativa)
+        max_deferred_age (float): Idade máxima de um anúncio adiado (s)
+        known_seller: Função opcional que diz se o telefone do vendedor já é conhecido
+    """
+
+    def __init__(self, weights: dict | None = None, price_band: tuple | None = None,
+                 categories: set | None = None, max_reveals: int = 0, max_seconds: float = 0.0,
+                 deferred_file: str | None = None, max_deferred_age: float = 7 * 86400, known_seller=None):
+        self.weights = weights or dict(DEFAULT_WEIGHTS)
+        self.price_band = price_band
+        self.categories = {category.lower() for category in categories or ()}
+        self.max_reveals = max_reveals
+        self.max_seconds = max_seconds
+        self.deferred_file = deferred_file
+        self.max_deferred_age = max_deferred_age
+        self.known_seller = known_seller
+        self._lock = threading.Lock()
+        self._started = None
+        self._started_count = 0
+        self.last_run = {}
+
+    def score(self, item: dict, now: float | None = None) -> float:
+        """Pontuação sem o critério de vendedor (que depende dos demais anúncios)."""
+        now = now or time.time()
+        score = 0.0
+        age = _age_hours(item, now)
+        if age is not None:
+            score += self.weights['newest'] / (1 + age / 24)
+        if self.price_band:
+            price = parse_price(item)
+            low, high = self.price_band
+            if price is not None and (low is None or price >= low) and (high is None or price <= high):
+                score += self.weights['price']
+        if self.categories and str(item.get('category') or '').lower() in self.categories:
+            score += self.weights['category']
+        if item.get('_deferred'):
+            score += self.weights['deferred']
+        return score
+
+    def plan(self, items: list, url: str | None = None) -> list:
+        """Anúncios da execução (mais os adiados da mesma busca) na ordem de revelação."""
+        now = time.time()
+        candidates = {}
+        for item in self._load_deferred(url, now):
+            candidates[item['link']] = item
+        for item in items:
+            # A versão da listagem atual substitui a adiada, mantendo a marca de adiado
+            if item['link'] in candidates:
+                item = dict(item, _deferred=True)
+            candidates[item['link']] = item
+        ordered = list(candidates.values())
+        scores = {id(item): self.score(item, now) for item in ordered}
+        ordered.sort(key=lambda item: scores[id(item)], reverse=True)
+
+        # Só o anúncio mais bem pontuado de cada vendedor desconhecido ganha o bônus
+        seen = set()
+        for item in ordered:
+            key = seller_key(item)
+            if key is None or key in seen:
+                continue
+            seen.add(key)
+            if not (self.known_seller and self.known_seller(item)):
+                scores[id(item)] += self.weights['new_seller']
+        ordered.sort(key=lambda item: scores[id(item)], reverse=True)
+        return ordered
+
+    def start(self) -> None:
+        with self._lock:
+            self._started = time.monotonic()
+            self._started_count = 0
+
+    def allow(self) -> bool:
+        """Reserva uma revelação dentro dos limites; False quando o orçamento acabou."""
+        with self._lock:
+            if self.max_reveals and self._started_count >= self.max_reveals:
+                return False
+            if self.max_seconds and self._started is not None \
+                    and time.monotonic() - self._started >= self.max_seconds:
+                return False
+            self._started_count += 1
+            return True
+
+    def finish(self, revealed: int, deferred: list, url: str | None = None) -> None:
+        """Grava os anúncios adiados da busca e guarda o resumo da execução."""
+        self._save_deferred(deferred, url)
+        self.last_run = {
+            'revealed': revealed,
+            'deferred': len(deferred),
+            'seconds': round(time.monotonic() - self._started, 1) if self._started is not None else 0.0,
+        }
+        if deferred:
+            print(f"[REVEAL] Orçamento atingido: {len(deferred)} anúncio(s) adiado(s) para a próxima execução")
+
+    def _load_deferred(self, url: str | None, now: float) -> list:
+        if not self.deferred_file:
+            return []
+        items = []
+        try:
+            with open(self.deferred_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry.get('url') == url and now - entry.get('deferred_at', 0) <= self.max_deferred_age:
+                        items.append(dict(entry['item'], _deferred=True))
+        except FileNotFoundError:
+            pass
+        if items:
+            print(f"[REVEAL] {len(items)} anúncio(s) adiado(s) de execuções anteriores")
+        return items
+
+    def _save_deferred(self, deferred: list, url: str | None) -> None:
+        """Substitui os adiados desta busca; os de outras buscas (ainda válidos) são mantidos."""
+        if not self.deferred_file:
+            return
+        now = time.time()
+        entries = []
+        first_deferred = {}
+        try:
+            with open(self.deferred_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        if entry.get('url') == url:
+                            first_deferred[entry['item'].get('link')] = entry.get('deferred_at', now)
+                        elif now - entry.get('deferred_at', 0) <= self.max_deferred_age:
+                            entries.append(entry)
+        except FileNotFoundError:
+            if not deferred:
+                return
+        for item in deferred:
+            clean = {key: value for key, value in item.items() if key != '_deferred'}
+            # Um anúncio adiado de novo mantém a data do primeiro adiamento, para expirar em `max_deferred_age`
+            entries.append({'url': url, 'deferred_at': first_deferred.get(clean.get('link'), now), 'item': clean})
+        temporary = self.deferred_file + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(temporary, self.deferred_file)
+
+    def stats(self) -> dict:
+        return dict(self.last_run)
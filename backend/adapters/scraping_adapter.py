@@ -1,21 +1,62 @@
+from __future__ import annotations
+
+import os
 import random
-import requests
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
+
+# Dependências pesadas (requests, bs4, selenium) são importadas
+# apenas no primeiro uso para manter a abertura da interface rápida.
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.webdriver.support.ui import WebDriverWait
 
 from ..domain.ports.scraping_service import ScrapingServicePort
 from ..domain.entities.scraping import ScrapingData
-from ..config.credentials import CredentialsManager
+from ..config.credentials import get_credentials_provider
+from .account_pool import AccountPool
+from .block_detection import BLOCK_VERDICTS, BLOCKED, OK, BlockDetector
+from .browser_pool import BrowserPool
+from .forward_proxy import LocalForwardingProxy
+from .http_client import get_http_client
+from .listing_parser import ParsePool, parse_listing, unpack_parsed
+from .pagination import PageInfo, page_number, page_url
+from .profiler import get_profiler, profiled
+from .metrics import ScrapingMetrics
+from .reveal_scheduler import RevealScheduler, parse_band, parse_weights
+from .seller_cache import SellerPhoneCache, seller_key
+from .selector_registry import SelectorRegistry
+from .throttle import AdaptiveThrottle
+from .user_agents import UserAgentPool
+from .wait_engine import SelectorWaiter
+
+# Os seletores de página (listagem e Selenium) ficam em config/selectors.json,
+# carregados pelo SelectorRegistry
+
+# Recursos bloqueados no perfil "lean": a revelação do telefone só precisa do
+# HTML, dos scripts da própria OLX e da API de telefones.
+LEAN_BLOCKED_URLS = [
+    # Imagens, mídia e fontes
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.avif', '*.ico',
+    '*.mp4', '*.webm', '*.mp3',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # Analytics, publicidade e rastreadores de terceiros
+    '*googletagmanager*', '*google-analytics*', '*doubleclick*', '*googlesyndication*',
+    '*adservice.google*', '*facebook*', '*fbcdn*', '*hotjar*', '*criteo*', '*taboola*',
+    '*outbrain*', '*tiktok*', '*bing.com*', '*clarity.ms*', '*nr-data.net*', '*newrelic*',
+    # O banner de consentimento (OneTrust, cookielaw.org) não é bloqueado: sem ele,
+    # _accept_cookies esperaria o tempo limite inteiro em toda sessão nova
+]
+
+# Soma os bytes transferidos pela página atual (documento + recursos)
+_PAGE_BYTES_SCRIPT = """
+const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+return entries.reduce(function (total, e) { return total + (e.transferSize || 0); }, 0);
+"""
 
 def _manage_proxy_cache(proxy: str = None, valid: bool = True) -> None:
     """Gerencia o cache de proxies."""
@@ -52,12 +93,10 @@ def fetch_random_proxies() -> list[str]:
     
     def fetch_from_api(api):
         try:
-            pass  # Add the intended logic here
-        except Exception as e:
-            print(f"[ERROR] An error occurred: {e}")
-            response = requests.get(api, timeout=5)
+            response = get_http_client().get(api, timeout=5)
             if response.status_code == 200:
-                return set(response.text.splitlines())
+                return {line.strip() for line in response.text.splitlines() if line.strip()}
+            print(f"[PROXY] {api} respondeu HTTP {response.status_code}")
         except Exception as e:
             print(f"[PROXY] Erro ao buscar proxies de {api}: {str(e)}")
         return set()
@@ -100,19 +139,25 @@ def fetch_random_proxies() -> list[str]:
     return working_proxies[:10]
 
 def test_proxy(proxy: str, timeout: int = 3) -> bool:
-    """Testa se um proxy está funcionando e pode acessar a OLX corretamente."""
-    proxies = {"http": f"http://{proxy}", "https": f"http://{proxy}"}
+    """Testa se um proxy está funcionando e pode acessar a OLX corretamente.
+
+    Os testes usam a sessão persistente do proxy no cliente compartilhado:
+    se ele for aprovado, as conexões abertas aqui já servem à extração.
+    """
+    client = get_http_client()
     try:
         # Primeiro teste rápido com Google
-        response = requests.get("https://www.google.com", proxies=proxies, timeout=timeout)
+        response = client.get("https://www.google.com", proxy=proxy, timeout=timeout)
         if response.status_code != 200:
             print(f"[PROXY] {proxy} falhou no teste do Google")
+            client.discard(proxy)
             return False
             
         # Teste detalhado com OLX
-        response = requests.get("https://www.olx.pt", proxies=proxies, timeout=timeout)
+        response = client.get("https://www.olx.pt", proxy=proxy, timeout=timeout)
         if response.status_code != 200:
             print(f"[PROXY] {proxy} falhou no acesso à OLX")
+            client.discard(proxy)
             return False
             
         # Verificações de conteúdo da OLX
@@ -127,11 +172,13 @@ def test_proxy(proxy: str, timeout: int = 3) -> bool:
         for indicator in indicators:
             if indicator not in content:
                 print(f"[PROXY] {proxy} falhou na verificação de conteúdo: {indicator}")
+                client.discard(proxy)
                 return False
                 
         print(f"[PROXY] {proxy} passou em todas as verificações")
         return True
     except Exception:
+        client.discard(proxy)
         return False
 
 def rotate_proxy(proxies: list[str], current_proxy: str, proxy_fail_count: dict = None) -> str:
@@ -153,16 +200,6 @@ def rotate_proxy(proxies: list[str], current_proxy: str, proxy_fail_count: dict
         
     return random.choice(available_proxies) if available_proxies else None
 
-def _handle_proxy_failure(self, proxy: str) -> None:
-    """Gerencia falhas de proxy e atualiza contadores."""
-    if proxy:
-        self._proxy_fail_count[proxy] = self._proxy_fail_count.get(proxy, 0) + 1
-        if self._proxy_fail_count[proxy] >= self._max_proxy_fails:
-            if proxy in self.proxies:
-                self.proxies.remove(proxy)
-            if proxy in self._proxy_cache:
-                self._proxy_cache.remove(proxy)
-
 class BeautifulSoupAdapter(ScrapingServicePort):
     """Adaptador para extração de dados da OLX usando Selenium e BeautifulSoup.
     
@@ -175,50 +212,164 @@ class BeautifulSoupAdapter(ScrapingServicePort):
     Attributes:
         email (str): Email para login
         password (str): Senha para login
-        driver (webdriver.Chrome): Instância do navegador
+        browsers (BrowserPool): Navegadores pré-aquecidos e reaproveitados entre itens e execuções
         proxies (list): Lista de proxies disponíveis
+        user_agents (UserAgentPool): Fingerprints de navegador, fixos por proxy de saída (HTTP) ou por navegador
+        accounts (AccountPool): Contas usadas para revelar telefones, cada uma com seu navegador
+        waiter (SelectorWaiter): Espera combinada por seletores no Selenium
+        selectors (SelectorRegistry): Seletores versionados, ordenados por taxa de acerto
+        block_detector (BlockDetector): Classifica respostas e páginas como ok, bloqueio ou captcha
+        throttle (AdaptiveThrottle): Concorrência e intervalo adaptativos (AIMD) por proxy/conta e global
+        browser_profile (str): 'lean' (headless, sem imagens/fontes/terceiros) ou 'full'
         current_proxy (str): Proxy atual em uso
+        forward_proxy (LocalForwardingProxy): Proxy local que distribui as conexões entre `proxies`
         retry_count (int): Número de tentativas para operações
-        min_request_delay (float): Delay mínimo entre requisições
+        min_request_delay (float): Delay mínimo entre requisições de um mesmo proxy de saída
+        metrics (ScrapingMetrics): Métricas por etapa da última execução
+        metrics_file (str): Arquivo opcional (.json ou .prom) para exportar métricas
+        base_url (str): Origem usada para completar e validar links dos anúncios
+        listing_parser (str): 'auto' (estado JSON com fallback para DOM), 'state', 'dom' ou 'stream' (DOM por recortes)
     """
     
     def __init__(self, email=None, password=None, proxies=None):
         self.proxies = proxies or []
         self.current_proxy = None
-        self.driver = None
         self.email = email
         self.password = password
         self.retry_count = 3
         self.last_request = 0
         self.min_request_delay = 1.0
-        self.user_agent = UserAgent()
+        self.user_agents = UserAgentPool()
         self._proxy_cache = set()
         self._proxy_fail_count = {}
         self._max_proxy_fails = 3
         self._proxy_timeout = 5
+        self.metrics = ScrapingMetrics()
+        self.metrics_file = os.getenv('OLX_METRICS_FILE')
+        self.http = get_http_client()
+        self.base_url = "https://www.olx.pt"
+        self.listing_parser = os.getenv('OLX_LISTING_PARSER', 'auto')
+        self.max_pages = int(os.getenv('OLX_MAX_PAGES', '0'))
+        self.listing_workers = max(int(os.getenv('OLX_LISTING_WORKERS', '4')), 1)
+        parse_workers = os.getenv('OLX_PARSE_WORKERS', '0')
+        parse_workers = (os.cpu_count() or 1) if parse_workers == 'auto' else int(parse_workers)
+        self.parse_pool = ParsePool(parse_workers) if parse_workers > 0 else None
+        self.accounts = None
+        # Protege a criação preguiçosa do proxy local e do pool de contas (modo worker usa várias threads)
+        self._lock = threading.Lock()
+        self.reveals_per_hour = int(os.getenv('OLX_REVEALS_PER_HOUR', '60'))
+        self.account_cooldown = float(os.getenv('OLX_ACCOUNT_COOLDOWN', '900'))
+        self.account_wait_timeout = 120.0
+        seller_cache = os.getenv('OLX_SELLER_CACHE', 'seller_phones.db')
+        self.seller_cache = SellerPhoneCache(
+            seller_cache, ttl=float(os.getenv('OLX_SELLER_CACHE_TTL_DAYS', '30')) * 86400,
+        ) if seller_cache != '0' else None
+        self.reveal_scheduler = RevealScheduler(
+            weights=parse_weights(os.getenv('OLX_REVEAL_PRIORITY')),
+            price_band=parse_band(os.getenv('OLX_REVEAL_PRICE_BAND')),
+            categories={c.strip() for c in os.getenv('OLX_REVEAL_CATEGORIES', '').split(',') if c.strip()},
+            max_reveals=int(os.getenv('OLX_REVEAL_MAX', '0')),
+            max_seconds=float(os.getenv('OLX_REVEAL_MAX_SECONDS', '0')),
+            deferred_file=os.getenv('OLX_REVEAL_DEFERRED_FILE', 'deferred_reveals.jsonl') or None,
+            known_seller=self._seller_known if self.seller_cache is not None else None,
+        )
+        self.waiter = SelectorWaiter(self.metrics, mode=os.getenv('OLX_WAIT_MODE', 'poll'))
+        self._cookie_sessions = set()
+        self.browser_profile = os.getenv('OLX_BROWSER_PROFILE', 'lean')
+        self.browsers = BrowserPool(
+            self._create_driver,
+            size=int(os.getenv('OLX_BROWSER_POOL_SIZE', '1')),
+            max_pages=int(os.getenv('OLX_BROWSER_MAX_PAGES', '200')),
+            max_rss_growth_mb=float(os.getenv('OLX_BROWSER_MAX_RSS_MB', '500')),
+        )
+        self.use_local_proxy = os.getenv('OLX_LOCAL_PROXY', '1') != '0'
+        self.forward_proxy = None
+        self.block_detector = BlockDetector()
+        self.selectors = SelectorRegistry(on_alert=lambda group, rate: self.metrics.incr('selector_alerts'))
+        self.throttle = AdaptiveThrottle(max_concurrency=int(os.getenv('OLX_MAX_CONCURRENCY', '4')))
         
-    def _respect_rate_limit(self):
-        """Controla intervalo entre requisições."""
-        now = time.time()
-        delay = self.min_request_delay - (now - self.last_request)
-        if delay > 0:
-            time.sleep(delay)
+    def _respect_rate_limit(self, key: str | None = None):
+        """Controla intervalo entre requisições (adaptativo, nunca abaixo de `min_request_delay`)."""
+        self.throttle.wait(key, floor=self.min_request_delay)
         self.last_request = time.time()
+
+    def _handle_proxy_failure(self, proxy: str) -> None:
+        """Gerencia falhas de proxy e atualiza contadores."""
+        if proxy:
+            self.metrics.incr('proxy_failures')
+            self._proxy_fail_count[proxy] = self._proxy_fail_count.get(proxy, 0) + 1
+            if self._proxy_fail_count[proxy] >= self._max_proxy_fails:
+                if proxy in self.proxies:
+                    self.proxies.remove(proxy)
+                _manage_proxy_cache(proxy, valid=False)
+                self.http.discard(proxy)
         
+    def _proxy_endpoint(self) -> str | None:
+        """Proxy para onde navegadores e sessões HTTP apontam.
+
+        Com o proxy local ativo é sempre o endereço local: o proxy de saída é
+        escolhido por conexão, então rotacionar não relança o navegador.
+        """
+        if self.forward_proxy is None:
+            if not self.use_local_proxy or not self.proxies:
+                return self.current_proxy
+            with self._lock:
+                if self.forward_proxy is None:
+                    self.forward_proxy = LocalForwardingProxy(self.proxies).start()
+                    return self.forward_proxy.address
+        self.forward_proxy.set_upstreams(self.proxies)
+        return self.forward_proxy.address
+
+    def _http_route(self) -> tuple[str | None, str]:
+        """Endpoint de uma requisição HTTP e a chave da sua identidade (fingerprint e throttle).
+
+        Com o proxy local, a sessão é fixada em um proxy de saída (`route`) e a
+        chave é esse proxy, não o endereço local compartilhado por todas: o
+        intervalo mínimo e o AIMD valem por IP de saída, não para o conjunto.
+        """
+        endpoint = self._proxy_endpoint()
+        if self.forward_proxy is None:
+            return endpoint, endpoint or 'direct'
+        upstream = self.forward_proxy.pick()
+        if upstream is None:
+            return endpoint, 'direct'
+        return self.forward_proxy.route(upstream), upstream
+
+    def _apply_fingerprint(self, driver) -> None:
+        """Sorteia o fingerprint do navegador e o aplica via CDP, com os Client Hints.
+
+        Cada navegador tem sua própria identidade, escolhida entre os
+        fingerprints do Chrome na versão instalada (o proxy local é
+        compartilhado, então não serve de chave).
+        """
+        full_version = driver.capabilities.get('browserVersion', '')
+        fingerprint = self.user_agents.for_browser(int(full_version.split('.')[0]))
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', fingerprint.ua_override(full_version))
+        try:
+            driver.execute_cdp_cmd('Emulation.setLocaleOverride', {'locale': fingerprint.language})
+        except Exception as e:
+            print(f"[BROWSER] Não foi possível ajustar o locale via CDP: {e}")
+
     def _get_chrome_options(self) -> webdriver.ChromeOptions:
-        """Configura opções do Chrome para scraping com rotação de user-agent e proteções anti-detecção."""
+        """Configura opções do Chrome para scraping com proteções anti-detecção.
+
+        O User-Agent não vai nas opções: depende da versão instalada e é
+        aplicado depois do lançamento (`_apply_fingerprint`).
+        """
+        from selenium import webdriver
         options = webdriver.ChromeOptions()
         
-        # User-Agent aleatório
-        random_user_agent = self.user_agent.random
-        options.add_argument(f'--user-agent={random_user_agent}')
-        
         # Performance e Privacidade
         options.add_argument('--disable-gpu')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-notifications')
         options.add_argument('--disable-popup-blocking')
+        lean = self.browser_profile == 'lean'
+        if lean:
+            options.add_argument('--headless=new')
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_argument('--mute-audio')
         
         # Anti-detecção avançada
         options.add_argument('--disable-blink-features=AutomationControlled')
@@ -232,10 +383,10 @@ class BeautifulSoupAdapter(ScrapingServicePort):
             'profile.default_content_settings.popups': 0,
             'credentials_enable_service': False,
             'profile.password_manager_enabled': False,
-            'profile.managed_default_content_settings.images': 1,
+            'profile.managed_default_content_settings.images': 2 if lean else 1,
             'profile.managed_default_content_settings.javascript': 1,
             'profile.default_content_setting_values.notifications': 2,
-            'profile.managed_default_content_settings.plugins': 1,
+            'profile.managed_default_content_settings.plugins': 2 if lean else 1,
             'profile.default_content_settings.geolocation': 2,
             'profile.default_content_settings.media_stream': 2
         }
@@ -245,143 +396,101 @@ class BeautifulSoupAdapter(ScrapingServicePort):
         options.add_argument('--disable-web-security')
         options.add_argument('--ignore-certificate-errors')
         options.add_argument('--allow-running-insecure-content')
+        return options
+        
+    def _create_driver(self, proxy: str | None = None):
+        """Cria um novo navegador com as opções atuais e o proxy informado."""
+        from selenium import webdriver
+        options = self._get_chrome_options()
         
-    def _initialize_browser(self):
-        """Inicializa navegador com configurações otimizadas."""
+        if proxy:
+            options.add_argument(f'--proxy-server={proxy}')
+        
+        driver = webdriver.Chrome(options=options)
+        driver.set_page_load_timeout(30)
+        driver.implicitly_wait(0)  # Esperas são explícitas (SelectorWaiter)
+        driver.set_window_size(1920, 1080)
         try:
-            if self.driver:
-                self._cleanup_driver()
+            self._apply_fingerprint(driver)
+        except Exception as e:
+            print(f"[BROWSER] Não foi possível aplicar o fingerprint via CDP: {e}")
+        if self.browser_profile == 'lean':
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+            except Exception as e:
+                print(f"[BROWSER] Não foi possível bloquear recursos via CDP: {e}")
+        print(f"[BROWSER] Navegador inicializado (perfil {self.browser_profile})")
+        return driver
 
-            options = self._get_chrome_options()
-            
-            if self.current_proxy:
-                options.add_argument(f'--proxy-server={self.current_proxy}')
-            
-            self.driver = webdriver.Chrome(options=options)
-            self.driver.set_page_load_timeout(30)
-            self.driver.implicitly_wait(3)
-            self.driver.set_window_size(1920, 1080)
-            
-            print("[BROWSER] Navegador inicializado")
+    def _accept_cookies(self, driver, timeout: float = 2.0) -> bool:
+        """Aceita cookies uma única vez por sessão do navegador."""
+        if driver.session_id in self._cookie_sessions:
+            return True
+        self._cookie_sessions.add(driver.session_id)
+        selector, btn = self._wait_for(driver, 'cookies', timeout, clickable=True)
+        if not selector:
+            return False
+        try:
+            btn.click()
+            # Aguarda o banner sair para não interceptar os próximos cliques
+            self.waiter.wait_gone(driver, selector, timeout=1.0)
             return True
-            
         except Exception as e:
-            print(f"[BROWSER] Erro: {e}")
-            self._cleanup_driver()
+            print(f"[COOKIES] Erro ao aceitar cookies: {e}")
             return False
-    
-    
-    def _accept_cookies(self, wait: WebDriverWait) -> bool:
-        """Aceita cookies se necessário."""
-        for selector in ['#onetrust-accept-btn-handler',
-                        'button[data-testid="cookie-policy-dialog-accept-button"]']:
-            try:
-                btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                btn.click()
-                time.sleep(0.3)
-                return True
-            except:
-                continue
-        return False
         
-    def login(self, progress_callback=None) -> bool:
-        """Realiza login no site usando credenciais configuradas."""
+    def _login_on(self, driver, email: str, password: str, progress_callback=None) -> None:
+        """Executa o fluxo de login em um navegador já iniciado."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        # Acessar site
+        driver.get(self.base_url)
+        wait = WebDriverWait(driver, 3)
+        
+        if progress_callback:
+            progress_callback(30, "Aceitando cookies...")
+        self._accept_cookies(driver)
+        
+        # Clicar no botão de login
+        if progress_callback:
+            progress_callback(50, "Acessando login...")
         try:
-            if not self.email or not self.password:
-                raise ValueError("Credenciais não configuradas")
-            
-            # Inicializar browser
-            if progress_callback:
-                progress_callback(10, "Iniciando navegador...")
-            if not self._initialize_browser():
-                raise Exception("Falha ao inicializar navegador")
+            btn = wait.until(EC.element_to_be_clickable(
+                (By.CSS_SELECTOR, 'a[data-cy="myolx-link"]')
+            ))
+            btn.click()
+        except:
+            raise Exception("Botão de login não encontrado")
+        
+        # Preencher formulário
+        if progress_callback:
+            progress_callback(70, "Preenchendo credenciais...")
+        try:
+            # Email
+            email_field = wait.until(EC.presence_of_element_located((By.ID, 'username')))
+            email_field.clear()
+            email_field.send_keys(email)
             
-            # Acessar site
-            self.driver.get("https://www.olx.pt")
-            wait = WebDriverWait(self.driver, 3)
+            # Senha
+            pass_field = wait.until(EC.presence_of_element_located((By.ID, 'password')))
+            pass_field.clear()
+            pass_field.send_keys(password)
             
-            if progress_callback:
-                progress_callback(30, "Aceitando cookies...")
-            self._accept_cookies(wait)
-            time.sleep(0.3)
+            # Submit e espera pelo indicador de sessão iniciada
+            pass_field.send_keys(Keys.RETURN)
+            if not self._wait_for(driver, 'logged_in', timeout=10)[0]:
+                print("[LOGIN] Indicador de login não encontrado após envio do formulário")
             
-            # Clicar no botão de login
             if progress_callback:
-                progress_callback(50, "Acessando login...")
-            try:
-                btn = wait.until(EC.element_to_be_clickable(
-                    (By.CSS_SELECTOR, 'a[data-cy="myolx-link"]')
-                ))
-                btn.click()
-                time.sleep(0.3)
-            except:
-                raise Exception("Botão de login não encontrado")
-            
-            # Preencher formulário
-            if progress_callback:
-                progress_callback(70, "Preenchendo credenciais...")
-            try:
-                # Email
-                email_field = wait.until(EC.presence_of_element_located((By.ID, 'username')))
-                email_field.clear()
-                email_field.send_keys(self.email)
-                time.sleep(0.2)
-                
-                # Senha
-                pass_field = wait.until(EC.presence_of_element_located((By.ID, 'password')))
-                pass_field.clear()
-                pass_field.send_keys(self.password)
-                time.sleep(0.2)
-                
-                # Submit
-                pass_field.send_keys(Keys.RETURN)
-                time.sleep(0.3)
-                
-                if progress_callback:
-                    progress_callback(100, "Login realizado!")
-                return True
-                
-            except Exception as e:
-                raise Exception(f"Erro ao preencher formulário: {e}")
+                progress_callback(100, "Login realizado!")
             
         except Exception as e:
-            print(f"[LOGIN] Erro: {e}")
-            self._cleanup_driver()
-            return False
-
-
-    def _process_items(self, items: list, progress_callback=None) -> list:
-        """Processa cada item para extrair detalhes adicionais."""
-        processed = []
-        total = len(items)
-        
-        for idx, item in enumerate(items, 1):
-            try:
-                if progress_callback:
-                    progress_callback(40 + (idx/total * 60),
-                                   f"Item {idx}/{total}")
-
-                self._respect_rate_limit()
-                self.driver.get(item['link'])
-                
-                wait = WebDriverWait(self.driver, 5)
-                self._accept_cookies(wait)
-                time.sleep(0.3)
+            raise Exception(f"Erro ao preencher formulário: {e}")
 
-                # Extrair telefone
-                phone = self._extract_phone(wait)
-                item['phone'] = phone if phone else 'N/A'
-                processed.append(item)
-
-            except Exception as e:
-                print(f"[PROCESS] Erro no item {idx}: {e}")
-                item['phone'] = 'N/A'
-                processed.append(item)
-
-        return processed
-
-
-            
     def scrape(self, url: str, progress_callback=None) -> ScrapingData:
         """
         Método principal de scraping, implementando a interface ScrapingServicePort.
@@ -399,24 +508,37 @@ class BeautifulSoupAdapter(ScrapingServicePort):
         return self.extract_data(url, progress_callback)
 
 
-    def __del__(self):
-        """Destrutor para garantir limpeza de recursos."""
+    def close(self) -> None:
+        """Fecha todos os navegadores do adaptador (ociosos e em uso) e os processos de parsing."""
         self._cleanup_driver()
+        self.browsers.close()
+        if self.parse_pool:
+            self.parse_pool.close()
+        if self.forward_proxy:
+            self.forward_proxy.stop()
+            self.forward_proxy = None
 
+    @profiled('extract_data')
     def extract_data(self, url: str, progress_callback=None) -> ScrapingData:
         """Extrai dados dos anúncios da URL fornecida com rotação automática de IP e proxy."""
+        self.metrics.reset()
         try:
-            self._init_proxies(progress_callback)
+            with self.metrics.stage('proxies'):
+                self._init_proxies(progress_callback)
+            # Os navegadores abrem em segundo plano enquanto a listagem é baixada
+            self._prewarm_browsers()
             
             # Primeiro extrai a lista de itens usando BeautifulSoup (sem login)
             items_data = []
             for attempt in range(self.retry_count):
                 try:
-                    items_data = self._extract_items_list(url, progress_callback)
+                    with self.metrics.stage('listing'):
+                        items_data = self._extract_items_list(url, progress_callback)
                     if items_data:
                         break
                 except Exception as e:
                     print(f"[EXTRACT] Erro na listagem {attempt + 1}: {str(e)}")
+                    self.metrics.incr('retries')
                     self._handle_proxy_failure(self.current_proxy)
                     self.current_proxy = rotate_proxy(self.proxies, self.current_proxy, self._proxy_fail_count)
                     
@@ -435,16 +557,15 @@ class BeautifulSoupAdapter(ScrapingServicePort):
             retry_count = self.retry_count * 2  # Aumenta tentativas para detalhes
             for attempt in range(retry_count):
                 try:
-                    # Alterna user-agent a cada tentativa
-                    if self.driver:
-                        self._cleanup_driver()
-                        self.driver = None
-                        
-                    detailed_data = self._process_items(items_data, progress_callback)
+                    # Navegadores saudáveis são mantidos; os que falharam já foram descartados
+                    with self.metrics.stage('details'):
+                        detailed_data = self._process_items(items_data, progress_callback, url)
+                    self.metrics.incr('items', len(detailed_data))
                     return ScrapingData(url, detailed_data)
                     
                 except Exception as e:
                     print(f"[EXTRACT] Erro no processamento {attempt + 1}: {str(e)}")
+                    self.metrics.incr('retries')
                     self._handle_proxy_failure(self.current_proxy)
                     
                     # Rotaciona proxy e tenta novamente
@@ -462,6 +583,75 @@ class BeautifulSoupAdapter(ScrapingServicePort):
             print(f"[EXTRACT] Erro crítico: {str(e)}")
             self._cleanup_driver()
             raise
+        finally:
+            self._report_metrics()
+
+    @contextmanager
+    def work_session(self):
+        """Sessão para processar tarefas avulsas (modo worker): proxies prontos no início, métricas no fim."""
+        self.metrics.reset()
+        try:
+            with self.metrics.stage('proxies'):
+                self._init_proxies()
+            yield self
+        finally:
+            self._report_metrics()
+
+    def fetch_listing_page(self, url: str, page: int) -> tuple[list, PageInfo]:
+        """Baixa e interpreta uma única página da busca."""
+        with self.metrics.stage('listing'):
+            return self._fetch_listing_page(page_url(url, page), page).result()
+
+    def reveal_phone(self, item: dict) -> str | None:
+        """Revela o telefone de um único anúncio com o pool de contas."""
+        phone = self._cached_phone(item)
+        if phone:
+            return phone
+        if self.accounts is None:
+            self._check_account_browsers(self._get_account_pool())
+        with self.metrics.stage('details'):
+            phone = self._reveal_with_accounts(item)
+        if self.seller_cache is not None:
+            self.seller_cache.put(item, phone)
+        return phone
+
+    def _seller_known(self, item: dict) -> bool:
+        return self.seller_cache.get(item) is not None
+
+    def _cached_phone(self, item: dict) -> str | None:
+        """Telefone do vendedor no cache; conta acertos e falhas só para anúncios com vendedor identificado."""
+        if self.seller_cache is None or seller_key(item) is None:
+            return None
+        phone = self.seller_cache.get(item)
+        self.metrics.incr('seller_cache_hits' if phone else 'seller_cache_misses')
+        return phone
+
+    def _report_metrics(self) -> None:
+        """Imprime o resumo de métricas da execução e exporta para arquivo se configurado."""
+        self.metrics.finish()
+        print(self.metrics.summary())
+        print(f"[BROWSER_POOL] {self.browsers.stats()}")
+        if self.forward_proxy:
+            print(f"[LOCAL_PROXY] {self.forward_proxy.stats()}")
+        print(f"[HTTP] {self.http.stats()}")
+        if self.parse_pool:
+            print(f"[PARSE_POOL] {self.parse_pool.stats()}")
+        print(f"[THROTTLE] {self.throttle.snapshot()}")
+        if self.seller_cache is not None:
+            counters = self.metrics.snapshot()['counters']
+            hits, misses = counters.get('seller_cache_hits', 0), counters.get('seller_cache_misses', 0)
+            rate = f"{hits / (hits + misses):.0%}" if hits + misses else 'n/a'
+            print(f"[SELLER_CACHE] acertos={hits} falhas={misses} taxa={rate} vendedores={len(self.seller_cache)}")
+        if self.reveal_scheduler.stats():
+            print(f"[REVEAL] {self.reveal_scheduler.stats()}")
+        rates = ' '.join(f"{group}={stats['success_rate']:.0%}" for group, stats in self.selectors.stats().items()
+                         if stats['success_rate'] is not None)
+        print(f"[SELECTORS] versão {self.selectors.version}: {rates}")
+        if self.metrics_file:
+            try:
+                self.metrics.write(self.metrics_file)
+            except Exception as e:
+                print(f"[METRICS] Erro ao salvar métricas: {e}")
 
     def _init_proxies(self, progress_callback=None):
         """Inicializa os proxies se necessário."""
@@ -476,351 +666,462 @@ class BeautifulSoupAdapter(ScrapingServicePort):
                 self.current_proxy = rotate_proxy(self.proxies, None)
                 print(f"[PROXY] Usando proxy inicial: {self.current_proxy}")
 
-    def _attempt_extraction(self, url: str, attempt: int, progress_callback=None) -> dict:
-        """Tenta extrair dados de uma URL específica."""
-        if not self.driver:
-            if progress_callback:
-                progress_callback(15, "Inicializando navegador...")
-            self._initialize_browser()
-
-        print(f"[SCRAPING] Tentativa {attempt + 1}/{self.retry_count} - URL: {url}")
-        if progress_callback:
-            progress_callback(20, f"Acessando página... (Tentativa {attempt + 1})")
-
-        self.driver.set_page_load_timeout(8)  # Mantido acima de 5s por ser carregamento de página
-        self.driver.get(url)
-
-        if progress_callback:
-            progress_callback(50, "Extraindo dados da página...")
-
-        wait = WebDriverWait(self.driver, 4)  # Reduzido para 4 segundos
-        data = self._extract_elements(url, wait)
-        
-        if progress_callback:
-            progress_callback(100, "Extração concluída com sucesso!")
-            
-        return data
-
-    def _check_login(self) -> bool:
-        """Verifica se ainda está logado e se o IP não está bloqueado."""
-        try:
-            # Verifica login
-            is_logged = bool(self.driver.find_element(By.CSS_SELECTOR, '[data-testid="myaccount-link-logged"]'))
-            if not is_logged:
-                return False
-                
-            # Verifica se página está acessível
-            if self._is_ip_blocked():
-                print("[LOGIN] IP atual bloqueado, tentando recuperar...")
-                self._handle_ip_block()
-                return False
-                
-            return True
-            
-        except NoSuchElementException:
-            return False
-        except Exception as e:
-            print(f"[LOGIN] Erro ao verificar login: {e}")
-            return False
-
-    def _is_ip_blocked(self) -> bool:
-        """Verifica se o IP atual está bloqueado."""
-        blocked_indicators = [
-            '//div[contains(text(), "blocked")]',
-            '//div[contains(text(), "security check")]',
-            '//div[contains(text(), "captcha")]',
-            '//div[contains(text(), "verificação")]'
-        ]
-        
+    def _classify_page(self, driver) -> str:
+        """Classifica a página aberta no navegador (ok, captcha, ...)."""
         try:
-            for indicator in blocked_indicators:
-                if self.driver.find_elements(By.XPATH, indicator):
-                    return True
-            return False
+            verdict = self.block_detector.classify_driver(driver)
         except Exception as e:
             print(f"[IP_CHECK] Erro ao verificar bloqueio: {e}")
-            return True  # Assume bloqueado em caso de erro
-            
-    def _handle_ip_block(self) -> bool:
-        """Tenta recuperar de um bloqueio de IP."""
-        try:
-            # Limpa cookies e cache
-            self.driver.delete_all_cookies()
-            
-            # Rotaciona proxy e user agent
-            old_proxy = self.current_proxy
-            self.current_proxy = rotate_proxy(self.proxies, self.current_proxy, self._proxy_fail_count)
-            
-            # Se não conseguiu novo proxy, busca mais
-            if not self.current_proxy or self.current_proxy == old_proxy:
-                self.proxies = fetch_random_proxies()
-                self.current_proxy = rotate_proxy(self.proxies, old_proxy)
-            
-            # Reinicializa navegador com novas configurações
-            if self.driver:
-                self._cleanup_driver()
-                self.driver = None
-            
-            return bool(self.current_proxy)
-        except Exception as e:
-            print(f"[IP_BLOCK] Erro ao tentar recuperar: {e}")
-            return False
+            return BLOCKED  # Assume bloqueado em caso de erro
+        if verdict in BLOCK_VERDICTS:
+            self.metrics.incr('blocks_detected')
+        return verdict
 
     def _extract_items_list(self, url: str, progress_callback=None) -> list:
-        """Extrai lista de itens da página usando BeautifulSoup com suporte a paginação e rotação de IP."""
+        """Extrai lista de itens da busca, percorrendo todas as páginas de resultados.
+
+        A primeira página informa quantas páginas existem (estado JSON) ou
+        quais estão visíveis na paginação (DOM). As páginas já conhecidas são
+        buscadas em paralelo e processadas na ordem; ao chegar na última
+        conhecida, a paginação dela indica se há mais. A extração para quando
+        uma página vem vazia (resultados esgotados) ou quando o site devolve
+        outra página no lugar da pedida ou só anúncios já vistos (a busca
+        "deu a volta").
+        """
         all_items = []
+        seen = set()
         current_page = 1
-        has_next = True
-        session = requests.Session()
-        
-        # Configura a sessão com user-agent aleatório
-        session.headers.update({'User-Agent': self.user_agent.random})
-        
-        while has_next and current_page <= 20:  # Reduzido para 20 páginas
-            self._respect_rate_limit()
-            page_url = f"{url}?page={current_page}" if current_page > 1 else url
-            
-            try:
-                # Configura proxy se disponível
-                proxies = None
-                if self.current_proxy:
-                    proxies = {
-                        "http": f"http://{self.current_proxy}",
-                        "https": f"http://{self.current_proxy}"
-                    }
-                
-                # Tenta fazer a requisição com retry em caso de erro
-                for attempt in range(3):
-                    try:
-                        response = session.get(page_url, proxies=proxies, timeout=10)
-                        if response.status_code == 200:
-                            break
-                    except Exception as e:
-                        print(f"[EXTRACT] Erro na página {current_page}, tentativa {attempt + 1}: {str(e)}")
-                        if attempt < 2:
-                            self._handle_proxy_failure(self.current_proxy)
-                            self.current_proxy = rotate_proxy(self.proxies, self.current_proxy, self._proxy_fail_count)
-                            if self.current_proxy:
-                                proxies = {
-                                    "http": f"http://{self.current_proxy}",
-                                    "https": f"http://{self.current_proxy}"
-                                }
-                            session.headers.update({'User-Agent': self.user_agent.random})
-                            time.sleep(2)
-                        else:
-                            raise
-            
-            if progress_callback:
-                progress_callback(30, f"Extraindo itens da página {current_page}...")
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            items = []
-            
-            # Seletores possíveis para diferentes estruturas de página
-            selectors = {
-                'container': [
-                    'div[data-cy="l-card"]',  # Seletor principal de cartão
-                    'div.css-1sw7q4x',  # Novo layout
-                    'div[data-testid="ad-card"]'  # Fallback
-                ],
-                'link': [
-                    'a[data-cy="listing-link"]',  # Link principal
-                    'a[href*="/anuncio/"]',  # Link de anúncio
-                    'a[href*="/d/"]',  # Link direto
-                ],
-                'name': [
-                    'h6[data-testid="ad-title"]',  # Título principal
-                    'h2.css-1pvw9s4',  # Título novo layout
-                    'div[data-testid="ad-title"] h6'  # Título em container
-                ],
-                'price': [
-                    'span[data-testid="ad-price"]',  # Preço principal
-                    'p.css-10b0gli',  # Preço novo layout
-                    'span[data-testid="price-value"]'  # Preço alternativo
-                ],
-                'seller': [
-                    'span[data-testid="seller-name"]',  # Nome principal
-                    'div[data-testid="seller-info"] span',  # Info vendedor
-                    'div.css-1f4s4lo'  # Container vendedor
-                ]
-            }
-            
-            # Tentar cada seletor até encontrar itens
-            item_elements = []
-            for container in selectors['container']:
-                items = soup.select(container)
-                if items:
-                    item_elements = items
-                    print(f"[EXTRACT] Encontrados {len(items)} itens usando seletor {container}")
+        items, info = self._fetch_listing_page(page_url(url, 1), 1).result()
+        pages = {1: (items, info)}
+        executor = None
+        try:
+            while True:
+                for number in sorted(pages):
+                    items, info = pages.pop(number)
+                    if progress_callback:
+                        progress_callback(30, f"Extraindo itens da página {number}...")
+                    new_items = self._accept_listing_page(number, items, info, seen)
+                    if new_items is None:
+                        return all_items
+                    print(f"[EXTRACT] {len(new_items)} itens processados nesta página")
+                    all_items.extend(new_items)
+                    current_page = number
+                print(f"[EXTRACT] {len(all_items)} itens encontrados até agora...")
+
+                if not info.has_next:
+                    break
+                if self.max_pages and current_page >= self.max_pages:
+                    print(f"[EXTRACT] Limite de {self.max_pages} páginas atingido")
                     break
 
-            if not item_elements:
-                print("[EXTRACT] Nenhum item encontrado nesta página")
-                break
+                # Páginas conhecidas a partir da paginação da última processada
+                last = max(info.total or 0, current_page + 1)
+                if self.max_pages:
+                    last = min(last, self.max_pages)
+                urls = {number: page_url(url, number) for number in range(current_page + 1, last + 1)}
+                if info.next_url and page_number(info.next_url) == current_page + 1:
+                    urls[current_page + 1] = info.next_url
 
-            for item_elem in item_elements:
-                item_data = {'name': 'N/A', 'price': 'N/A', 'seller_name': 'N/A', 'link': None}
-                
-                try:
-                    # 1. Extrair e validar link
-                    for selector in selectors['link']:
-                        try:
-                            link_elem = item_elem.select_one(selector)
-                            if link_elem and link_elem.has_attr('href'):
-                                link = link_elem['href']
-                                if not link.startswith('http'):
-                                    link = f"https://www.olx.pt{link}"
-                                if 'olx.pt' in link:
-                                    item_data['link'] = link
-                                    print(f"[EXTRACT] Link encontrado: {link}")
-                                    break
-                        except Exception as e:
-                            print(f"[EXTRACT] Erro ao extrair link com seletor {selector}: {e}")
-                            continue
-                    
-                    if not item_data['link']:
-                        print("[EXTRACT] Link inválido, pulando item")
-                        continue
-                    
-                    # 2. Extrair outros dados
-                    for field in ['name', 'price', 'seller_name']:
-                        for selector in selectors[field]:
-                            try:
-                                elem = item_elem.select_one(selector)
-                                if elem:
-                                    text = elem.get_text(strip=True)
-                                    if text:
-                                        item_data[field] = text
-                                        print(f"[EXTRACT] {field}: {text}")
-                                        break
-                            except Exception as e:
-                                print(f"[EXTRACT] Erro ao extrair {field}: {e}")
-                                continue
-                    
-                    # 3. Validar e adicionar item
-                    required_fields = ['name', 'link']
-                    optional_fields = ['price', 'seller_name']
-                    
-                    # Verificar campos obrigatórios
-                    if all(item_data[field] != 'N/A' and item_data[field] is not None for field in required_fields):
-                        # Garantir que pelo menos um campo opcional tem valor
-                        if any(item_data[field] != 'N/A' for field in optional_fields):
-                            items.append(item_data)
-                            print(f"[EXTRACT] Item adicionado: {item_data['name'][:30]}...")
-                        else:
-                            print("[EXTRACT] Item sem dados opcionais, ignorando")
-                    else:
-                        print("[EXTRACT] Item sem dados obrigatórios, ignorando")
-                    
-                except Exception as e:
-                    print(f"[EXTRACT] Erro ao extrair item: {str(e)}")
+                if len(urls) == 1 or self.listing_workers == 1:
+                    pages = {number: self._fetch_listing_page(link, number).result()
+                             for number, link in urls.items()}
                     continue
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=self.listing_workers)
+                print(f"[EXTRACT] Buscando páginas {current_page + 1} a {last} em paralelo")
+                futures = {number: executor.submit(self._fetch_listing_page, link, number)
+                           for number, link in urls.items()}
+                pages = {number: future.result().result() for number, future in futures.items()}
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
 
-            print(f"[EXTRACT] {len(items)} itens processados nesta página")
-            all_items.extend(items)
-            
-            # Verificar próxima página
-            next_selectors = [
-                'a.next-page:not(.disabled)',
-                'a.pagination-next:not(.disabled)',
-                'a[rel="next"]'
-            ]
-            has_next = False
-            for selector in next_selectors:
-                if soup.select_one(selector):
-                    has_next = True
-                    break
-            
-            if not items or not has_next:
-                break
-                
-            current_page += 1
-            print(f"[EXTRACT] {len(all_items)} itens encontrados até agora...")
-        
         return all_items
 
-    def _extract_phone(self, wait: WebDriverWait) -> str | None:
-        """Extrai o número de telefone da página atual."""
+    def _accept_listing_page(self, number: int, items: list, info: PageInfo, seen: set) -> list | None:
+        """Filtra os anúncios inéditos da página; None quando a paginação acabou ou deu a volta."""
+        if not items:
+            print(f"[EXTRACT] Página {number} sem itens, fim dos resultados")
+            return None
+        if info.current is not None and info.current != number:
+            print(f"[EXTRACT] Pedida a página {number}, o site devolveu a {info.current}; fim dos resultados")
+            self.metrics.incr('wrapped_pages')
+            return None
+        new_items = []
+        for item in items:
+            key = item.get('id') or item['link']
+            if key not in seen:
+                seen.add(key)
+                new_items.append(item)
+        if not new_items:
+            print(f"[EXTRACT] Página {number} só repete anúncios já vistos; fim dos resultados")
+            self.metrics.incr('wrapped_pages')
+            return None
+        if len(new_items) < len(items):
+            self.metrics.incr('duplicate_items', len(items) - len(new_items))
+        return new_items
+
+    def _fetch_listing_page(self, page_link: str, number: int) -> Future:
+        """Baixa uma página de listagem, com retry em caso de erro ou bloqueio, e a interpreta.
+
+        Com o pool de parsing, o parsing roda em outro processo e a thread de
+        download fica livre para a próxima página.
+
+        Returns:
+            Future: Resolve para (itens, paginação); já resolvido sem o pool de parsing
+        """
         try:
-            # Tentar botões que revelam o telefone
-            for btn_selector in [
-                "//button[contains(@data-testid, 'reveal-phone')]",
-                "//button[contains(@data-cy, 'show-phone')]",
-                "//button[contains(text(), 'telefone')]"
-            ]:
+            for attempt in range(3):
+                # Sessão persistente, fingerprint e ritmo do proxy de saída
+                proxy, throttle_key = self._http_route()
+                self._respect_rate_limit(throttle_key)
                 try:
-                    btn = wait.until(EC.element_to_be_clickable((By.XPATH, btn_selector)))
-                    if btn.is_displayed():
-                        btn.click()
-                        time.sleep(0.5)
+                    self.metrics.incr('requests')
+                    with self.throttle.slot(throttle_key), self.metrics.stage('fetch'):
+                        response = self.http.get(page_link, proxy=proxy,
+                                                 headers=self.user_agents.for_key(throttle_key).headers())
+                    self.metrics.incr('bytes', len(response.content))
+                    verdict = self.block_detector.classify_response(
+                        response.status_code, response.url, response.text)
+                    self.throttle.record(throttle_key, verdict)
+                    if verdict == OK:
                         break
-                except:
-                    continue
+                    if verdict in BLOCK_VERDICTS:
+                        self.metrics.incr('blocks_detected')
+                    raise Exception(f"Resposta classificada como {verdict} (HTTP {response.status_code})")
+                except Exception as e:
+                    print(f"[EXTRACT] Erro na página {number}, tentativa {attempt + 1}: {str(e)}")
+                    self.metrics.incr('retries')
+                    if attempt < 2:
+                        # Com o proxy local o failover já acontece por conexão
+                        if self.forward_proxy is None:
+                            self._handle_proxy_failure(self.current_proxy)
+                            self.current_proxy = rotate_proxy(self.proxies, self.current_proxy, self._proxy_fail_count)
+                    else:
+                        raise
+        except Exception as e:
+            print(f"[EXTRACT] Falha ao acessar página {number}: {str(e)}")
+            raise
 
-            # Buscar número revelado
-            for phone_selector in [
-                "//span[contains(@data-testid, 'contact-phone')]",
-                "//div[contains(@data-testid, 'phone-number')]//span",
-                "//a[starts-with(@href, 'tel:')]"
-            ]:
-                try:
-                    element = wait.until(EC.presence_of_element_located((By.XPATH, phone_selector)))
-                    if element.is_displayed():
-                        phone = element.text or element.get_attribute('href')
-                        if phone:
-                            phone = ''.join(c for c in phone if c.isdigit() or c == '+')
-                            if phone and len(phone) > 8:
-                                print(f"[PHONE] Encontrado: {phone}")
-                                return phone
-                except:
-                    continue
+        self.metrics.incr('pages')
+        # Redirecionamento para outra página (ex.: além da última, o site volta à primeira)
+        served = page_number(response.url) if response.url else number
 
-            return None
+        result = Future()
+        if self.parse_pool is None:
+            with self.metrics.stage('parse'):
+                items, info = self._parse_listing_page(response.text)
+            if info.current is None and served != number:
+                info.current = served
+            result.set_result((items, info))
+            return result
+
+        def finish(parsed):
+            try:
+                rows, page, used, records, seconds, stats = parsed.result()
+                self.metrics.add_time('parse', seconds)
+                if stats:
+                    get_profiler().add_stats('listing_parse', stats, seconds)
+                for group, selector in records:
+                    self.selectors.record(group, selector)
+                if used:
+                    self.metrics.incr(f'{used}_pages')
+                items, info = unpack_parsed(rows, page, used)
+                if info.current is None and served != number:
+                    info.current = served
+                result.set_result((items, info))
+            except Exception as e:
+                result.set_exception(e)
+
+        self.parse_pool.submit(response.content, response.encoding, self.base_url, self.listing_parser,
+                               self.selectors.order(), profile=get_profiler().enabled).add_done_callback(finish)
+        return result
+
+    @profiled('listing_parse')
+    def _parse_listing_page(self, html: str) -> tuple[list, PageInfo]:
+        """Extrai os anúncios de uma página de listagem.
+
+        Usa o estado JSON pré-renderizado quando disponível (mais rápido e com
+        mais campos) e cai para a raspagem por DOM caso contrário.
+
+        Returns:
+            tuple: Lista de itens válidos e a paginação da página
+        """
+        items, info, used = parse_listing(html, self.base_url, self.listing_parser, self.selectors)
+        if used:
+            self.metrics.incr(f'{used}_pages')
+        return items, info
+
+    def _read_phone(self, element) -> str | None:
+        """Lê e normaliza o telefone de um elemento revelado."""
+        phone = element.text or element.get_attribute('href')
+        if phone:
+            phone = ''.join(c for c in phone if c.isdigit() or c == '+')
+            if phone and len(phone) > 8:
+                print(f"[PHONE] Encontrado: {phone}")
+                self.metrics.incr('phones_found')
+                return phone
+        return None
+
+    def _wait_for(self, driver, group: str, timeout: float, clickable: bool = False):
+        """Espera pelos seletores do grupo no registro e registra qual funcionou."""
+        selector, element = self.waiter.wait_any(
+            driver, group, self.selectors.candidates(group), timeout, clickable=clickable)
+        self.selectors.record(group, selector)
+        return selector, element
+
+    def _extract_phone(self, driver, timeout: float = 5.0) -> str | None:
+        """Extrai o número de telefone da página atual."""
+        try:
+            # Uma única espera pelo botão de revelar ou por um telefone já visível
+            button_selectors = self.selectors.candidates('phone_button')
+            phone_selectors = self.selectors.candidates('phone')
+            selector, element = self.waiter.wait_any(
+                driver, 'phone_entry', button_selectors + phone_selectors, timeout)
+            if not selector:
+                self.selectors.record('phone_button', None)
+                return None
+
+            if selector in phone_selectors:
+                self.selectors.record('phone', selector)
+                phone = self._read_phone(element)
+                if phone:
+                    return phone
+                # Número mascarado: ainda é preciso clicar no botão
+                selector, element = self._wait_for(driver, 'phone_button', 1.0, clickable=True)
+                if not selector:
+                    return None
+            else:
+                self.selectors.record('phone_button', selector)
+
+            element.click()
+
+            # Buscar número revelado
+            selector, element = self._wait_for(driver, 'phone', timeout)
+            return self._read_phone(element) if selector else None
             
         except Exception as e:
             print(f"[PHONE] Erro: {e}")
             return None
 
-    def _process_items(self, items: list, progress_callback=None) -> list:
-        """Processa lista de anúncios para extrair telefones."""
-        if not self.driver or not self._check_login():
-            credentials = CredentialsManager().get_credentials()
-            if not credentials:
-                raise Exception("Credenciais não encontradas")
-            self.email = credentials['email']
-            self.password = credentials['password']
-            if not self.login(progress_callback):
-                raise Exception("Falha no login")
+    def _get_account_pool(self) -> AccountPool:
+        """Monta (ou atualiza) o pool de contas a partir das credenciais salvas."""
+        if self.email and self.password:
+            accounts = [{'email': self.email, 'password': self.password}]
+        else:
+            accounts = get_credentials_provider().get_accounts()
+        if not accounts:
+            raise Exception("Credenciais não encontradas")
+        with self._lock:
+            if self.accounts is None:
+                self.accounts = AccountPool(accounts, max_reveals=self.reveals_per_hour,
+                                            cooldown=self.account_cooldown)
+                return self.accounts
+        for session in self.accounts.sync(accounts):
+            self._drop_account_browser(session)
+        return self.accounts
+
+    def _prewarm_browsers(self) -> None:
+        """Pré-aquece navegadores para as contas que ainda não têm um."""
+        proxy = self._proxy_endpoint()
+        if self.accounts is None:
+            missing = self.browsers.size
+        else:
+            missing = sum(1 for account in self.accounts.accounts
+                          if not account.browser or account.browser.proxy != proxy)
+        if missing:
+            self.browsers.prewarm(proxy, count=min(missing, self.browsers.size))
+
+    def _drop_account_browser(self, account, discard: bool = True) -> None:
+        """Devolve o navegador da conta ao pool; a conta precisará de novo login."""
+        self._release_browser(account.browser, discard=discard)
+        account.browser = None
+        account.logged_in = False
+
+    def _release_account(self, account, **outcome) -> None:
+        """Devolve a conta ao pool; se ela foi removida durante o uso, libera o navegador."""
+        if self.accounts.release(account, **outcome):
+            self._drop_account_browser(account)
+
+    def _check_account_browsers(self, pool: AccountPool) -> None:
+        """Descarta navegadores de contas que deixaram de responder desde a última execução."""
+        for account in pool.accounts:
+            if account.browser and not account.in_use and not self.browsers.is_healthy(account.browser):
+                print(f"[BROWSER_POOL] Navegador de {account.email} não responde, descartando")
+                self._drop_account_browser(account)
+
+    def _ensure_account_driver(self, account) -> None:
+        """Garante que a conta tem um navegador aberto e logado."""
+        proxy = self._proxy_endpoint()
+        if account.browser and account.browser.proxy != proxy:
+            # O proxy do Chrome é fixado no lançamento (só muda sem o proxy local)
+            self._drop_account_browser(account)
+        if account.browser and account.logged_in:
+            return
+        if account.browser is None:
+            account.browser = self.browsers.acquire(proxy)
+            account.logged_in = False
+        with self.metrics.stage('login'):
+            self._login_on(account.driver, account.email, account.password)
+        account.logged_in = True
+        self.metrics.incr('logins')
+        print(f"[ACCOUNTS] Login realizado com {account.email}")
+
+    def _reveal_item(self, driver, item: dict) -> str | None:
+        """Abre a página do anúncio no navegador informado e revela o telefone."""
+        self.metrics.incr('requests')
+        with self.metrics.stage('page_load'):
+            driver.get(item['link'])
+        self.metrics.incr('detail_pages')
+        try:
+            self.metrics.incr('browser_bytes', int(driver.execute_script(_PAGE_BYTES_SCRIPT) or 0))
+        except Exception:
+            pass
+        self._accept_cookies(driver)
+
+        if not item.get('seller_link'):
+            # O link do perfil identifica o vendedor mesmo sem o id do estado JSON
+            _, element = self._wait_for(driver, 'seller_link', 0.5)
+            href = element.get_attribute('href') if element else None
+            if href:
+                known = seller_key(item) is not None
+                item['seller_link'] = href
+                phone = None if known else self._cached_phone(item)
+                if phone:
+                    return phone
+
+        with self.metrics.stage('phone_reveal'):
+            return self._extract_phone(driver)
+
+    def _reveal_with_accounts(self, item: dict) -> str | None:
+        """Revela o telefone de um item usando a próxima conta disponível do pool."""
+        for _ in range(len(self.accounts) + 1):
+            account = self.accounts.acquire(timeout=self.account_wait_timeout)
+            if account is None:
+                print("[ACCOUNTS] Nenhuma conta disponível dentro do tempo limite")
+                return None
+            try:
+                self._ensure_account_driver(account)
+            except Exception as e:
+                print(f"[ACCOUNTS] Falha no login com {account.email}: {e}")
+                self._drop_account_browser(account)
+                self._release_account(account, failed=True)
+                continue
+            try:
+                with self.throttle.slot():
+                    account.respect_rate_limit(max(self.min_request_delay, self.throttle.delay_for(account.email)))
+                    phone = self._reveal_item(account.driver, item)
+                verdict = OK if phone else self._classify_page(account.driver)
+                self.throttle.record(account.email, verdict)
+                blocked = verdict in BLOCK_VERDICTS
+                if self.browsers.record_page(account.browser):
+                    self._cookie_sessions.discard(getattr(account.driver, 'session_id', None))
+                    self.browsers.recycle(account.browser)
+                    account.browser = None
+                    account.logged_in = False
+                self._release_account(account, revealed=bool(phone), blocked=blocked)
+                if blocked:
+                    continue
+                return phone
+            except Exception:
+                if account.browser and not self.browsers.is_healthy(account.browser):
+                    self._drop_account_browser(account)
+                self._release_account(account, failed=True)
+                raise
+        return None
 
+    def _process_items(self, items: list, progress_callback=None, url: str | None = None) -> list:
+        """Revela os telefones em ordem de prioridade, distribuindo entre as contas.
+
+        O RevealScheduler define a ordem e o orçamento da execução; quando o
+        orçamento acaba, os anúncios restantes entram no resultado com o
+        telefone pendente (`phone_pending`) e são adiados para a próxima
+        execução da mesma busca, que os grava de novo com o telefone. Anúncios de
+        vendedores com telefone no cache não abrem o navegador nem gastam
+        orçamento, e enquanto um vendedor está sendo revelado os outros
+        anúncios dele esperam o resultado.
+        """
+        pool = self._get_account_pool()
+        self._check_account_browsers(pool)
+        queue = deque(self.reveal_scheduler.plan(items, url))
         processed_items = []
-        total = len(items)
+        deferred = []
+        total = len(queue)
+        workers = max(1, min(len(pool), total))
+        print(f"[ACCOUNTS] Revelando telefones com {len(pool)} conta(s)")
+        self.reveal_scheduler.start()
 
-        for idx, item in enumerate(items, 1):
+        def finish(item, phone):
+            item.pop('_deferred', None)
+            item.pop('phone_pending', None)
+            item['phone'] = phone if phone else 'N/A'
+            processed_items.append(item)
             if progress_callback:
-                progress = int(40 + (60 * idx / total))
-                progress_callback(progress, f"Item {idx}/{total}")
+                progress_callback(int(40 + (60 * len(processed_items) / total)),
+                                  f"Item {len(processed_items)}/{total}")
 
-            try:
-                self._respect_rate_limit()
-                self.driver.get(item['link'])
-                wait = WebDriverWait(self.driver, 5)
-                
-                self._accept_cookies(wait)
-                time.sleep(0.3)
+        # Os workers só acessam o navegador; o progresso é reportado nesta thread
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            waiting = {}  # vendedor sendo revelado -> anúncios dele aguardando
+            revealed = 0
 
-                phone = self._extract_phone(wait)
-                item['phone'] = phone if phone else 'N/A'
-                processed_items.append(item)
+            def submit_next():
+                nonlocal revealed
+                # Só há `workers` revelações em andamento, então o orçamento é conferido antes de cada uma
+                while queue:
+                    item = queue.popleft()
+                    key = seller_key(item)
+                    if key in waiting:
+                        waiting[key].append(item)
+                        continue
+                    phone = self._cached_phone(item)
+                    if phone:
+                        finish(item, phone)
+                        continue
+                    if self.reveal_scheduler.allow():
+                        futures[executor.submit(self._reveal_with_accounts, item)] = item
+                        revealed += 1
+                        if key is not None:
+                            waiting[key] = []
+                        return
+                    deferred.append(item)
 
-            except Exception as e:
-                print(f"[ERROR] Item {idx}: {e}")
-                item['phone'] = 'N/A'
-                processed_items.append(item)
+            for _ in range(workers):
+                submit_next()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = futures.pop(future)
+                    try:
+                        phone = future.result()
+                    except Exception as e:
+                        print(f"[ERROR] Item {item.get('link')}: {e}")
+                        phone = None
+                    if self.seller_cache is not None:
+                        self.seller_cache.put(item, phone)
+                    finish(item, phone)
+                    # Os anúncios que esperavam por este vendedor voltam ao início da fila
+                    queue.extendleft(reversed(waiting.pop(seller_key(item), [])))
+                    submit_next()
 
+        self.reveal_scheduler.finish(revealed, deferred, url)
+        self.metrics.incr('reveals_deferred', len(deferred))
+        # Os adiados já são salvos nesta execução; no índice, a versão com telefone os substitui depois
+        for item in deferred:
+            item.pop('_deferred', None)
+            item['phone'] = None
+            item['phone_pending'] = True
+            processed_items.append(item)
+        if revealed and not any(account.logged_in for account in pool.accounts):
+            raise Exception("Falha no login")
         return processed_items
 
     def _get_element_text(self, wait: WebDriverWait, xpath: str) -> str:
         """Extrai texto de um elemento com tratamento de timeout."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
         try:
             element = wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
             return element.text.strip()
@@ -846,6 +1147,7 @@ class BeautifulSoupAdapter(ScrapingServicePort):
             
         return True
 
+    @profiled('transform')
     def transform_data(self, data: ScrapingData) -> list:
         """Transforma e limpa os dados extraídos."""
         print("[TRANSFORM] Iniciando transformação dos dados...")
@@ -875,13 +1177,17 @@ class BeautifulSoupAdapter(ScrapingServicePort):
         print("[TRANSFORM] Dados transformados com sucesso.")
         return transformed_items
 
-    def _cleanup_driver(self):
-        """Limpa recursos do driver de forma segura."""
-        if self.driver:
+    def _release_browser(self, browser, discard: bool = False) -> None:
+        """Devolve um navegador ao pool (cookies limpos) ou o fecha se `discard`."""
+        if browser:
+            self._cookie_sessions.discard(getattr(browser.driver, 'session_id', None))
             try:
-                self.driver.quit()
+                self.browsers.release(browser, discard=discard)
             except Exception as e:
-                print(f"[CLEANUP] Erro ao fechar driver: {str(e)}")
-            finally:
-                self.driver = None
+                print(f"[CLEANUP] Erro ao liberar navegador: {str(e)}")
+
+    def _cleanup_driver(self):
+        """Devolve ao pool os navegadores em uso pelas contas."""
+        if self.accounts:
+            self.accounts.close(self._release_browser)
 
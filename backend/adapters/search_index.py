@@ -0,0 +1,392 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ads (
+    id INTEGER PRIMARY KEY,
+    link TEXT NOT NULL UNIQUE,
+    run INTEGER,
+    search_url TEXT,
+    name TEXT,
+    seller_name TEXT,
+    description TEXT,
+    price TEXT,
+    price_value REAL,
+    date TEXT,
+    phone TEXT,
+    data TEXT NOT NULL,
+    hash TEXT,
+    seq INTEGER NOT NULL DEFAULT 0,
+    first_seq INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ads_price ON ads (price_value);
+CREATE INDEX IF NOT EXISTS ads_date ON ads (date);
+CREATE INDEX IF NOT EXISTS ads_name ON ads (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS ads_seller ON ads (seller_name COLLATE NOCASE);
+CREATE VIRTUAL TABLE IF NOT EXISTS ads_fts USING fts5 (
+    name, seller_name, description,
+    content='ads', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS ads_ai AFTER INSERT ON ads BEGIN
+    INSERT INTO ads_fts (rowid, name, seller_name, description)
+    VALUES (new.id, new.name, new.seller_name, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS ads_ad AFTER DELETE ON ads BEGIN
+    INSERT INTO ads_fts (ads_fts, rowid, name, seller_name, description)
+    VALUES ('delete', old.id, old.name, old.seller_name, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS ads_au AFTER UPDATE ON ads BEGIN
+    INSERT INTO ads_fts (ads_fts, rowid, name, seller_name, description)
+    VALUES ('delete', old.id, old.name, old.seller_name, old.description);
+    INSERT INTO ads_fts (rowid, name, seller_name, description)
+    VALUES (new.id, new.name, new.seller_name, new.description);
+END;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS exports (
+    target TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    updated TEXT NOT NULL
+);
+"""
+
+# Colunas acrescentadas depois da primeira versão do índice, criadas em bancos antigos
+_UPGRADES = {
+    'hash': 'ALTER TABLE ads ADD COLUMN hash TEXT',
+    'seq': 'ALTER TABLE ads ADD COLUMN seq INTEGER NOT NULL DEFAULT 0',
+    'first_seq': 'ALTER TABLE ads ADD COLUMN first_seq INTEGER NOT NULL DEFAULT 0',
+}
+
+# Colunas devolvidas pelas buscas, na ordem das linhas
+COLUMNS = ('id', 'name', 'price', 'price_value', 'seller_name', 'date', 'phone', 'link', 'run')
+# Ordenações aceitas e a expressão SQL correspondente
+SORTS = {
+    'name': 'ads.name COLLATE NOCASE',
+    'price': 'ads.price_value',
+    'seller': 'ads.seller_name COLLATE NOCASE',
+    'date': 'ads.date',
+    'phone': 'ads.phone',
+    'recent': 'ads.id',
+    'relevance': 'bm25(ads_fts)',
+}
+
+_NUMBER_RE = re.compile(r'\d[\d.,\s]*')
+_TOKEN_RE = re.compile(r'\w+\*?')
+
+
+def parse_price(item: dict) -> float | None:
+    """Preço numérico do item: o do estado JSON ou extraído do texto ("1.250 €")."""
+    value = item.get('price_value')
+    if isinstance(value, (int, float)):
+        return float(value)
+    price = item.get('price')
+    if isinstance(price, (int, float)):
+        return float(price)
+    match = _NUMBER_RE.search(price or '')
+    if not match:
+        return None
+    number = match.group(0).replace(' ', '').replace('.', '').replace(',', '.')
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+def fts_query(text: str) -> str:
+    """Converte o texto digitado numa consulta FTS5: todos os termos, `termo*` para prefixo."""
+    terms = []
+    for token in _TOKEN_RE.findall(text):
+        word = token.rstrip('*')
+        terms.append(f'"{word}"*' if token.endswith('*') else f'"{word}"')
+    return ' '.join(terms)
+
+
+class SearchIndex:
+    """Índice de busca dos anúncios salvos, em SQLite com FTS5.
+
+    Cada anúncio aparece uma vez (chave: link); coletas posteriores do mesmo
+    anúncio atualizam a linha. O índice de texto cobre título, vendedor e
+    descrição, e há índices para preço e data, então buscas e filtros não
+    precisam ler o `data.json`.
+
+    Attributes:
+        path (str): Arquivo do banco
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._create(db)
+            self._local.db = db
+        return db
+
+    @staticmethod
+    def _create(db: sqlite3.Connection) -> None:
+        db.executescript(_SCHEMA)
+        columns = {row[1] for row in db.execute('PRAGMA table_info(ads)')}
+        for column, statement in _UPGRADES.items():
+            if column not in columns:
+                db.execute(statement)
+        if 'seq' not in columns:
+            # Anúncios indexados antes das exportações incrementais entram como a primeira gravação,
+            # senão a primeira exportação (seq > 0) os deixaria de fora
+            db.execute('UPDATE ads SET seq = 1, first_seq = 1 WHERE seq = 0')
+        db.execute('CREATE INDEX IF NOT EXISTS ads_seq ON ads (seq)')
+        db.commit()
+
+    def add_run(self, run: int, url: str, items: list[dict], saved: str | None = None) -> int:
+        """Indexa os anúncios de uma coleta; retorna quantos eram novos ou mudaram.
+
+        A data do anúncio é a de criação (estado JSON) ou, na falta dela, a
+        de gravação da coleta (`saved`); sem nenhuma das duas fica vazia, e
+        nunca é a hora da indexação (que mudaria a cada --reindex).
+
+        Cada gravação recebe um número de sequência maior que o das
+        anteriores. Anúncios coletados de novo sem alteração (mesmo hash do
+        conteúdo) não são regravados e mantêm a sequência antiga, então as
+        exportações incrementais só os entregam uma vez.
+
+        Anúncios com o telefone pendente (revelação adiada) não apagam um
+        telefone já revelado em outra coleta: o telefone conhecido é mantido.
+        """
+        saved = saved[:19] if saved else None
+        known = self._known_phones([item['link'] for item in items if item.get('phone_pending') and item.get('link')])
+        rows = []
+        for item in items:
+            if not item.get('link'):
+                continue
+            if item['link'] in known:
+                item = dict(item, phone=known[item['link']])
+                item.pop('phone_pending')
+            created = item.get('created')
+            data = json.dumps(item, ensure_ascii=False)
+            digest = hashlib.sha1(data.encode('utf-8')).hexdigest()
+            rows.append((
+                item['link'], run, url, item.get('name'), item.get('seller_name'), item.get('description'),
+                str(item.get('price')) if item.get('price') is not None else None, parse_price(item),
+                created[:19] if isinstance(created, str) and created else saved, item.get('phone'),
+                data, digest,
+            ))
+        db = self._db()
+        with db:
+            seq = db.execute('SELECT COALESCE(MAX(seq), 0) + 1 FROM ads').fetchone()[0]
+            db.executemany(
+                "INSERT INTO ads (link, run, search_url, name, seller_name, description, price, price_value, "
+                "date, phone, data, hash, seq, first_seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (link) DO UPDATE SET run = excluded.run, search_url = excluded.search_url, "
+                "name = excluded.name, seller_name = excluded.seller_name, description = excluded.description, "
+                "price = excluded.price, price_value = excluded.price_value, date = excluded.date, "
+                "phone = excluded.phone, data = excluded.data, hash = excluded.hash, seq = excluded.seq "
+                "WHERE ads.hash IS NOT excluded.hash",
+                [row + (seq, seq) for row in rows])
+            return db.execute('SELECT COUNT(*) FROM ads WHERE seq = ?', (seq,)).fetchone()[0]
+
+    def _known_phones(self, links: list[str]) -> dict:
+        """Telefones já revelados dos anúncios informados."""
+        db = self._db()
+        phones = {}
+        for start in range(0, len(links), 500):
+            chunk = links[start:start + 500]
+            phones.update(db.execute(
+                f"SELECT link, phone FROM ads WHERE phone IS NOT NULL AND link IN ({', '.join('?' * len(chunk))})",
+                chunk))
+        return phones
+
+    def _where(self, query: str, min_price: float | None, max_price: float | None,
+               since: str | None, until: str | None) -> tuple[str, str, list]:
+        source = 'ads'
+        clauses = []
+        params = []
+        match = fts_query(query or '')
+        if match:
+            source = 'ads_fts JOIN ads ON ads.id = ads_fts.rowid'
+            clauses.append('ads_fts MATCH ?')
+            params.append(match)
+        if min_price is not None:
+            clauses.append('ads.price_value >= ?')
+            params.append(min_price)
+        if max_price is not None:
+            clauses.append('ads.price_value <= ?')
+            params.append(max_price)
+        if since:
+            clauses.append('ads.date >= ?')
+            params.append(since)
+        if until:
+            # Datas sem hora incluem o dia inteiro
+            clauses.append('ads.date <= ?')
+            params.append(until + 'T23:59:59' if len(until) == 10 else until)
+        return source, (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def search(self, query: str = '', min_price: float | None = None, max_price: float | None = None,
+               since: str | None = None, until: str | None = None, sort: str | None = None,
+               descending: bool = False, limit: int = 50, offset: int = 0,
+               after: tuple | None = None, before: tuple | None = None) -> list[dict]:
+        """Busca anúncios por termos e filtros.
+
+        Para paginar, passe o `cursor` da última linha de uma página em `after`
+        (próxima página) ou o da primeira em `before` (anterior): a consulta
+        começa direto na chave (ordenação, id) em vez de percorrer as linhas
+        puladas por um OFFSET.
+
+        Args:
+            query (str): Termos (todos obrigatórios); `term*` busca por prefixo
+            min_price, max_price (float): Faixa de preço
+            since, until (str): Faixa de datas ISO (YYYY-MM-DD ou com hora)
+            sort (str): Chave de SORTS; sem ela, os mais recentes primeiro. 'relevance' pontua
+                todos os resultados, então é mais lenta em termos muito comuns
+            descending (bool): Ordem decrescente
+            limit, offset (int): Janela de resultados (com cursor, o offset conta a partir dele)
+            after, before (tuple): Cursor de uma linha já lida
+
+        Returns:
+            list: Dicionários com as colunas de COLUMNS e o `cursor` da linha
+        """
+        source, where, params = self._where(query, min_price, max_price, since, until)
+        text_search = 'MATCH' in where
+        if sort == 'relevance' and text_search:
+            key = 'bm25(ads_fts)'
+        elif sort in SORTS and sort not in ('recent', 'relevance'):
+            key = SORTS[sort]
+        else:
+            key = None
+            if sort != 'recent':
+                descending = True
+        # Mais recentes: na busca por texto, o FTS percorre os rowids em ordem e o LIMIT para cedo
+        id_column = 'ads_fts.rowid' if text_search and key is None else 'ads.id'
+        # A página anterior é lida na ordem inversa a partir do cursor e desvirada no fim
+        ascending = not descending if before is None else descending
+        cursor = after if after is not None else before
+        segments = self._seek(key, id_column, cursor, ascending) if cursor is not None else [(None, [])]
+        direction = 'ASC' if ascending else 'DESC'
+        order = f"{key} {direction}, {id_column} {direction}" if key else f"{id_column} {direction}"
+        columns = ', '.join(f'ads.{column}' for column in COLUMNS) + (f', {key}' if key else '')
+        db = self._db()
+        results = []
+        for clause, values in segments:
+            segment = f"{where} AND {clause}" if where and clause else f" WHERE {clause}" if clause else where
+            rows = db.execute(f"SELECT {columns} FROM {source}{segment} ORDER BY {order} LIMIT ? OFFSET ?",
+                              params + values + [limit - len(results), offset]).fetchall()
+            for row in rows:
+                result = dict(zip(COLUMNS, row))
+                result['cursor'] = (row[len(COLUMNS)] if key else None, result['id'])
+                results.append(result)
+            if len(results) >= limit:
+                break
+            # O offset que sobrou (trecho inteiro pulado) continua no trecho seguinte
+            if offset and not rows:
+                offset -= db.execute(f"SELECT COUNT(*) FROM {source}{segment}", params + values).fetchone()[0]
+            else:
+                offset = 0
+        if before is not None:
+            results.reverse()
+        return results
+
+    @staticmethod
+    def _seek(key: str | None, id_column: str, cursor: tuple, ascending: bool) -> list[tuple[str, list]]:
+        """Condições, em ordem, das linhas que vêm depois do cursor (valor da ordenação, id).
+
+        O SQLite ordena NULL antes de qualquer valor na ordem crescente e
+        depois na decrescente. Os NULL ficam num trecho à parte: com um OR na
+        mesma condição, o SQLite deixaria de buscar o cursor pelo índice.
+        """
+        value, row_id = cursor
+        op = '>' if ascending else '<'
+        if key is None:
+            return [(f"{id_column} {op} ?", [row_id])]
+        if value is None:
+            if ascending:
+                return [(f"{key} IS NULL AND {id_column} > ?", [row_id]), (f"{key} IS NOT NULL", [])]
+            return [(f"{key} IS NULL AND {id_column} < ?", [row_id])]
+        # A comparação simples na frente deixa o SQLite buscar a chave no índice (com COLLATE ele não
+        # usa o índice só para a comparação de tuplas)
+        if ascending:
+            return [(f"{key} >= ? AND ({key}, {id_column}) > (?, ?)", [value, value, row_id])]
+        return [(f"{key} <= ? AND ({key}, {id_column}) < (?, ?)", [value, value, row_id]), (f"{key} IS NULL", [])]
+
+    def count(self, query: str = '', min_price: float | None = None, max_price: float | None = None,
+              since: str | None = None, until: str | None = None) -> int:
+        source, where, params = self._where(query, min_price, max_price, since, until)
+        return self._db().execute(f"SELECT COUNT(*) FROM {source}{where}", params).fetchone()[0]
+
+    def get(self, link: str) -> dict | None:
+        """Item completo, como foi salvo no repositório."""
+        row = self._db().execute('SELECT data FROM ads WHERE link = ?', (link,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_meta(self, key: str) -> str | None:
+        row = self._db().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        db = self._db()
+        with db:
+            db.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def last_seq(self) -> int:
+        """Sequência da gravação mais recente."""
+        return self._db().execute('SELECT COALESCE(MAX(seq), 0) FROM ads').fetchone()[0]
+
+    def changes(self, since: int, until: int | None = None, batch: int = 1000):
+        """Itera (item, 'new' ou 'changed') gravados depois da sequência `since`, em ordem de gravação.
+
+        As linhas são lidas em lotes pela chave (seq, id), então a memória não
+        depende do tamanho do histórico.
+        """
+        until = self.last_seq() if until is None else until
+        after = (since, 0)
+        while True:
+            rows = self._db().execute(
+                "SELECT seq, id, first_seq, data FROM ads WHERE seq > ? AND seq <= ? AND (seq, id) > (?, ?) "
+                "ORDER BY seq, id LIMIT ?", (since, until, after[0], after[1], batch)).fetchall()
+            for seq, _, first_seq, data in rows:
+                yield json.loads(data), 'new' if first_seq > since else 'changed'
+            if len(rows) < batch:
+                return
+            after = rows[-1][:2]
+
+    def get_watermark(self, target: str) -> dict | None:
+        """Última exportação do destino: sequência entregue, linhas e data."""
+        row = self._db().execute('SELECT seq, rows, updated FROM exports WHERE target = ?', (target,)).fetchone()
+        return dict(zip(('seq', 'rows', 'updated'), row)) if row else None
+
+    def set_watermark(self, target: str, seq: int, rows: int) -> None:
+        db = self._db()
+        with db:
+            db.execute('INSERT OR REPLACE INTO exports (target, seq, rows, updated) VALUES (?, ?, ?, ?)',
+                       (target, seq, rows, time.strftime('%Y-%m-%dT%H:%M:%S')))
+
+    def watermarks(self) -> dict:
+        rows = self._db().execute('SELECT target, seq, rows, updated FROM exports ORDER BY target')
+        return {target: {'seq': seq, 'rows': count, 'updated': updated} for target, seq, count, updated in rows}
+
+    def clear(self) -> None:
+        """Apaga o índice inteiro (recriar as tabelas é mais rápido que apagar linha a linha).
+
+        As marcas de exportação também são apagadas, já que as sequências
+        recomeçam: a próxima exportação de cada destino volta a ser completa.
+        """
+        db = self._db()
+        db.executescript('DROP TABLE IF EXISTS ads_fts; DROP TABLE IF EXISTS ads; DROP TABLE IF EXISTS meta; '
+                         'DROP TABLE IF EXISTS exports;')
+        self._create(db)
+
+    def close(self) -> None:
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+DEFAULT_SELECTORS_FILE = Path(__file__).resolve().parent.parent / 'config' / 'selectors.json'
+
+
+class _GroupStats:
+    def __init__(self, window: int):
+        self.rates = {}
+        self.hits = {}
+        self.lookups = 0
+        self.recent = deque(maxlen=window)
+        self.alerted = False
+
+
+class SelectorRegistry:
+    """Seletores candidatos carregados de um arquivo versionado, ordenados por taxa de acerto.
+
+    Cada grupo (container, link, price, phone, ...) tem uma lista de
+    seletores. Cada busca registra qual seletor funcionou, e os candidatos
+    passam a ser entregues na ordem da taxa de acerto recente (média móvel
+    exponencial). Assim o seletor que funciona é avaliado primeiro. Quando a
+    taxa de sucesso de um grupo despenca (mudança de layout), um alerta é
+    emitido uma vez. O arquivo é relido automaticamente quando muda, sem
+    reiniciar o programa.
+
+    O arquivo pode definir `alert_min_samples` por grupo, para grupos em que
+    poucas falhas já indicam quebra (ex.: o container dos anúncios).
+
+    Attributes:
+        path (Path): Arquivo JSON com `version`, `groups` e `alert_min_samples` opcional
+        version (str): Versão do conjunto de seletores carregado
+        check_interval (float): Intervalo mínimo entre verificações de mudança no arquivo
+        window (int): Buscas recentes consideradas no alerta de colapso
+        min_samples (int): Buscas mínimas no grupo antes de alertar
+        collapse_threshold (float): Taxa de sucesso abaixo da qual o grupo é considerado quebrado
+        on_alert (callable): Chamado com (grupo, taxa) quando um grupo colapsa
+    """
+
+    def __init__(self, path: str | Path | None = None, check_interval: float = 2.0, window: int = 50,
+                 min_samples: int = 20, collapse_threshold: float = 0.2, decay: float = 0.1, on_alert=None):
+        self.path = Path(path or os.getenv('OLX_SELECTORS_FILE') or DEFAULT_SELECTORS_FILE)
+        self.check_interval = check_interval
+        self.window = window
+        self.min_samples = min_samples
+        self.collapse_threshold = collapse_threshold
+        self.decay = decay
+        self.on_alert = on_alert
+        self.version = None
+        self._groups = {}
+        self._alert_min_samples = {}
+        self._order = {}
+        self._stats = {}
+        self._signature = None
+        self._last_check = 0.0
+        self._lock = threading.RLock()
+        self._refresh(force=True)
+
+    def _file_signature(self):
+        try:
+            stat = self.path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self, force: bool = False) -> None:
+        """Relê o arquivo se ele mudou; mantém a versão anterior se o novo conteúdo for inválido."""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        signature = self._file_signature()
+        if not force and signature == self._signature:
+            return
+        self._signature = signature
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            groups = {name: list(selectors) for name, selectors in config['groups'].items()}
+        except Exception as e:
+            if not self._groups:
+                raise
+            print(f"[SELECTORS] Arquivo {self.path} inválido, mantendo versão {self.version}: {e}")
+            return
+        with self._lock:
+            reloaded = self.version is not None
+            self.version = str(config.get('version', 'sem versão'))
+            self._groups = groups
+            self._alert_min_samples = dict(config.get('alert_min_samples', {}))
+            for name, selectors in groups.items():
+                stats = self._stats.setdefault(name, _GroupStats(self.window))
+                if list(stats.rates) != selectors:
+                    # Lista alterada: o histórico recente não vale para os novos seletores
+                    stats.recent.clear()
+                    stats.alerted = False
+                # Seletores novos começam neutros; os removidos deixam de ser ordenados
+                stats.rates = {s: stats.rates.get(s, 0.5) for s in selectors}
+                stats.hits = {s: stats.hits.get(s, 0) for s in selectors}
+                self._reorder(name)
+        print(f"[SELECTORS] {'Recarregados' if reloaded else 'Carregados'} seletores versão {self.version}")
+
+    def _reorder(self, group: str) -> None:
+        selectors = self._groups[group]
+        rates = self._stats[group].rates
+        position = {s: i for i, s in enumerate(selectors)}
+        self._order[group] = sorted(selectors, key=lambda s: (-rates[s], position[s]))
+
+    def candidates(self, group: str) -> list[str]:
+        """Seletores do grupo, do mais para o menos bem-sucedido recentemente."""
+        with self._lock:
+            self._refresh()
+            return self._order.get(group, [])
+
+    def order(self) -> dict:
+        """Ordem atual dos candidatos de todos os grupos (para os processos de parsing)."""
+        with self._lock:
+            self._refresh()
+            return {group: list(selectors) for group, selectors in self._order.items()}
+
+    def record(self, group: str, selector: str | None) -> None:
+        """Registra o resultado de uma busca no grupo (`selector` None se nenhum funcionou)."""
+        with self._lock:
+            stats = self._stats.get(group)
+            if stats is None:
+                return
+            stats.lookups += 1
+            stats.recent.append(selector is not None)
+            if selector in stats.hits:
+                stats.hits[selector] += 1
+            for candidate, rate in stats.rates.items():
+                stats.rates[candidate] = rate + self.decay * ((candidate == selector) - rate)
+            self._reorder(group)
+            alert = self._check_collapse(group, stats)
+        if alert is not None and self.on_alert:
+            self.on_alert(group, alert)
+
+    def _check_collapse(self, group: str, stats: _GroupStats) -> float | None:
+        if len(stats.recent) < self._alert_min_samples.get(group, self.min_samples):
+            return None
+        rate = sum(stats.recent) / len(stats.recent)
+        if rate < self.collapse_threshold and not stats.alerted:
+            stats.alerted = True
+            print(f"[SELECTORS] ALERTA: taxa de acerto do grupo '{group}' caiu para {rate:.0%} "
+                  f"(versão {self.version}). O layout da OLX pode ter mudado; atualize {self.path.name}")
+            return rate
+        if rate >= self.collapse_threshold * 2:
+            stats.alerted = False
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                group: {
+                    'lookups': stats.lookups,
+                    'success_rate': round(sum(stats.recent) / len(stats.recent), 3) if stats.recent else None,
+                    'hits': {s: stats.hits[s] for s in self._order.get(group, [])},
+                }
+                for group, stats in self._stats.items() if group in self._groups
+            }
@@ -0,0 +1,97 @@
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sellers (
+    key TEXT PRIMARY KEY,
+    phone TEXT NOT NULL,
+    seller_name TEXT,
+    updated REAL NOT NULL
+);
+"""
+
+
+def _seller_keys(item: dict) -> list[str]:
+    keys = []
+    if item.get('seller_id') not in (None, ''):
+        keys.append(f"id:{item['seller_id']}")
+    if item.get('seller_link'):
+        keys.append(f"link:{urlsplit(item['seller_link']).path.rstrip('/')}")
+    return keys
+
+
+def seller_key(item: dict) -> str | None:
+    """Identificação do vendedor do anúncio: id do estado JSON ou, na falta dele, o link do perfil.
+
+    Usada no cache de telefones e na prioridade de revelação. O nome não é
+    usado: vendedores diferentes podem ter o mesmo nome, e um telefone
+    errado é pior que uma revelação a mais.
+    """
+    keys = _seller_keys(item)
+    return keys[0] if keys else None
+
+
+class SellerPhoneCache:
+    """Telefones já revelados, por vendedor, persistidos em SQLite.
+
+    Antes de abrir o navegador para um anúncio, o telefone do vendedor é
+    procurado aqui; só telefones encontrados são gravados, e expiram após
+    `ttl` segundos (o vendedor pode trocar de número). O telefone é gravado
+    sob o id e sob o link do perfil, então um anúncio que só traz um deles
+    (ex.: raspado do DOM) encontra o que foi revelado a partir do outro.
+
+    Attributes:
+        path (str): Arquivo do banco
+        ttl (float): Validade de um telefone gravado (s)
+    """
+
+    def __init__(self, path: str, ttl: float = 30 * 86400):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(_SCHEMA)
+            self._local.db = db
+        return db
+
+    def get(self, item: dict) -> str | None:
+        """Telefone ainda válido do vendedor do anúncio, ou None."""
+        keys = _seller_keys(item)
+        if not keys:
+            return None
+        row = self._db().execute(
+            f"SELECT phone FROM sellers WHERE key IN ({', '.join('?' * len(keys))}) AND updated >= ? "
+            "ORDER BY updated DESC LIMIT 1", (*keys, time.time() - self.ttl)).fetchone()
+        return row[0] if row else None
+
+    def put(self, item: dict, phone: str | None) -> None:
+        keys = _seller_keys(item)
+        if not keys or not phone or phone == 'N/A':
+            return
+        now = time.time()
+        db = self._db()
+        with db:
+            db.executemany('INSERT OR REPLACE INTO sellers (key, phone, seller_name, updated) VALUES (?, ?, ?, ?)',
+                           [(key, phone, item.get('seller_name'), now) for key in keys])
+
+    def purge(self) -> int:
+        """Remove os telefones expirados; retorna quantos foram removidos."""
+        db = self._db()
+        with db:
+            return db.execute('DELETE FROM sellers WHERE updated < ?', (time.time() - self.ttl,)).rowcount
+
+    def __len__(self) -> int:
+        return self._db().execute('SELECT COUNT(*) FROM sellers').fetchone()[0]
+
+    def close(self) -> None:
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
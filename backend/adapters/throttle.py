@@ -0,0 +1,121 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from .block_detection import BLOCK_VERDICTS, ERROR, OK
+
+_GLOBAL = '__global__'
+
+
+class _ThrottleState:
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.delay = 0.0
+        self.active = 0
+        self.ok_streak = 0
+        self.last_request = 0.0
+        self.verdicts = {}
+
+
+class AdaptiveThrottle:
+    """Controle AIMD de concorrência e intervalo, por chave (proxy ou conta) e global.
+
+    Respostas ok aumentam a concorrência em 1 a cada `increase_every`
+    sucessos seguidos e reduzem o intervalo em `delay_step`. Bloqueios e
+    captchas multiplicam a concorrência por `decrease_factor` e dobram o
+    intervalo (mínimo `backoff_base`). Assim o scraper converge para a maior
+    vazão que o site tolera sem banir.
+
+    Attributes:
+        max_concurrency (int): Limite superior de operações simultâneas
+        min_concurrency (int): Limite inferior após reduções
+        increase_every (int): Sucessos seguidos para aumentar a concorrência
+        decrease_factor (float): Fator aplicado à concorrência em bloqueios
+        delay_step (float): Redução do intervalo a cada sucesso (s)
+        backoff_base (float): Intervalo mínimo aplicado após o primeiro bloqueio (s)
+        max_delay (float): Intervalo máximo entre requisições (s)
+    """
+
+    def __init__(self, max_concurrency: int = 4, min_concurrency: int = 1, increase_every: int = 10,
+                 decrease_factor: float = 0.5, delay_step: float = 0.25, backoff_base: float = 2.0,
+                 max_delay: float = 60.0):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.increase_every = increase_every
+        self.decrease_factor = decrease_factor
+        self.delay_step = delay_step
+        self.backoff_base = backoff_base
+        self.max_delay = max_delay
+        self._states = {}
+        self._cond = threading.Condition()
+
+    def _state(self, key: str | None) -> _ThrottleState:
+        key = key or _GLOBAL
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _ThrottleState(float(self.max_concurrency))
+        return state
+
+    def _apply(self, state: _ThrottleState, verdict: str) -> None:
+        state.verdicts[verdict] = state.verdicts.get(verdict, 0) + 1
+        if verdict == OK:
+            state.delay = max(state.delay - self.delay_step, 0.0)
+            state.ok_streak += 1
+            if state.ok_streak >= self.increase_every:
+                state.limit = min(state.limit + 1, float(self.max_concurrency))
+                state.ok_streak = 0
+        elif verdict in BLOCK_VERDICTS:
+            state.limit = max(state.limit * self.decrease_factor, float(self.min_concurrency))
+            state.delay = min(max(state.delay * 2, self.backoff_base), self.max_delay)
+            state.ok_streak = 0
+        elif verdict == ERROR:
+            state.delay = min(state.delay + self.delay_step, self.max_delay)
+            state.ok_streak = 0
+
+    def record(self, key: str | None, verdict: str) -> None:
+        """Registra o resultado de uma requisição na chave e no estado global."""
+        with self._cond:
+            self._apply(self._state(None), verdict)
+            if key:
+                self._apply(self._state(key), verdict)
+            self._cond.notify_all()
+
+    def delay_for(self, key: str | None = None) -> float:
+        with self._cond:
+            delay = self._state(None).delay
+            return max(delay, self._state(key).delay) if key else delay
+
+    def wait(self, key: str | None = None, floor: float = 0.0) -> None:
+        """Espaça as requisições da chave pelo intervalo adaptativo (nunca abaixo de `floor`)."""
+        with self._cond:
+            state = self._state(key)
+            delay = max(floor, self._state(None).delay, state.delay)
+            ready_at = state.last_request + delay
+            state.last_request = max(time.monotonic(), ready_at)
+        wait = ready_at - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self, key: str | None = None):
+        """Ocupa uma vaga de concorrência global (e da chave), aguardando se necessário."""
+        with self._cond:
+            states = [self._state(None)] + ([self._state(key)] if key else [])
+            while any(state.active >= int(state.limit) for state in states):
+                self._cond.wait(1.0)
+            for state in states:
+                state.active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                for state in states:
+                    state.active -= 1
+                self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                key: {'limit': int(state.limit), 'delay': round(state.delay, 2), 'verdicts': dict(state.verdicts)}
+                for key, state in self._states.items()
+            }
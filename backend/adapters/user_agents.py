@@ -0,0 +1,213 @@
+import random
+import re
+import threading
+
+# Versão do conjunto de fingerprints. Atualizar junto com a tabela abaixo
+# quando novas versões de navegador ganharem participação de mercado.
+POOL_VERSION = '2025.06'
+
+_LANG_PT = 'pt-PT,pt;q=0.9,en-US;q=0.8,en;q=0.7'
+_LANG_PT_SHORT = 'pt-PT,pt;q=0.9'
+_LANG_EN_PT = 'en-US,en;q=0.9,pt-PT;q=0.8,pt;q=0.7'
+
+_CHROME_BRANDS = '"Google Chrome";v="{v}", "Chromium";v="{v}", "Not/A)Brand";v="24"'
+_EDGE_BRANDS = '"Microsoft Edge";v="{v}", "Chromium";v="{v}", "Not/A)Brand";v="24"'
+
+_BRAND = re.compile(r'"([^"]+)";v="([^"]+)"')
+_CHROME_VERSION = re.compile(r'Chrome/(\d+)[\d.]*')
+
+# navigator.platform e versão da plataforma (Client Hints) por sistema
+_PLATFORMS = {'Windows': ('Win32', '10.0.0'), 'macOS': ('MacIntel', '10.15.7'), 'Linux': ('Linux x86_64', '')}
+
+# (peso, user-agent, sec-ch-ua, plataforma, accept-language)
+# Pesos aproximados pela participação de navegadores desktop em Portugal.
+# Navegadores sem Client Hints (Firefox, Safari) não enviam sec-ch-ua.
+_FINGERPRINTS = [
+    (24.0, 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+           'Chrome/137.0.0.0 Safari/537.36', _CHROME_BRANDS.format(v=137), 'Windows', _LANG_PT),
+    (12.0, 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+           'Chrome/136.0.0.0 Safari/537.36', _CHROME_BRANDS.format(v=136), 'Windows', _LANG_PT),
+    (4.0, 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+          'Chrome/137.0.0.0 Safari/537.36', _CHROME_BRANDS.format(v=137), 'Windows', _LANG_EN_PT),
+    (7.0, 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
+          'Chrome/137.0.0.0 Safari/537.36', _CHROME_BRANDS.format(v=137), 'macOS', _LANG_PT),
+    (2.0, 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) '
+          'Chrome/137.0.0.0 Safari/537.36', _CHROME_BRANDS.format(v=137), 'Linux', _LANG_PT_SHORT),
+    (10.0, 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+           'Chrome/137.0.0.0 Safari/537.36 Edg/137.0.0.0', _EDGE_BRANDS.format(v=137), 'Windows', _LANG_PT),
+    (3.0, 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+          'Chrome/136.0.0.0 Safari/537.36 Edg/136.0.0.0', _EDGE_BRANDS.format(v=136), 'Windows', _LANG_PT),
+    (6.0, 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+          'Version/18.5 Safari/605.1.15', None, 'macOS', _LANG_PT_SHORT),
+    (5.0, 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:139.0) Gecko/20100101 Firefox/139.0',
+     None, 'Windows', 'pt-PT,pt;q=0.8,en;q=0.5,en-US;q=0.3'),
+    (1.0, 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:139.0) Gecko/20100101 Firefox/139.0',
+     None, 'macOS', 'pt-PT,pt;q=0.8,en;q=0.5,en-US;q=0.3'),
+    (1.0, 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:139.0) Gecko/20100101 Firefox/139.0',
+     None, 'Linux', 'pt-PT,pt;q=0.8,en;q=0.5,en-US;q=0.3'),
+]
+
+
+class BrowserFingerprint:
+    """Conjunto coerente de cabeçalhos de um navegador real.
+
+    Attributes:
+        user_agent (str): Cabeçalho User-Agent
+        sec_ch_ua (str): Client Hints de marca (None para navegadores sem suporte)
+        platform (str): Plataforma anunciada em sec-ch-ua-platform
+        accept_language (str): Cabeçalho Accept-Language
+        brands (list): Pares (marca, versão) de sec-ch-ua
+        major (int): Versão principal do Chromium (None fora da família Chromium)
+    """
+
+    def __init__(self, user_agent: str, sec_ch_ua: str | None, platform: str, accept_language: str):
+        self.user_agent = user_agent
+        self.sec_ch_ua = sec_ch_ua
+        self.platform = platform
+        self.accept_language = accept_language
+        self.brands = _BRAND.findall(sec_ch_ua or '')
+        match = _CHROME_VERSION.search(user_agent)
+        self.major = int(match.group(1)) if match and self.brands else None
+        self._headers = self._build_headers()
+
+    @property
+    def language(self) -> str:
+        """Idioma principal, usado no locale do navegador."""
+        return self.accept_language.split(',')[0]
+
+    @property
+    def is_chrome(self) -> bool:
+        return any(brand == 'Google Chrome' for brand, _ in self.brands)
+
+    def with_major(self, major: int) -> 'BrowserFingerprint':
+        """Cópia do fingerprint anunciando outra versão principal do Chromium."""
+        user_agent = _CHROME_VERSION.sub(f'Chrome/{major}.0.0.0', self.user_agent)
+        sec_ch_ua = ', '.join(f'"{brand}";v="{major if version == str(self.major) else version}"'
+                              for brand, version in self.brands)
+        return BrowserFingerprint(user_agent, sec_ch_ua, self.platform, self.accept_language)
+
+    def ua_override(self, full_version: str) -> dict:
+        """Parâmetros de `Network.setUserAgentOverride` (CDP) com os Client Hints em `userAgentMetadata`.
+
+        Args:
+            full_version (str): Versão completa do navegador (ex.: '137.0.7151.68')
+        """
+        navigator_platform, platform_version = _PLATFORMS[self.platform]
+        full_versions = [(brand, full_version if version == str(self.major) else f'{version}.0.0.0')
+                         for brand, version in self.brands]
+        return {
+            'userAgent': self.user_agent,
+            # O Chrome gera os pesos (q=) do Accept-Language a partir da lista de idiomas
+            'acceptLanguage': ','.join(part.split(';')[0] for part in self.accept_language.split(',')),
+            'platform': navigator_platform,
+            'userAgentMetadata': {
+                'brands': [{'brand': brand, 'version': version} for brand, version in self.brands],
+                'fullVersionList': [{'brand': brand, 'version': version} for brand, version in full_versions],
+                'fullVersion': full_version,
+                'platform': self.platform,
+                'platformVersion': platform_version,
+                'architecture': 'x86',
+                'model': '',
+                'mobile': False,
+                'bitness': '64',
+                'wow64': False,
+            },
+        }
+
+    def _build_headers(self) -> dict:
+        headers = {
+            'User-Agent': self.user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+            'Accept-Language': self.accept_language,
+            'Upgrade-Insecure-Requests': '1',
+        }
+        if self.sec_ch_ua:
+            headers['sec-ch-ua'] = self.sec_ch_ua
+            headers['sec-ch-ua-mobile'] = '?0'
+            headers['sec-ch-ua-platform'] = f'"{self.platform}"'
+        return headers
+
+    def headers(self) -> dict:
+        """Retorna uma cópia dos cabeçalhos HTTP do fingerprint."""
+        return dict(self._headers)
+
+    def __repr__(self):
+        return f"BrowserFingerprint({self.user_agent!r})"
+
+
+class UserAgentPool:
+    """Pool offline de fingerprints com seleção ponderada O(1) e afinidade por chave.
+
+    A seleção usa o método de alias (Vose), então sortear um fingerprint não
+    depende do tamanho do pool. Cada chave (proxy ou sessão) recebe sempre o
+    mesmo fingerprint até ser liberada, mantendo os cabeçalhos coerentes entre
+    retries da mesma sessão.
+
+    Attributes:
+        version (str): Versão da tabela de fingerprints
+        fingerprints (list): Fingerprints disponíveis
+    """
+
+    def __init__(self, fingerprints: list | None = None, seed: int | None = None):
+        entries = fingerprints or _FINGERPRINTS
+        self.version = POOL_VERSION
+        self.fingerprints = [BrowserFingerprint(ua, ch, platform, lang) for _, ua, ch, platform, lang in entries]
+        self._random = random.Random(seed)
+        self._weights = [weight for weight, *_ in entries]
+        self._prob, self._alias = self._build_alias_table(self._weights)
+        self._sticky = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_alias_table(weights: list[float]) -> tuple[list[float], list[int]]:
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        prob = [0.0] * n
+        alias = [0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            prob[i] = 1.0
+        return prob, alias
+
+    def random(self) -> BrowserFingerprint:
+        """Sorteia um fingerprint ponderado pela participação de mercado."""
+        i = self._random.randrange(len(self._prob))
+        if self._random.random() >= self._prob[i]:
+            i = self._alias[i]
+        return self.fingerprints[i]
+
+    def for_key(self, key: str | None) -> BrowserFingerprint:
+        """Retorna o fingerprint fixo associado à chave (proxy ou sessão)."""
+        key = key or 'direct'
+        fingerprint = self._sticky.get(key)
+        if fingerprint is None:
+            with self._lock:
+                fingerprint = self._sticky.setdefault(key, self.random())
+        return fingerprint
+
+    def for_browser(self, major: int) -> BrowserFingerprint:
+        """Sorteia um fingerprint do Chrome na versão principal do navegador instalado.
+
+        O navegador do Selenium só pode se passar por ele mesmo: um User-Agent
+        de Firefox, Safari ou de outra versão do Chrome contradiz os recursos
+        visíveis ao JavaScript. Se a tabela não tem a versão instalada, os
+        fingerprints do Chrome são ajustados para ela.
+        """
+        chrome = [(weight, fp) for weight, fp in zip(self._weights, self.fingerprints) if fp.is_chrome]
+        choices = [(weight, fp) for weight, fp in chrome if fp.major == major] \
+            or [(weight, fp.with_major(major)) for weight, fp in chrome]
+        with self._lock:
+            return self._random.choices([fp for _, fp in choices], [weight for weight, _ in choices])[0]
+
+    def release(self, key: str | None) -> None:
+        """Remove a afinidade da chave; o próximo uso sorteia um novo fingerprint."""
+        with self._lock:
+            self._sticky.pop(key or 'direct', None)
@@ -0,0 +1,135 @@
+import time
+
+# Probe executado no navegador: retorna [índice do seletor, elemento] do primeiro
+# elemento visível (e habilitado, se pedido), observando mutações do DOM em vez
+# de consultar repetidamente via WebDriver; null no timeout.
+_OBSERVER_SCRIPT = """
+const selectors = arguments[0];
+const timeoutMs = arguments[1];
+const clickable = arguments[2];
+const done = arguments[arguments.length - 1];
+function usable(el) {
+    return (el.offsetParent !== null || el.getClientRects().length > 0) && (!clickable || !el.disabled);
+}
+function matches(s) {
+    if (s.startsWith('/') || s.startsWith('(')) {
+        const result = document.evaluate(s, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+        return nodes;
+    }
+    return document.querySelectorAll(s);
+}
+function find() {
+    for (let i = 0; i < selectors.length; i++) {
+        let nodes = [];
+        try { nodes = matches(selectors[i]); } catch (e) {}
+        for (const el of nodes) {
+            if (usable(el)) return [i, el];
+        }
+    }
+    return null;
+}
+const first = find();
+if (first) { done(first); return; }
+const observer = new MutationObserver(function () {
+    const found = find();
+    if (found) { observer.disconnect(); clearTimeout(timer); done(found); }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+const timer = setTimeout(function () { observer.disconnect(); done(null); }, timeoutMs);
+"""
+
+
+def _locator(selector: str) -> tuple[str, str]:
+    """Converte o seletor em (By, valor): XPath se começar com '/' ou '(', CSS caso contrário."""
+    from selenium.webdriver.common.by import By
+    if selector.startswith(('/', '(')):
+        return By.XPATH, selector
+    return By.CSS_SELECTOR, selector
+
+
+class SelectorWaiter:
+    """Espera combinada por vários seletores candidatos.
+
+    Em vez de um WebDriverWait por seletor (em série), consulta todos os
+    candidatos em um único loop e retorna assim que qualquer um aparece.
+    Os candidatos são tentados na ordem recebida: quem ordena é o
+    SelectorRegistry, pela taxa de acerto.
+
+    Attributes:
+        mode (str): 'poll' (find_elements em loop) ou 'observer' (MutationObserver via JS)
+        poll_interval (float): Intervalo entre consultas no modo 'poll'
+        metrics (ScrapingMetrics): Métricas onde o tempo de espera é registrado
+    """
+
+    def __init__(self, metrics=None, mode: str = 'poll', poll_interval: float = 0.1):
+        self.metrics = metrics
+        self.mode = mode
+        self.poll_interval = poll_interval
+
+    def _record(self, label: str, start: float, found: bool) -> None:
+        if self.metrics:
+            self.metrics.record_wait(label, time.perf_counter() - start, found=found)
+
+    def wait_any(self, driver, group: str, selectors: list[str], timeout: float,
+                 clickable: bool = False) -> tuple[str | None, object]:
+        """Aguarda o primeiro seletor visível (e habilitado, se `clickable`).
+
+        Args:
+            group (str): Nome do grupo, usado nas métricas de espera
+            selectors (list): Candidatos, na ordem em que devem ser tentados
+
+        Returns:
+            tuple: (seletor encontrado, elemento) ou (None, None) no timeout
+        """
+        start = time.perf_counter()
+        if self.mode == 'observer':
+            selector, element = self._wait_observer(driver, selectors, timeout, clickable)
+        else:
+            selector, element = self._wait_poll(driver, selectors, timeout, clickable)
+        if selector:
+            self._record(f"{group}:{selector}", start, True)
+        else:
+            self._record(f"{group}:timeout", start, False)
+        return selector, element
+
+    def wait_gone(self, driver, selector: str, timeout: float) -> bool:
+        """Aguarda até o seletor deixar de estar visível."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self._first_match(driver, [selector], False)[0]:
+                return True
+            time.sleep(self.poll_interval)
+        return False
+
+    def _first_match(self, driver, candidates: list[str], clickable: bool):
+        for selector in candidates:
+            try:
+                for element in driver.find_elements(*_locator(selector)):
+                    if element.is_displayed() and (not clickable or element.is_enabled()):
+                        return selector, element
+            except Exception:
+                continue
+        return None, None
+
+    def _wait_poll(self, driver, candidates: list[str], timeout: float, clickable: bool):
+        deadline = time.monotonic() + timeout
+        while True:
+            selector, element = self._first_match(driver, candidates, clickable)
+            if selector or time.monotonic() >= deadline:
+                return selector, element
+            time.sleep(self.poll_interval)
+
+    def _wait_observer(self, driver, candidates: list[str], timeout: float, clickable: bool):
+        try:
+            driver.set_script_timeout(timeout + 2)
+            found = driver.execute_async_script(_OBSERVER_SCRIPT, candidates, int(timeout * 1000), clickable)
+        except Exception as e:
+            print(f"[WAIT] Observer indisponível, usando polling: {e}")
+            return self._wait_poll(driver, candidates, timeout, clickable)
+        if not found:
+            return None, None
+        # O próprio script devolve o elemento (como WebElement), sem nova consulta pelo WebDriver
+        index, element = found
+        return candidates[index], element
@@ -0,0 +1,238 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+LISTING = 'listing'
+DETAIL = 'detail'
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    crawl TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    updated REAL NOT NULL,
+    UNIQUE (crawl, kind, key)
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (state, available_at);
+CREATE TABLE IF NOT EXISTS results (
+    crawl TEXT NOT NULL,
+    key TEXT NOT NULL,
+    item TEXT NOT NULL,
+    worker TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (crawl, key)
+);
+"""
+
+
+class Task:
+    """Unidade de trabalho arrendada da fila."""
+
+    def __init__(self, id: int, crawl: str, kind: str, key: str, payload: dict, attempts: int):
+        self.id = id
+        self.crawl = crawl
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"Task({self.kind} {self.key}, tentativa {self.attempts})"
+
+
+class SqliteWorkQueue:
+    """Fila de trabalho durável em SQLite, compartilhada por coordenador e workers.
+
+    Cada tarefa (página de listagem ou anúncio) é única por (crawl, tipo,
+    chave): enfileirar de novo a mesma página ou o mesmo link é ignorado.
+    Um worker arrenda a tarefa por `visibility_timeout` segundos; se morrer
+    sem concluir, o arrendamento expira e a tarefa volta para a fila. Falhas
+    são reagendadas com espera exponencial até `max_attempts` tentativas.
+    Os resultados são gravados por chave, então reprocessar um anúncio
+    substitui o resultado anterior em vez de duplicá-lo.
+
+    Várias máquinas podem usar o mesmo arquivo desde que ele esteja num
+    sistema de arquivos com locks confiáveis; cada processo abre as próprias
+    conexões (uma por thread).
+
+    Attributes:
+        path (str): Arquivo do banco
+        visibility_timeout (float): Duração do arrendamento de uma tarefa (s)
+        max_attempts (int): Tentativas antes de a tarefa ser marcada como falha
+        retry_base (float): Espera antes da primeira nova tentativa (s), dobrada a cada falha
+    """
+
+    def __init__(self, path: str, visibility_timeout: float = 300.0, max_attempts: int = 5,
+                 retry_base: float = 5.0):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._db().executescript(_SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            # Cada thread usa só a sua conexão; close() as fecha a partir de outra thread
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+            with self._connections_lock:
+                self._connections.append(db)
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        db = self._db()
+        # IMMEDIATE: o lock de escrita é obtido já no início, evitando que dois workers arrendem a mesma tarefa
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            yield db
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+
+    def create_crawl(self, url: str) -> str:
+        crawl = uuid.uuid4().hex[:12]
+        with self._transaction() as db:
+            db.execute('INSERT INTO crawls (id, url, status, created) VALUES (?, ?, ?, ?)',
+                       (crawl, url, 'running', time.time()))
+        return crawl
+
+    def crawl(self, crawl: str | None = None) -> dict | None:
+        """Dados de uma busca (a mais recente se `crawl` for None)."""
+        query = 'SELECT id, url, status, created FROM crawls '
+        row = self._db().execute(query + ('WHERE id = ?' if crawl else 'ORDER BY created DESC LIMIT 1'),
+                                 (crawl,) if crawl else ()).fetchone()
+        return dict(zip(('id', 'url', 'status', 'created'), row)) if row else None
+
+    def set_crawl_status(self, crawl: str, status: str) -> None:
+        with self._transaction() as db:
+            db.execute('UPDATE crawls SET status = ? WHERE id = ?', (status, crawl))
+
+    def enqueue(self, crawl: str, kind: str, key: str, payload: dict) -> bool:
+        """Enfileira uma tarefa; False se ela já existia (duplicada)."""
+        return self.enqueue_many(crawl, kind, [(key, payload)]) == 1
+
+    def enqueue_many(self, crawl: str, kind: str, tasks: list[tuple[str, dict]]) -> int:
+        """Enfileira várias tarefas numa transação; retorna quantas eram novas."""
+        now = time.time()
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                'INSERT OR IGNORE INTO tasks (crawl, kind, key, payload, updated) VALUES (?, ?, ?, ?, ?)',
+                [(crawl, kind, key, json.dumps(payload, ensure_ascii=False), now) for key, payload in tasks])
+            return db.total_changes - before
+
+    def lease(self, worker: str, crawl: str | None = None) -> Task | None:
+        """Arrenda a próxima tarefa disponível (páginas de listagem primeiro)."""
+        now = time.time()
+        with self._transaction() as db:
+            # Arrendamentos expirados além do limite de tentativas viram falha
+            db.execute(
+                "UPDATE tasks SET state = 'failed', error = 'arrendamento expirado', updated = ? "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts))
+            row = db.execute(
+                "SELECT id, crawl, kind, key, payload, attempts FROM tasks "
+                "WHERE ((state = 'pending' AND available_at <= ?) OR (state = 'leased' AND lease_expires < ?)) "
+                + ("AND crawl = ? " if crawl else "")
+                + "ORDER BY kind = 'detail', id LIMIT 1",
+                (now, now, crawl) if crawl else (now, now)).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE tasks SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated = ? WHERE id = ?",
+                (worker, now + self.visibility_timeout, now, row[0]))
+        return Task(row[0], row[1], row[2], row[3], json.loads(row[4]), row[5] + 1)
+
+    def extend(self, task: Task, worker: str) -> bool:
+        """Renova o arrendamento; False se a tarefa não pertence mais ao worker."""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET lease_expires = ?, updated = ? "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (now + self.visibility_timeout, now, task.id, worker))
+            return cursor.rowcount == 1
+
+    def complete(self, task: Task, worker: str) -> bool:
+        """Conclui a tarefa; ignorado se o arrendamento já passou para outro worker."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET state = 'done', lease_owner = NULL, error = NULL, updated = ? "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (time.time(), task.id, worker))
+            return cursor.rowcount == 1
+
+    def fail(self, task: Task, worker: str, error: str) -> None:
+        """Devolve a tarefa para nova tentativa com espera exponencial, ou a marca como falha."""
+        now = time.time()
+        failed = task.attempts >= self.max_attempts
+        delay = self.retry_base * 2 ** (task.attempts - 1)
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE tasks SET state = ?, lease_owner = NULL, available_at = ?, error = ?, updated = ? "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (FAILED if failed else PENDING, now + delay, error[:500], now, task.id, worker))
+
+    def add_result(self, crawl: str, key: str, item: dict, worker: str) -> None:
+        """Grava o resultado de um anúncio, substituindo um resultado anterior da mesma chave."""
+        with self._transaction() as db:
+            db.execute('INSERT OR REPLACE INTO results (crawl, key, item, worker, updated) VALUES (?, ?, ?, ?, ?)',
+                       (crawl, key, json.dumps(item, ensure_ascii=False), worker, time.time()))
+
+    def results(self, crawl: str) -> list[dict]:
+        rows = self._db().execute('SELECT item FROM results WHERE crawl = ? ORDER BY rowid', (crawl,))
+        return [json.loads(item) for (item,) in rows]
+
+    def counts(self, crawl: str) -> dict:
+        """Quantidade de tarefas por tipo e estado."""
+        counts = {}
+        rows = self._db().execute('SELECT kind, state, COUNT(*) FROM tasks WHERE crawl = ? GROUP BY kind, state',
+                                  (crawl,))
+        for kind, state, total in rows:
+            counts.setdefault(kind, {})[state] = total
+        return counts
+
+    def is_finished(self, crawl: str) -> bool:
+        """Se não há tarefas pendentes nem arrendadas na busca."""
+        row = self._db().execute("SELECT COUNT(*) FROM tasks WHERE crawl = ? AND state IN ('pending', 'leased')",
+                                 (crawl,)).fetchone()
+        return row[0] == 0
+
+    def close(self) -> None:
+        """Fecha as conexões abertas por todas as threads."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for db in connections:
+            db.close()
+        self._local.db = None
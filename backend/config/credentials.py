@@ -1,113 +1,215 @@
 import os
 import json
+import threading
+import time
 from pathlib import Path
-from cryptography.fernet import Fernet
-from dotenv import load_dotenv
+from dotenv import load_dotenv, dotenv_values
 
 # Carrega as variáveis de ambiente do arquivo .env
 load_dotenv()
 
-class CredentialsManager:
-    def __init__(self):
-        self.config_dir = Path(os.path.dirname(os.path.abspath(__file__)))
+
+class CredentialsProvider:
+    """Provedor de credenciais compartilhado por todo o processo.
+
+    Lê o `.env`, a chave e o arquivo criptografado uma única vez, mantém a
+    instância Fernet em memória e só volta ao disco quando algum dos arquivos
+    muda (verificação por mtime/tamanho, no máximo a cada `check_interval`
+    segundos). É thread-safe, permitindo que vários workers de navegador
+    obtenham credenciais em paralelo.
+
+    Attributes:
+        config_dir (Path): Diretório com a chave e o arquivo criptografado
+        key_file (Path): Chave Fernet
+        cred_file (Path): Credenciais criptografadas (uma ou mais contas)
+        env_path (Path): Arquivo .env observado
+        check_interval (float): Intervalo mínimo entre verificações de mudança
+    """
+
+    def __init__(self, config_dir: Path | None = None, env_path: Path | None = None,
+                 check_interval: float = 2.0):
+        self.config_dir = Path(config_dir or os.path.dirname(os.path.abspath(__file__)))
         self.key_file = self.config_dir / 'secret.key'
         self.cred_file = self.config_dir / 'credentials.enc'
+        self.env_path = Path(env_path or '.env')
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._fernet = None
+        self._signature = None
+        self._last_check = 0.0
+        self._accounts = []
         self._ensure_key()
 
     def _ensure_key(self):
         """Garante que a chave de criptografia existe"""
         if not self.key_file.exists():
+            from cryptography.fernet import Fernet
             key = Fernet.generate_key()
             with open(self.key_file, 'wb') as f:
                 f.write(key)
 
     def _get_fernet(self):
-        """Retorna instância Fernet para criptografia"""
-        with open(self.key_file, 'rb') as f:
-            key = f.read()
-        return Fernet(key)
+        """Retorna a instância Fernet em cache, lendo a chave apenas uma vez"""
+        if self._fernet is None:
+            from cryptography.fernet import Fernet
+            with open(self.key_file, 'rb') as f:
+                self._fernet = Fernet(f.read())
+        return self._fernet
 
-    def save_credentials(self, email: str, password: str):
-        """Salva credenciais tanto no .env quanto no arquivo criptografado"""
-        # Atualiza o arquivo .env
-        env_path = Path('.env')
-        print(f"[DEBUG] Tentando salvar credenciais em: {env_path.absolute()}")
-        print(f"[DEBUG] Arquivo .env existe? {env_path.exists()}")
-        env_content = []
-        
-        if env_path.exists():
-            with open(env_path, 'r') as f:
-                env_content = f.readlines()
-        
-        # Remove linhas antigas de credenciais se existirem
-        env_content = [line for line in env_content if not line.startswith(('OLX_EMAIL=', 'OLX_PASSWORD='))]
-        
-        # Adiciona novas credenciais
-        env_content.extend([
-            f"OLX_EMAIL={email}\n",
-            f"OLX_PASSWORD={password}\n"
-        ])
-        
-        # Salva o arquivo .env atualizado
-        try:
-            with open(env_path, 'w') as f:
-                f.writelines(env_content)
-            print(f"[DEBUG] Permissões do arquivo .env: {oct(env_path.stat().st_mode)[-3:]}")
-        except Exception as e:
-            print(f"[DEBUG] Erro ao escrever .env: {str(e)}")
-            raise
-            
-        print("[CRED] Credenciais atualizadas no arquivo .env")
-        
-        # Força recarregamento das variáveis de ambiente
-        os.environ.clear()  # Limpa as variáveis atuais
-        load_dotenv(override=True)  # Recarrega forçando override
-        
-        # Verifica se as credenciais foram recarregadas corretamente
-        loaded_email = os.getenv('OLX_EMAIL')
-        loaded_password = os.getenv('OLX_PASSWORD')
-        print(f"[DEBUG] Verificação pós-salvamento - Email carregado: {bool(loaded_email)}, Senha carregada: {bool(loaded_password)}")
-        
-        # Salva também no arquivo criptografado como backup
-        f = self._get_fernet()
-        creds = {
-            'email': email,
-            'password': password
-        }
-        encrypted_data = f.encrypt(json.dumps(creds).encode())
-        with open(self.cred_file, 'wb') as file:
-            file.write(encrypted_data)
-            
-        print("[CRED] Credenciais salvas no arquivo criptografado")
+    def _file_signature(self) -> tuple:
+        signature = []
+        for path in (self.env_path, self.key_file, self.cred_file):
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
 
-    def get_credentials(self):
-        """Recupera credenciais salvas, primeiro do .env depois do arquivo criptografado"""
-        # Tenta primeiro do .env
-        print("[DEBUG] Carregando variáveis de ambiente...")
-        load_dotenv()  # Recarrega as variáveis para garantir
-        env_email = os.getenv('OLX_EMAIL')
-        env_password = os.getenv('OLX_PASSWORD')
-        print(f"[DEBUG] Credenciais encontradas no .env? Email: {bool(env_email)}, Senha: {bool(env_password)}")
-        
+    def _refresh(self, force: bool = False) -> None:
+        """Recarrega as credenciais se algum arquivo mudou desde a última leitura."""
+        now = time.monotonic()
+        if not force and self._signature is not None and now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        signature = self._file_signature()
+        if not force and signature == self._signature:
+            return
+        if self._signature is not None and signature[1] != self._signature[1]:
+            self._fernet = None  # chave trocada
+        self._signature = signature
+        self._accounts = self._load_accounts()
+        print(f"[CRED] Credenciais carregadas: {len(self._accounts)} conta(s)")
+
+    def _load_accounts(self) -> list[dict]:
+        accounts = []
+
+        # .env primeiro (valores do arquivo têm precedência sobre o ambiente do processo)
+        env_values = dotenv_values(self.env_path) if self.env_path.exists() else {}
+        env_email = env_values.get('OLX_EMAIL') or os.getenv('OLX_EMAIL')
+        env_password = env_values.get('OLX_PASSWORD') or os.getenv('OLX_PASSWORD')
         if env_email and env_password:
-            print("[CRED] Usando credenciais do arquivo .env")
-            return {
-                'email': env_email,
-                'password': env_password
-            }
-            
-        # Se não encontrar no .env, tenta do arquivo criptografado
+            accounts.append({'email': env_email, 'password': env_password})
+
+        # Depois o arquivo criptografado (uma conta ou lista de contas)
+        for account in self._read_encrypted():
+            if account.get('email') and account.get('password') \
+                    and all(account['email'] != a['email'] for a in accounts):
+                accounts.append(account)
+        return accounts
+
+    def _read_encrypted(self) -> list[dict]:
         if not self.cred_file.exists():
-            print("[DEBUG] Arquivo de credenciais criptografado não encontrado")
-            return None
-        
-        print("[CRED] Usando credenciais do arquivo criptografado")
-        f = self._get_fernet()
+            return []
         try:
             with open(self.cred_file, 'rb') as file:
                 encrypted_data = file.read()
-            decrypted_data = f.decrypt(encrypted_data)
-            return json.loads(decrypted_data.decode())
+            data = json.loads(self._get_fernet().decrypt(encrypted_data).decode())
+            return data if isinstance(data, list) else [data]
         except Exception as e:
             print(f"Erro ao recuperar credenciais: {str(e)}")
-            return None
\ No newline at end of file
+            return []
+
+    def _write_encrypted(self, accounts: list[dict]) -> None:
+        encrypted_data = self._get_fernet().encrypt(json.dumps(accounts).encode())
+        tmp_file = self.cred_file.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as file:
+            file.write(encrypted_data)
+        os.replace(tmp_file, self.cred_file)
+
+    def get_credentials(self) -> dict | None:
+        """Retorna a conta principal (.env antes do arquivo criptografado)"""
+        with self._lock:
+            self._refresh()
+            return dict(self._accounts[0]) if self._accounts else None
+
+    def get_accounts(self) -> list[dict]:
+        """Retorna todas as contas conhecidas"""
+        with self._lock:
+            self._refresh()
+            return [dict(account) for account in self._accounts]
+
+    def save_credentials(self, email: str, password: str):
+        """Salva credenciais tanto no .env quanto no arquivo criptografado"""
+        with self._lock:
+            env_content = []
+            if self.env_path.exists():
+                with open(self.env_path, 'r') as f:
+                    env_content = f.readlines()
+
+            # Remove linhas antigas de credenciais se existirem
+            env_content = [line for line in env_content if not line.startswith(('OLX_EMAIL=', 'OLX_PASSWORD='))]
+            if env_content and not env_content[-1].endswith('\n'):
+                env_content[-1] += '\n'
+            env_content.extend([
+                f"OLX_EMAIL={email}\n",
+                f"OLX_PASSWORD={password}\n"
+            ])
+            with open(self.env_path, 'w') as f:
+                f.writelines(env_content)
+            print("[CRED] Credenciais atualizadas no arquivo .env")
+
+            # Atualiza apenas as variáveis de credenciais do processo
+            os.environ['OLX_EMAIL'] = email
+            os.environ['OLX_PASSWORD'] = password
+
+            # Salva também no arquivo criptografado como backup, preservando outras contas
+            accounts = [a for a in self._read_encrypted() if a.get('email') != email]
+            accounts.insert(0, {'email': email, 'password': password})
+            self._write_encrypted(accounts)
+            print("[CRED] Credenciais salvas no arquivo criptografado")
+
+            self._refresh(force=True)
+
+    def add_account(self, email: str, password: str) -> None:
+        """Adiciona (ou atualiza) uma conta extra no arquivo criptografado"""
+        with self._lock:
+            accounts = [a for a in self._read_encrypted() if a.get('email') != email]
+            accounts.append({'email': email, 'password': password})
+            self._write_encrypted(accounts)
+            print(f"[CRED] Conta {email} salva no arquivo criptografado")
+            self._refresh(force=True)
+
+    def remove_account(self, email: str) -> bool:
+        """Remove uma conta do arquivo criptografado"""
+        with self._lock:
+            accounts = self._read_encrypted()
+            remaining = [a for a in accounts if a.get('email') != email]
+            if len(remaining) == len(accounts):
+                return False
+            self._write_encrypted(remaining)
+            print(f"[CRED] Conta {email} removida do arquivo criptografado")
+            self._refresh(force=True)
+            return True
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_credentials_provider() -> CredentialsProvider:
+    """Retorna o provedor de credenciais único do processo."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = CredentialsProvider()
+    return _provider
+
+
+class CredentialsManager:
+    """Fachada compatível sobre o provedor compartilhado de credenciais."""
+
+    def __init__(self):
+        self._provider = get_credentials_provider()
+        self.config_dir = self._provider.config_dir
+        self.key_file = self._provider.key_file
+        self.cred_file = self._provider.cred_file
+
+    def save_credentials(self, email: str, password: str):
+        """Salva credenciais tanto no .env quanto no arquivo criptografado"""
+        self._provider.save_credentials(email, password)
+
+    def get_credentials(self):
+        """Recupera credenciais salvas, primeiro do .env depois do arquivo criptografado"""
+        return self._provider.get_credentials()
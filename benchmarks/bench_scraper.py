@@ -0,0 +1,436 @@
+"""Benchmark offline do scraper contra o servidor OLX falso.
+
+Mede:
+- parse: taxa de parsing das páginas de listagem (sem rede), DOM vs estado JSON
+- parse_pool: escalonamento do parsing em processos (ParsePool) com o número de workers
+- listing: listagem ponta a ponta (HTTP + proxy falso + parsing)
+- listing_pool: a mesma listagem com o ParsePool, em HTTP/1.1 e (com httpx instalado) pelo cliente HTTP/2;
+  falha se algum caminho extrair itens diferentes da listagem sem o pool
+- e2e: extração completa com Selenium e revelação de telefones (--browser)
+- repository: salvamento, tamanho, leitura e exportação do JsonRepository e do BlockRepository
+- search: indexação e latência de consultas do índice de busca (FTS5)
+- export: exportação completa vs incremental (só anúncios novos/alterados) em CSV
+- memory: pico de memória (RSS) de uma listagem longa contra o servidor falso, por parser
+
+Uso:
+    python -m benchmarks.bench_scraper --pages 10 --latency 0.02 --error-rate 0.05
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+
+from backend.adapters.block_repository import BlockRepository, available_codecs
+from backend.adapters.json_repository import JsonRepository
+from backend.adapters.http_client import HttpClient
+from backend.adapters.listing_parser import ParsePool
+from backend.adapters.search_index import SearchIndex
+from backend.adapters.scraping_adapter import BeautifulSoupAdapter
+from backend.domain.entities.scraping import ScrapingData
+
+from . import fixtures
+from .mock_server import FakeProxy, MockOlxServer
+from .results import record_result
+
+
+@contextmanager
+def quiet():
+    """Suprime os prints do scraper durante a medição."""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        yield
+
+
+def make_adapter(server: MockOlxServer, proxy: FakeProxy | None = None) -> BeautifulSoupAdapter:
+    adapter = BeautifulSoupAdapter(proxies=[proxy.address] if proxy else None)
+    adapter.base_url = server.base_url
+    adapter.current_proxy = proxy.address if proxy else None
+    adapter.min_request_delay = 0
+    return adapter
+
+
+def load_pages(pages: int, html_dir: str | None = None) -> list[str]:
+    """Páginas de listagem geradas ou salvas do site real (*.html em `html_dir`)."""
+    if html_dir:
+        paths = sorted(Path(html_dir).glob('*.html'))
+        return [path.read_text(encoding='utf-8') for path in paths]
+    return [fixtures.listing_page(n, total_pages=pages) for n in range(1, pages + 1)]
+
+
+def bench_parse(html_pages: list[str], parser: str = 'dom') -> dict:
+    adapter = BeautifulSoupAdapter()
+    adapter.listing_parser = parser
+    total_bytes = sum(len(page) for page in html_pages)
+    pages = len(html_pages)
+    items = fields = 0
+    start = time.perf_counter()
+    with quiet():
+        for html in html_pages:
+            parsed = adapter._parse_listing_page(html)[0]
+            items += len(parsed)
+            fields += sum(1 for item in parsed for value in item.values() if value not in (None, 'N/A'))
+    elapsed = time.perf_counter() - start
+    return {
+        'parser': parser,
+        'pages': pages,
+        'items': items,
+        'fields_per_item': round(fields / items, 1) if items else 0,
+        'seconds': round(elapsed, 4),
+        'pages_per_second': round(pages / elapsed, 2),
+        'items_per_second': round(items / elapsed, 2),
+        'mb_per_second': round(total_bytes / elapsed / 1e6, 2),
+    }
+
+
+def bench_parse_pool(html_pages: list[str], workers: int, parser: str = 'dom') -> dict:
+    """Parsing das páginas no ParsePool, como no crawl: bytes crus entram, tuplas saem."""
+    adapter = BeautifulSoupAdapter()
+    order = adapter.selectors.order()
+    raw_pages = [html.encode('utf-8') for html in html_pages]
+    pool = ParsePool(workers, quiet=True)
+    # Sobe os processos antes de medir
+    with quiet():
+        for future in [pool.submit(raw_pages[0], 'utf-8', adapter.base_url, parser, order) for _ in range(workers)]:
+            future.result()
+    items = 0
+    start = time.perf_counter()
+    with quiet():
+        futures = [pool.submit(raw, 'utf-8', adapter.base_url, parser, order) for raw in raw_pages]
+        for future in futures:
+            items += len(future.result()[0])
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return {
+        'workers': workers,
+        'pages': len(raw_pages),
+        'items': items,
+        'seconds': round(elapsed, 4),
+        'pages_per_second': round(len(raw_pages) / elapsed, 2),
+    }
+
+
+def bench_listing(server: MockOlxServer, proxy: FakeProxy, parse_workers: int = 0, http2: bool = False) -> dict:
+    adapter = make_adapter(server, proxy)
+    if http2:
+        adapter.http = HttpClient(http2=True)
+    if parse_workers:
+        adapter.parse_pool = ParsePool(parse_workers, quiet=True)
+    start = time.perf_counter()
+    try:
+        with quiet():
+            items = adapter._extract_items_list(f"{server.base_url}/ads/")
+    finally:
+        if parse_workers:
+            adapter.parse_pool.close()
+        if http2:
+            adapter.http.close()
+    elapsed = time.perf_counter() - start
+    snap = adapter.metrics.snapshot()
+    return {
+        'protocol': adapter.http.stats()['protocol'],
+        'parse_workers': parse_workers,
+        'links': sorted(item['link'] for item in items),
+        'items': len(items),
+        'seconds': round(elapsed, 4),
+        'items_per_second': round(len(items) / elapsed, 2),
+        'requests': snap['counters'].get('requests', 0),
+        'retries': snap['counters'].get('retries', 0),
+        'bytes': snap['counters'].get('bytes', 0),
+    }
+
+
+def _without_links(result: dict) -> dict:
+    return {key: value for key, value in result.items() if key != 'links'}
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return peak / (2**20 if sys.platform == 'darwin' else 2**10)
+
+
+def memory_crawl(pages: int, parser: str) -> dict:
+    """Listagem completa de `pages` páginas do servidor falso; roda no processo filho de `bench_memory`."""
+    with MockOlxServer(total_pages=pages) as server:
+        adapter = make_adapter(server)
+        adapter.listing_parser = parser
+        adapter.listing_workers = 1
+        # Aquece imports e caches com uma página antes de medir o pico inicial
+        with quiet():
+            adapter._parse_listing_page(fixtures.listing_page(1, total_pages=pages))
+        before = _peak_rss_mb()
+        start = time.perf_counter()
+        with quiet():
+            items = adapter._extract_items_list(f"{server.base_url}/ads/")
+        elapsed = time.perf_counter() - start
+    after = _peak_rss_mb()
+    return {
+        'parser': parser,
+        'pages': pages,
+        'items': len(items),
+        'seconds': round(elapsed, 2),
+        'peak_rss_mb': round(after, 1),
+        'crawl_rss_mb': round(after - before, 1),
+    }
+
+
+def bench_memory(pages: int, parser: str) -> dict:
+    """Pico de RSS da listagem num interpretador novo, para que um parser não herde o pico do outro."""
+    code = f"import json; from benchmarks.bench_scraper import memory_crawl; " \
+           f"print(json.dumps(memory_crawl({pages}, {parser!r})))"
+    proc = subprocess.run([sys.executable, '-c', code], cwd=Path(__file__).resolve().parent.parent,
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def bench_e2e(server: MockOlxServer, proxy: FakeProxy, max_items: int, profile: str = 'lean') -> dict:
+    adapter = make_adapter(server, proxy)
+    adapter.email, adapter.password = 'bench@example.com', 'bench'
+    adapter.browser_profile = profile
+    original = adapter._extract_items_list
+    adapter._extract_items_list = lambda url, cb=None: original(url, cb)[:max_items]
+    start = time.perf_counter()
+    with quiet():
+        data = adapter.extract_data(f"{server.base_url}/ads/")
+    elapsed = time.perf_counter() - start
+    adapter.close()
+    phones = sum(1 for item in data.data if item.get('phone') not in (None, 'N/A'))
+    snap = adapter.metrics.snapshot()
+    pages = snap['counters'].get('detail_pages', 0) or 1
+    return {
+        'profile': profile,
+        'items': len(data.data),
+        'phones': phones,
+        'seconds': round(elapsed, 4),
+        'items_per_second': round(len(data.data) / elapsed, 3),
+        'page_load_ms_per_item': round(snap['stages'].get('page_load', {}).get('seconds', 0) / pages * 1000, 1),
+        'browser_bytes_per_item': snap['counters'].get('browser_bytes', 0) // pages,
+        'stages': {k: round(v['seconds'], 3) for k, v in snap['stages'].items()},
+    }
+
+
+def bench_repository(runs: int, items_per_run: int, storage: str = 'json') -> dict:
+    """Salvamento, tamanho, leitura e exportação no formato `storage` ('json', 'gzip' ou 'zstd')."""
+    ads = [fixtures.make_ad(n) for n in range(1, items_per_run + 1)]
+    items = [{'name': ad['title'], 'price': f"{ad['price']} €", 'seller_name': ad['seller_name'],
+              'link': f"https://www.olx.pt/d/anuncio/{ad['slug']}.html", 'phone': ad['phone']} for ad in ads]
+    with tempfile.TemporaryDirectory() as tmp:
+        if storage == 'json':
+            repository = JsonRepository(os.path.join(tmp, 'data.json'))
+        else:
+            repository = BlockRepository(os.path.join(tmp, 'data.olxb'), codec=storage)
+        start = time.perf_counter()
+        with quiet():
+            for run in range(runs):
+                repository.save(ScrapingData(f"https://www.olx.pt/ads/?run={run}", items))
+        save_elapsed = time.perf_counter() - start
+        file_size = os.path.getsize(repository.filename)
+
+        result = {
+            'storage': storage,
+            'runs': runs,
+            'items': runs * items_per_run,
+            'save_seconds': round(save_elapsed, 4),
+            'saves_per_second': round(runs / save_elapsed, 2),
+            'file_bytes': file_size,
+            'bytes_per_item': round(file_size / (runs * items_per_run), 1),
+        }
+
+        start = time.perf_counter()
+        with quiet():
+            loaded = repository.load()
+        result['load_seconds'] = round(time.perf_counter() - start, 4)
+        result['loaded_items'] = sum(len(entry.data) for entry in loaded)
+
+        # Ler só a última coleta: os blocos descomprimem um bloco, o JSON precisa ler o arquivo inteiro
+        repository = (JsonRepository(repository.filename) if storage == 'json'
+                      else BlockRepository(repository.filename, codec=storage))
+        start = time.perf_counter()
+        with quiet():
+            if storage == 'json':
+                last = repository.load()[-1]
+            else:
+                last = next(repository.iter_runs(runs - 1))
+        result['last_run_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        result['last_run_items'] = len(last.data)
+
+        try:
+            start = time.perf_counter()
+            with quiet():
+                repository.export_to_excel(os.path.join(tmp, 'export.xlsx'))
+            elapsed = time.perf_counter() - start
+            result['export_seconds'] = round(elapsed, 4)
+            result['export_rows_per_second'] = round(runs * items_per_run / elapsed, 2)
+        except Exception as e:
+            print(f"[BENCH] Exportação para Excel indisponível: {e}")
+        return result
+
+
+def fixture_items(count: int, start: int = 1) -> list[dict]:
+    items = []
+    for n in range(start, start + count):
+        ad = fixtures.make_ad(n)
+        items.append({'name': ad['title'], 'price': f"{ad['price']} €", 'price_value': ad['price'],
+                      'seller_name': ad['seller_name'], 'link': f"https://www.olx.pt/d/anuncio/{ad['slug']}.html",
+                      'created': ad['created'], 'description': ad['description'], 'phone': ad['phone']})
+    return items
+
+
+def bench_search(total_ads: int, batch: int = 10000) -> dict:
+    """Indexa `total_ads` anúncios em lotes (como coletas) e mede consultas típicas."""
+    queries = {
+        'token': dict(query='iphone'),
+        'prefix': dict(query='bicic*'),
+        'token_price': dict(query='sofa', min_price=100, max_price=1000),
+        'token_relevance': dict(query='iphone', sort='relevance'),
+        'date_sorted': dict(since='2024-06-01', sort='price', descending=True),
+        'page_deep': dict(sort='name', offset=total_ads // 2),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SearchIndex(os.path.join(tmp, 'index.db'))
+        start = time.perf_counter()
+        for run, first in enumerate(range(1, total_ads + 1, batch)):
+            index.add_run(run, 'https://www.olx.pt/ads/', fixture_items(min(batch, total_ads - first + 1), first))
+        index_elapsed = time.perf_counter() - start
+        result = {
+            'ads': total_ads,
+            'index_seconds': round(index_elapsed, 2),
+            'ads_per_second': round(total_ads / index_elapsed),
+            'db_bytes': os.path.getsize(index.path),
+        }
+        for name, params in queries.items():
+            timings = []
+            for _ in range(5):
+                start = time.perf_counter()
+                rows = index.search(limit=50, **params)
+                timings.append(time.perf_counter() - start)
+            result[f'{name}_ms'] = round(sorted(timings)[len(timings) // 2] * 1000, 2)
+            result[f'{name}_rows'] = len(rows)
+        start = time.perf_counter()
+        result['count_token'] = index.count('iphone')
+        result['count_token_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        index.close()
+    return result
+
+
+def bench_export(total_ads: int, changed: int, fmt: str = 'csv') -> dict:
+    """Compara a exportação completa de `total_ads` anúncios com a incremental após `changed` mudanças."""
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = BlockRepository(os.path.join(tmp, 'data.olxb'))
+        items = fixture_items(total_ads)
+        with quiet():
+            repository.save(ScrapingData('https://www.olx.pt/ads/', items))
+            repository.export(os.path.join(tmp, f'first.{fmt}'), target='bench')
+            # Nova coleta: metade das mudanças são preços alterados, metade anúncios novos
+            updated = [dict(item, price_value=item['price_value'] + 1) if n < changed // 2 else item
+                       for n, item in enumerate(items)]
+            repository.save(ScrapingData('https://www.olx.pt/ads/',
+                                         updated + fixture_items(changed - changed // 2, total_ads + 1)))
+
+        result = {'ads': total_ads, 'changed': changed, 'format': fmt}
+        for mode, target in (('full', None), ('delta', 'bench')):
+            filename = os.path.join(tmp, f'{mode}.{fmt}')
+            start = time.perf_counter()
+            with quiet():
+                stats = repository.export(filename, target=target)
+            result[f'{mode}_seconds'] = round(time.perf_counter() - start, 4)
+            result[f'{mode}_rows'] = stats['rows']
+            result[f'{mode}_bytes'] = os.path.getsize(filename)
+        repository.index.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark offline do scraper')
+    parser.add_argument('--pages', type=int, default=10, help='Páginas de listagem no servidor falso')
+    parser.add_argument('--latency', type=float, default=0.0, help='Latência por requisição (s)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Latência aleatória adicional (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fração de respostas 503')
+    parser.add_argument('--block-rate', type=float, default=0.0, help='Fração de páginas de captcha')
+    parser.add_argument('--proxy-failure-rate', type=float, default=0.0, help='Fração de falhas do proxy')
+    parser.add_argument('--browser', action='store_true', help='Inclui a extração completa com Selenium')
+    parser.add_argument('--e2e-items', type=int, default=20, help='Itens processados no modo --browser')
+    parser.add_argument('--profile', choices=['lean', 'full', 'both'], default='both',
+                        help='Perfil do navegador no modo --browser (both compara os dois)')
+    parser.add_argument('--repo-runs', type=int, default=20, help='Execuções salvas no benchmark de repositório')
+    parser.add_argument('--storage', nargs='*', choices=['json', 'gzip', 'zstd'],
+                        help='Formatos medidos no benchmark de repositório (padrão: json e os codecs disponíveis)')
+    parser.add_argument('--html-dir', help='Diretório com páginas de listagem salvas (*.html) para o benchmark de parsing')
+    parser.add_argument('--parser', choices=['dom', 'stream', 'state', 'both'], default='both',
+                        help='Parser de listagem medido (both compara dom e state, e também stream no de memória)')
+    parser.add_argument('--parse-workers', type=int, nargs='*',
+                        help='Workers medidos no benchmark parse_pool (padrão: 1, 2, 4... até o número de núcleos)')
+    parser.add_argument('--search-ads', type=int, default=100000, help='Anúncios indexados no benchmark de busca')
+    parser.add_argument('--export-ads', type=int, default=50000, help='Anúncios no histórico do benchmark de exportação')
+    parser.add_argument('--export-changes', type=int, default=500,
+                        help='Anúncios novos ou alterados antes da exportação incremental')
+    parser.add_argument('--memory-pages', type=int, default=500, help='Páginas da listagem no benchmark de memória')
+    parser.add_argument('--only', nargs='*',
+                        choices=['parse', 'parse_pool', 'listing', 'listing_pool', 'e2e', 'repository', 'search', 'export',
+                                 'memory'],
+                        help='Executa apenas os benchmarks informados')
+    args = parser.parse_args()
+    selected = set(args.only or ['parse', 'listing', 'repository'] + (['e2e'] if args.browser else []))
+    params = {k: v for k, v in vars(args).items() if k != 'only'}
+
+    if 'parse' in selected:
+        html_pages = load_pages(args.pages, args.html_dir)
+        for parser_name in (['dom', 'state'] if args.parser == 'both' else [args.parser]):
+            record_result(f'parse_{parser_name}', bench_parse(html_pages, parser_name), params)
+
+    if 'parse_pool' in selected:
+        html_pages = load_pages(args.pages, args.html_dir)
+        cores = os.cpu_count() or 1
+        workers = args.parse_workers or sorted({min(2 ** i, cores) for i in range(cores.bit_length() + 1)})
+        parser_name = 'dom' if args.parser == 'both' else args.parser
+        runs = [bench_parse_pool(html_pages, n, parser_name) for n in workers]
+        base = runs[0]['pages_per_second'] / runs[0]['workers']
+        for run in runs:
+            run['speedup'] = round(run['pages_per_second'] / base, 2)
+            run['efficiency'] = round(run['speedup'] / run['workers'], 2)
+        record_result('parse_pool', {'parser': parser_name, 'cores': cores, 'runs': runs}, params)
+
+    if selected & {'listing', 'listing_pool', 'e2e'}:
+        with MockOlxServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           block_rate=args.block_rate, total_pages=args.pages) as server, \
+                FakeProxy(failure_rate=args.proxy_failure_rate) as proxy:
+            if 'listing' in selected:
+                record_result('listing', _without_links(bench_listing(server, proxy)), params)
+            if 'listing_pool' in selected:
+                from importlib.util import find_spec
+                expected = bench_listing(server, proxy)['links']
+                for http2 in [False] + ([True] if find_spec('httpx') and find_spec('h2') else []):
+                    result = bench_listing(server, proxy, parse_workers=2, http2=http2)
+                    if result['links'] != expected:
+                        raise SystemExit(f"[BENCH] listing_pool ({result['protocol']}): {result['items']} itens, "
+                                         f"esperados {len(expected)}")
+                    record_result(f"listing_pool_{'http2' if http2 else 'http1'}", _without_links(result), params)
+            if 'e2e' in selected:
+                profiles = ['full', 'lean'] if args.profile == 'both' else [args.profile]
+                for profile in profiles:
+                    record_result(f'e2e_{profile}', bench_e2e(server, proxy, args.e2e_items, profile), params)
+
+    if 'repository' in selected:
+        for storage in args.storage or ['json'] + available_codecs():
+            suffix = '' if storage == 'json' else f'_{storage}'
+            record_result(f'repository{suffix}',
+                          bench_repository(args.repo_runs, fixtures.ADS_PER_PAGE * args.pages, storage), params)
+
+    if 'search' in selected:
+        record_result('search', bench_search(args.search_ads), params)
+
+    if 'export' in selected:
+        record_result('export', bench_export(args.export_ads, args.export_changes), params)
+
+    if 'memory' in selected:
+        for parser_name in (['dom', 'stream', 'state'] if args.parser == 'both' else [args.parser]):
+            record_result(f'memory_{parser_name}', bench_memory(args.memory_pages, parser_name), params)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark de tempo de inicialização (python -X importtime).
+
+Mede o custo de importação das entradas da aplicação:
+- gui: o que `python main.py` carrega antes de abrir a janela
+- headless: o que `python main.py --url ...` carrega antes de iniciar o scraping
+
+Também aponta se módulos pesados (selenium, pandas, bs4...) foram importados
+na inicialização, o que indica regressão do carregamento preguiçoso.
+
+Uso:
+    python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .results import record_result
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENTRIES = {
+    'gui': 'import main; from frontend.gui.main_window import MainWindow',
+    'headless': 'import main; main.BeautifulSoupAdapter(); main.open_repository()',
+}
+
+HEAVY_MODULES = ['selenium', 'pandas', 'bs4', 'requests', 'fake_useragent', 'cryptography', 'numpy']
+
+
+def _importtime(code: str) -> tuple[dict, float]:
+    """Executa o código em um interpretador novo e retorna o tempo próprio (µs) por módulo."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us)
+    return modules, wall
+
+
+def measure(entry: str, repeat: int) -> dict:
+    baseline, baseline_wall = _importtime('pass')
+    totals, walls = [], []
+    modules = {}
+    for _ in range(repeat):
+        modules, wall = _importtime(ENTRIES[entry])
+        own = {name: us for name, us in modules.items() if name not in baseline}
+        totals.append(sum(own.values()) / 1000)
+        walls.append((wall - baseline_wall) * 1000)
+    own = {name: us for name, us in modules.items() if name not in baseline}
+    slowest = sorted(own.items(), key=lambda kv: -kv[1])[:5]
+    heavy = sorted({name.split('.')[0] for name in own if name.split('.')[0] in HEAVY_MODULES})
+    return {
+        'import_ms': round(statistics.median(totals), 2),
+        'wall_ms': round(statistics.median(walls), 2),
+        'modules': len(own),
+        'heavy_modules': heavy,
+        'slowest': [f"{name}={us / 1000:.1f}ms" for name, us in slowest],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de inicialização')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--entry', choices=sorted(ENTRIES), nargs='*')
+    args = parser.parse_args()
+    for entry in args.entry or sorted(ENTRIES):
+        result = measure(entry, args.repeat)
+        record_result(f'startup_{entry}', result, {'repeat': args.repeat})
+        if result['heavy_modules']:
+            print(f"[BENCH] ATENÇÃO: módulos pesados na inicialização: {', '.join(result['heavy_modules'])}")
+
+
+if __name__ == '__main__':
+    main()
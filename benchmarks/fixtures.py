@@ -0,0 +1,237 @@
+"""Geração determinística de páginas de fixture no formato da OLX.
+
+As páginas imitam a estrutura real do site: cartões `data-cy="l-card"`,
+paginação, estado pré-renderizado em JSON, páginas de detalhe com galeria,
+fontes, scripts de terceiros, banner de cookies e botão de revelar telefone.
+"""
+import html
+import json
+import random
+import unicodedata
+from datetime import datetime, timedelta
+
+ADS_PER_PAGE = 40
+DEFAULT_TOTAL_PAGES = 25
+
+_WORDS = [
+    'iPhone', 'Samsung', 'Bicicleta', 'Sofá', 'Mesa', 'Cadeira', 'Portátil', 'Frigorífico',
+    'Carrinho', 'Bebé', 'Apartamento', 'T2', 'Renault', 'Clio', 'Casaco', 'Sapatilhas',
+    'Nike', 'PlayStation', 'Televisão', 'LG', 'Máquina', 'Lavar', 'Roupa', 'Guitarra',
+]
+_CITIES = ['Lisboa', 'Porto', 'Braga', 'Coimbra', 'Faro', 'Setúbal', 'Aveiro', 'Viseu']
+_CATEGORIES = ['telemoveis', 'moveis', 'carros', 'imoveis', 'moda', 'desporto', 'eletronica']
+_BASE_DATE = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def _slugify(text: str) -> str:
+    ascii_text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    return ascii_text.lower().replace(' ', '-')
+
+
+def make_ad(ad_id: int, seed: int = 0) -> dict:
+    """Gera os dados de um anúncio de forma determinística."""
+    rnd = random.Random(ad_id * 7919 + seed)
+    title = ' '.join(rnd.sample(_WORDS, 3))
+    seller_id = rnd.randint(1, max(ad_id // 4, 50))
+    return {
+        'id': ad_id,
+        'title': f"{title} {ad_id}",
+        'slug': f"{_slugify(title)}-ID{ad_id:x}",
+        'price': rnd.choice([0, rnd.randint(5, 500), rnd.randint(500, 25000)]),
+        'city': rnd.choice(_CITIES),
+        'category': rnd.choice(_CATEGORIES),
+        'created': (_BASE_DATE - timedelta(minutes=ad_id * 13)).isoformat() + 'Z',
+        'seller_id': seller_id,
+        'seller_name': f"Vendedor {seller_id}",
+        'phone': f"+3519{seller_id:08d}",
+        'description': ' '.join(rnd.choice(_WORDS) for _ in range(40)),
+    }
+
+
+def page_ads(page: int, per_page: int = ADS_PER_PAGE, seed: int = 0) -> list[dict]:
+    """Retorna os anúncios de uma página (1-indexada)."""
+    first = (page - 1) * per_page + 1
+    return [make_ad(ad_id, seed) for ad_id in range(first, first + per_page)]
+
+
+def _format_price(price: int) -> str:
+    if price == 0:
+        return 'Troca'
+    return f"{price:,}".replace(',', '.') + ' €'
+
+
+def _state_ad(ad: dict, base_url: str) -> dict:
+    return {
+        'id': ad['id'],
+        'title': ad['title'],
+        'url': f"{base_url}/d/anuncio/{ad['slug']}.html",
+        'description': ad['description'],
+        'createdTime': ad['created'],
+        'lastRefreshTime': ad['created'],
+        'category': {'id': _CATEGORIES.index(ad['category']) + 1, 'type': ad['category']},
+        'price': {
+            'displayValue': _format_price(ad['price']),
+            'regularPrice': {'value': ad['price'], 'currencyCode': 'EUR'} if ad['price'] else None,
+        },
+        'location': {'cityName': ad['city'], 'regionName': ad['city']},
+        'user': {'id': ad['seller_id'], 'name': ad['seller_name']},
+    }
+
+
+def _card_html(ad: dict) -> str:
+    seller = ''
+    if ad['id'] % 3:
+        seller = f'<span data-testid="seller-name">{html.escape(ad["seller_name"])}</span>'
+    return f'''
+<div data-cy="l-card" data-testid="l-card" id="{ad['id']}" class="css-1sw7q4x">
+  <div class="css-1apmciz">
+    <div class="css-gl6djm">
+      <img src="/static/thumb/{ad['id']}.webp" alt="{html.escape(ad['title'])}" class="css-8wsg1m" loading="lazy">
+    </div>
+    <div data-cy="ad-card-title" class="css-u2ayx9">
+      <a class="css-z3gu2d" href="/d/anuncio/{ad['slug']}.html" data-cy="listing-link">
+        <h6 data-testid="ad-title" class="css-1wxaaza">{html.escape(ad['title'])}</h6>
+      </a>
+      <p data-testid="ad-price" class="css-10b0gli">{_format_price(ad['price'])}</p>
+    </div>
+    <div class="css-odp1qd">
+      <p data-testid="location-date" class="css-1a4brun">{ad['city']} - {ad['created'][:10]}</p>
+      {seller}
+    </div>
+  </div>
+</div>'''
+
+
+def _pagination_html(page: int, total_pages: int, base_path: str) -> str:
+    sep = '&' if '?' in base_path else '?'
+    items = []
+    for n in range(max(1, page - 2), min(total_pages, page + 2) + 1):
+        items.append(f'<li data-testid="pagination-list-item" class="css-ps94ux">'
+                     f'<a class="css-1mi714g" href="{base_path}{sep}page={n}">{n}</a></li>')
+    forward = ''
+    if page < total_pages:
+        forward = (f'<a data-cy="pagination-forward" data-testid="pagination-forward" rel="next" '
+                   f'href="{base_path}{sep}page={page + 1}" class="css-pyu9k9"></a>')
+    return (f'<div data-testid="pagination-wrapper" class="css-4mw0p4">'
+            f'<ul class="pagination-list css-1vdlgt7">{"".join(items)}</ul>{forward}</div>')
+
+
+def listing_page(page: int, total_pages: int = DEFAULT_TOTAL_PAGES, per_page: int = ADS_PER_PAGE,
+                 base_url: str = 'https://www.olx.pt', base_path: str = '/ads/', seed: int = 0) -> str:
+    """Gera o HTML de uma página de listagem."""
+    ads = page_ads(page, per_page, seed) if 1 <= page <= total_pages else []
+    state = {
+        'listing': {
+            'listing': {
+                'ads': [_state_ad(ad, base_url) for ad in ads],
+                'pageNumber': page,
+                'totalPages': total_pages,
+                'totalElements': total_pages * per_page,
+            }
+        }
+    }
+    encoded_state = json.dumps(json.dumps(state))
+    cards = ''.join(_card_html(ad) for ad in ads)
+    # Scripts e estilos volumosos como no site real
+    filler = '\n'.join(f'.css-{i:x}{{margin:{i % 7}px;padding:{i % 5}px;color:#{i % 4096:03x}}}'
+                       for i in range(600))
+    return f'''<!DOCTYPE html>
+<html lang="pt">
+<head>
+  <meta charset="utf-8">
+  <title>Anúncios - OLX.pt</title>
+  <link rel="preload" href="/static/fonts/geomanist.woff2" as="font" crossorigin>
+  <style>{filler}</style>
+  <script src="/vendor/googletagmanager/gtm.js" async></script>
+</head>
+<body>
+  <div id="onetrust-banner-sdk"><button id="onetrust-accept-btn-handler">Aceitar</button></div>
+  <header><a data-cy="myolx-link" href="/login/">A minha conta</a></header>
+  <main>
+    <div data-testid="listing-grid" class="css-oukcj3">{cards}</div>
+    {_pagination_html(page, total_pages, base_path)}
+  </main>
+  <script>window.__PRERENDERED_STATE__= {encoded_state};</script>
+  <script src="/vendor/hotjar/hotjar.js" async></script>
+</body>
+</html>'''
+
+
+def detail_page(ad: dict, logged_in: bool = False) -> str:
+    """Gera o HTML de uma página de detalhe com o fluxo de revelar telefone."""
+    gallery = ''.join(f'<img src="/static/gallery/{ad["id"]}-{n}.jpg" class="css-1bmvjcs">' for n in range(8))
+    account = ('<a data-testid="myaccount-link-logged" href="/myaccount/">Conta</a>' if logged_in
+               else '<a data-cy="myolx-link" href="/login/">A minha conta</a>')
+    return f'''<!DOCTYPE html>
+<html lang="pt">
+<head>
+  <meta charset="utf-8">
+  <title>{html.escape(ad['title'])} - OLX.pt</title>
+  <link rel="stylesheet" href="/static/fonts/geomanist.css">
+  <script src="/vendor/googletagmanager/gtm.js" async></script>
+  <script src="/vendor/facebook/fbevents.js" async></script>
+</head>
+<body>
+  <div id="onetrust-banner-sdk">
+    <button id="onetrust-accept-btn-handler" onclick="document.getElementById('onetrust-banner-sdk').remove()">Aceitar</button>
+  </div>
+  <header>{account}</header>
+  <div data-testid="ad-photo" class="css-1bmvjcs">{gallery}</div>
+  <h4 data-cy="ad_title" class="css-1juynto">{html.escape(ad['title'])}</h4>
+  <h3 data-testid="ad-price-container">{_format_price(ad['price'])}</h3>
+  <div data-cy="ad_description"><div class="css-1t507yq">{html.escape(ad['description'])}</div></div>
+  <a data-testid="user-profile-link" href="/perfil/{ad['seller_id']}/">
+    <h4 data-testid="user-profile-user-name">{html.escape(ad['seller_name'])}</h4>
+  </a>
+  <div data-testid="phones-container">
+    <button data-testid="show-phone" data-cy="show-phone" type="button">Mostrar telefone</button>
+    <div data-testid="phone-number"></div>
+  </div>
+  <script>
+    document.querySelector('[data-cy="show-phone"]').addEventListener('click', function () {{
+      fetch('/api/v1/offers/{ad['id']}/limited-phones/')
+        .then(function (r) {{ return r.json(); }})
+        .then(function (data) {{
+          var phone = data.data.phones[0];
+          document.querySelector('[data-testid="phone-number"]').innerHTML =
+            '<span data-testid="contact-phone"><a href="tel:' + phone + '">' + phone + '</a></span>';
+        }});
+    }});
+  </script>
+  <script src="/vendor/hotjar/hotjar.js" async></script>
+</body>
+</html>'''
+
+
+def blocked_page() -> str:
+    """Página devolvida com status 200 quando o mock simula bloqueio/captcha."""
+    return '''<!DOCTYPE html>
+<html><head><title>Security check</title></head>
+<body><div>Please complete the security check to continue. captcha</div>
+<div id="px-captcha"></div></body></html>'''
+
+
+def home_page(logged_in: bool = False) -> str:
+    account = ('<a data-testid="myaccount-link-logged" href="/myaccount/">Conta</a>' if logged_in
+               else '<a data-cy="myolx-link" href="/login/">A minha conta</a>')
+    return f'''<!DOCTYPE html>
+<html lang="pt"><head><meta charset="utf-8"><title>OLX.pt</title></head>
+<body>
+  <div id="onetrust-banner-sdk">
+    <button id="onetrust-accept-btn-handler" onclick="document.getElementById('onetrust-banner-sdk').remove()">Aceitar</button>
+  </div>
+  <header>{account}</header>
+  <main data-testid="home-categories">olx.pt css-home</main>
+</body></html>'''
+
+
+def login_page() -> str:
+    return '''<!DOCTYPE html>
+<html lang="pt"><head><meta charset="utf-8"><title>Entrar - OLX.pt</title></head>
+<body>
+  <form method="post" action="/login/">
+    <input id="username" name="username" type="email">
+    <input id="password" name="password" type="password">
+    <button type="submit">Entrar</button>
+  </form>
+</body></html>'''
@@ -0,0 +1,327 @@
+"""Servidor HTTP local que imita a OLX e proxy falso para benchmarks offline.
+
+Uso isolado:
+    python -m benchmarks.mock_server --port 8765 --latency 0.05 --error-rate 0.02
+"""
+import argparse
+import json
+import random
+import re
+import select
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from . import fixtures
+
+_DETAIL_RE = re.compile(r'^/d/anuncio/.*-ID([0-9a-f]+)\.html$')
+_PHONE_RE = re.compile(r'^/api/v1/offers/(\d+)/limited-phones/$')
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MockOLX/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = 'text/html; charset=utf-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _logged_in(self) -> bool:
+        return 'olx_session=ok' in (self.headers.get('Cookie') or '')
+
+    def _inject_faults(self) -> bool:
+        """Aplica latência e erros configurados. Retorna True se já respondeu."""
+        mock = self.server.mock
+        mock.count('requests')
+        delay = mock.latency + (mock.rng.random() * mock.jitter if mock.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        roll = mock.rng.random()
+        if roll < mock.error_rate:
+            mock.count('errors')
+            self._send(503, b'Service Unavailable', 'text/plain')
+            return True
+        if roll < mock.error_rate + mock.block_rate:
+            mock.count('blocks')
+            self._send(200, fixtures.blocked_page().encode())
+            return True
+        return False
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        mock = self.server.mock
+        parts = urlsplit(self.path)
+        path = parts.path
+
+        if path.startswith(('/static/', '/vendor/')):
+            # Recursos pesados (imagens, fontes, scripts de terceiros)
+            mock.count('static')
+            size = 180_000 if path.endswith(('.jpg', '.webp')) else 40_000
+            self._send(200, b'\0' * size, 'application/octet-stream')
+            return
+
+        if self._inject_faults():
+            return
+
+        if path in ('/', ''):
+            self._send(200, fixtures.home_page(self._logged_in()).encode())
+        elif path == '/login/':
+            self._send(200, fixtures.login_page().encode())
+        elif path.startswith('/ads/') or path.startswith('/q-'):
+            query = parse_qsl(parts.query, keep_blank_values=True)
+            page = 1
+            kept = []
+            for key, value in query:
+                if key == 'page':
+                    page = int(value) if value.isdigit() else 1
+                else:
+                    kept.append((key, value))
+            base_path = path + (f"?{urlencode(kept)}" if kept else '')
+            if mock.wrap and page > mock.total_pages:
+                # Como a OLX real: além da última página, a busca recomeça na primeira
+                page = 1
+            mock.count('listing_pages')
+            body = fixtures.listing_page(page, mock.total_pages, mock.per_page,
+                                         mock.base_url, base_path, mock.seed)
+            self._send(200, body.encode())
+        elif _DETAIL_RE.match(path):
+            ad_id = int(_DETAIL_RE.match(path).group(1), 16)
+            mock.count('detail_pages')
+            self._send(200, fixtures.detail_page(fixtures.make_ad(ad_id, mock.seed), self._logged_in()).encode())
+        elif _PHONE_RE.match(path):
+            ad = fixtures.make_ad(int(_PHONE_RE.match(path).group(1)), mock.seed)
+            mock.count('phone_reveals')
+            body = json.dumps({'data': {'phones': [ad['phone']]}}).encode()
+            self._send(200, body, 'application/json')
+        else:
+            self._send(404, b'Not Found', 'text/plain')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        if urlsplit(self.path).path == '/login/':
+            self._send(302, b'', headers={'Location': '/', 'Set-Cookie': 'olx_session=ok; Path=/'})
+        else:
+            self._send(404, b'Not Found', 'text/plain')
+
+
+class MockOlxServer:
+    """Servidor local com páginas de listagem, detalhe e revelação de telefone.
+
+    Attributes:
+        latency (float): Atraso fixo por requisição (segundos)
+        jitter (float): Atraso aleatório adicional máximo (segundos)
+        error_rate (float): Fração de respostas 503
+        block_rate (float): Fração de respostas 200 com página de captcha
+        total_pages (int): Número de páginas de listagem
+        wrap (bool): Páginas além da última devolvem a primeira em vez de uma página vazia
+        stats (dict): Contadores de requisições servidas
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, block_rate: float = 0.0, total_pages: int = fixtures.DEFAULT_TOTAL_PAGES,
+                 per_page: int = fixtures.ADS_PER_PAGE, seed: int = 0, wrap: bool = False):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.block_rate = block_rate
+        self.total_pages = total_pages
+        self.per_page = per_page
+        self.wrap = wrap
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.stats = {}
+        self._stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _MockHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def start(self) -> 'MockOlxServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _should_fail(self) -> bool:
+        proxy = self.server.proxy
+        proxy.count('connections')
+        if proxy.latency:
+            time.sleep(proxy.latency)
+        if proxy.rng.random() < proxy.failure_rate:
+            proxy.count('failures')
+            self.send_error(502, 'Bad Gateway')
+            return True
+        return False
+
+    def do_CONNECT(self):
+        if self._should_fail():
+            return
+        host, _, port = self.path.partition(':')
+        try:
+            upstream = socket.create_connection((host, int(port or 443)), timeout=10)
+        except OSError:
+            self.send_error(502, 'Bad Gateway')
+            return
+        self.send_response(200, 'Connection Established')
+        self.end_headers()
+        _tunnel(self.connection, upstream)
+        self.close_connection = True
+
+    def _forward(self):
+        if self._should_fail():
+            return
+        parts = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        try:
+            upstream = socket.create_connection((parts.hostname, parts.port or 80), timeout=10)
+        except OSError:
+            self.send_error(502, 'Bad Gateway')
+            return
+        target = parts.path + (f"?{parts.query}" if parts.query else '')
+        lines = [f"{self.command} {target or '/'} HTTP/1.1"]
+        for key, value in self.headers.items():
+            if key.lower() not in ('proxy-connection', 'connection', 'keep-alive'):
+                lines.append(f"{key}: {value}")
+        lines.append('Connection: close')
+        upstream.sendall(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        while True:
+            chunk = upstream.recv(65536)
+            if not chunk:
+                break
+            self.connection.sendall(chunk)
+        upstream.close()
+        self.close_connection = True
+
+    do_GET = _forward
+    do_POST = _forward
+    do_HEAD = _forward
+
+
+def _tunnel(client: socket.socket, upstream: socket.socket) -> None:
+    sockets = [client, upstream]
+    try:
+        while True:
+            readable, _, errored = select.select(sockets, [], sockets, 30)
+            if errored or not readable:
+                break
+            for sock in readable:
+                data = sock.recv(65536)
+                if not data:
+                    return
+                (upstream if sock is client else client).sendall(data)
+    finally:
+        upstream.close()
+
+
+class FakeProxy:
+    """Proxy HTTP/CONNECT local com injeção de falhas e latência.
+
+    Attributes:
+        failure_rate (float): Fração de conexões respondidas com 502
+        latency (float): Atraso por conexão (segundos)
+        stats (dict): Conexões e falhas atendidas
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, failure_rate: float = 0.0,
+                 latency: float = 0.0, seed: int = 0):
+        self.failure_rate = failure_rate
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.stats = {}
+        self._stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _ProxyHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.proxy = self
+        self._thread = None
+
+    @property
+    def address(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"{host}:{port}"
+
+    def count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def start(self) -> 'FakeProxy':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor OLX falso para benchmarks')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--proxy-port', type=int, default=8766)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--block-rate', type=float, default=0.0)
+    parser.add_argument('--pages', type=int, default=fixtures.DEFAULT_TOTAL_PAGES)
+    args = parser.parse_args()
+
+    server = MockOlxServer(port=args.port, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, block_rate=args.block_rate,
+                           total_pages=args.pages).start()
+    proxy = FakeProxy(port=args.proxy_port).start()
+    print(f"[MOCK] OLX falsa em {server.base_url}/ads/ (proxy em {proxy.address})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+        proxy.stop()
+
+
+if __name__ == '__main__':
+    main()
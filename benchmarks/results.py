@@ -0,0 +1,61 @@
+"""Armazenamento do histórico de resultados dos benchmarks."""
+import json
+import os
+import platform
+import subprocess
+import time
+from pathlib import Path
+
+RESULTS_FILE = Path(__file__).resolve().parent / 'results' / 'history.jsonl'
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=RESULTS_FILE.parent.parent, stderr=subprocess.DEVNULL,
+                                       text=True).strip()
+    except Exception:
+        return 'unknown'
+
+
+def load_history(benchmark: str | None = None) -> list[dict]:
+    """Carrega resultados anteriores, opcionalmente filtrando por benchmark."""
+    if not RESULTS_FILE.exists():
+        return []
+    entries = []
+    with open(RESULTS_FILE) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if benchmark is None or entry['benchmark'] == benchmark:
+                entries.append(entry)
+    return entries
+
+
+def record_result(benchmark: str, metrics: dict, params: dict | None = None) -> dict:
+    """Grava um resultado no histórico e imprime a comparação com a execução anterior."""
+    previous = load_history(benchmark)
+    entry = {
+        'benchmark': benchmark,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_rev': _git_revision(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'params': params or {},
+        'metrics': metrics,
+    }
+    RESULTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(RESULTS_FILE, 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+
+    print(f"[BENCH] {benchmark}")
+    last = previous[-1]['metrics'] if previous else {}
+    for key, value in metrics.items():
+        line = f"[BENCH]   {key}: {value}"
+        old = last.get(key)
+        if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+            line += f" ({(value - old) / old * 100:+.1f}% vs {previous[-1]['git_rev']})"
+        print(line)
+    return entry
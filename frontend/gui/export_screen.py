@@ -1,20 +1,20 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from backend.adapters.json_repository import JsonRepository
+from backend.adapters.block_repository import open_repository
 
 class ExportScreen:
-    def __init__(self, parent):
+    def __init__(self, parent, repository=None):
         self.parent = parent
         self.export_window = None
-        self.repository = JsonRepository()
+        self.repository = repository if repository is not None else open_repository()
         
     def show(self):
         if self.export_window is not None:
             return
             
         self.export_window = tk.Toplevel(self.parent)
-        self.export_window.title("Exportar para Excel")
-        self.export_window.geometry("400x200")
+        self.export_window.title("Exportar dados")
+        self.export_window.geometry("420x260")
         self.export_window.transient(self.parent)
         self.export_window.grab_set()
         
@@ -48,9 +48,25 @@ class ExportScreen:
         )
         browse_button.grid(row=0, column=1)
         
+        # Exportação incremental: só o que mudou desde a última exportação do destino
+        self.only_changes = tk.BooleanVar(value=False)
+        self.target = tk.StringVar(value="principal")
+        delta_frame = ttk.Frame(frame)
+        delta_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(0, 20))
+
+        delta_check = ttk.Checkbutton(
+            delta_frame,
+            text="Somente novos/alterados desde a última exportação para:",
+            variable=self.only_changes
+        )
+        delta_check.grid(row=0, column=0, sticky=tk.W)
+
+        target_entry = ttk.Entry(delta_frame, textvariable=self.target, width=20)
+        target_entry.grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+
         # Botões de ação
         button_frame = ttk.Frame(frame)
-        button_frame.grid(row=2, column=0, sticky=(tk.W, tk.E))
+        button_frame.grid(row=3, column=0, sticky=(tk.W, tk.E))
         
         export_button = ttk.Button(
             button_frame,
@@ -69,7 +85,8 @@ class ExportScreen:
     def browse_file(self):
         filename = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("JSON Lines", "*.jsonl"),
+                       ("All files", "*.*")]
         )
         if filename:
             self.file_path.set(filename)
@@ -83,12 +100,18 @@ class ExportScreen:
             return
         try:
             print("\nIniciando processo de exportação...")
-            self.repository.export_to_excel(self.file_path.get())
+            target = self.target.get().strip() if self.only_changes.get() else None
+            if self.only_changes.get() and not target:
+                messagebox.showerror("Erro", "Informe o nome do destino da exportação")
+                return
+            stats = self.repository.export(self.file_path.get(), target=target)
             print("Exportação concluída com sucesso!")
-            messagebox.showinfo(
-                "Sucesso",
-                "Dados exportados com sucesso para Excel!"
-            )
+            if target:
+                message = (f"{stats['rows']} anúncios exportados para '{target}' "
+                           f"({stats['new']} novos, {stats['changed']} alterados)")
+            else:
+                message = f"{stats['rows']} anúncios exportados com sucesso!"
+            messagebox.showinfo("Sucesso", message)
             self.hide()
         except Exception as e:
             print(f"Erro durante a exportação: {str(e)}")
@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from backend.config.credentials import CredentialsManager
+from backend.config.credentials import get_credentials_provider
 
 class LoginScreen:
     def __init__(self, parent):
@@ -52,8 +52,7 @@ class LoginScreen:
             return
         
         try:
-            credentials = CredentialsManager()
-            credentials.save_credentials(email, password)
+            get_credentials_provider().save_credentials(email, password)
             self.login_success = True
             self.window.destroy()
         except Exception as e:
@@ -73,8 +72,7 @@ def request_login(parent):
     Retorna True se as credenciais estiverem disponíveis ou forem salvas com sucesso.
     """
     # Tenta carregar credenciais salvas primeiro
-    credentials_manager = CredentialsManager()
-    saved_credentials = credentials_manager.get_credentials()
+    saved_credentials = get_credentials_provider().get_credentials()
     
     if saved_credentials:
         # Se encontrou credenciais salvas, usa elas
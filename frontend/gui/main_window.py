@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from .export_screen import ExportScreen
+from .results_screen import ResultsScreen
 from .login_screen import request_login
+from backend.adapters.profiler import get_profiler
 
 class MainWindow:
     def __init__(self, scraping_service, repository):
@@ -17,7 +19,8 @@ class MainWindow:
         self.setup_layout()
         
         # Componentes
-        self.export_screen = ExportScreen(self.root)
+        self.export_screen = ExportScreen(self.root, self.repository)
+        self.results_screen = ResultsScreen(self.root, self.repository)
         self.is_processing = False
         
     def setup_layout(self):
@@ -45,6 +48,22 @@ class MainWindow:
             command=lambda: self.start_scraping("https://www.olx.pt/ads/?search%5Border%5D=relevance:desc")
         )
         self.relevant_button.grid(row=0, column=1, padx=10, pady=5)
+
+        self.results_button = ttk.Button(
+            button_frame,
+            text="Ver Resultados",
+            width=20,
+            command=lambda: self.results_screen.show()
+        )
+        self.results_button.grid(row=1, column=0, pady=5)
+
+        self.export_button = ttk.Button(
+            button_frame,
+            text="Exportar",
+            width=20,
+            command=lambda: self.export_screen.show()
+        )
+        self.export_button.grid(row=1, column=1, pady=5)
         
         # Frame para progresso
         self.progress_frame = ttk.Frame(self.main_frame)
@@ -91,6 +110,7 @@ class MainWindow:
             # Salva dados
             print("Salvando dados processados...")
             self.repository.save(scraping_data)
+            self.results_screen.refresh()
             
             # Atualiza interface
             self.hide_processing_state()
@@ -101,6 +121,9 @@ class MainWindow:
             print(f"Erro durante o processamento: {str(e)}")
             self.hide_processing_state()
             messagebox.showerror("Erro", str(e))
+        finally:
+            # Com OLX_PROFILE=1, cada scraping da interface vira uma execução perfilada
+            get_profiler().finish()
         
     def show_processing_state(self):
         self.is_processing = True
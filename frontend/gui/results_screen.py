@@ -0,0 +1,337 @@
+import threading
+import tkinter as tk
+import webbrowser
+from collections import OrderedDict
+from tkinter import ttk, messagebox
+
+# Colunas exibidas: (chave da linha, título, chave de ordenação, largura)
+COLUMNS = [
+    ('name', 'Anúncio', 'name', 320),
+    ('price', 'Preço', 'price', 90),
+    ('seller_name', 'Vendedor', 'seller', 160),
+    ('date', 'Data', 'date', 130),
+    ('phone', 'Telefone', 'phone', 120),
+]
+
+
+class ResultsPager:
+    """Janela de linhas sobre o índice de busca, buscadas sob demanda em páginas.
+
+    Só as páginas que cobrem a parte visível (mais a margem de pré-busca) são
+    lidas do repositório, e as mais recentes ficam em cache. Cada página é
+    lida a partir do cursor da página vizinha já carregada (keyset); num
+    salto, a partir da página conhecida mais próxima. Filtros e ordenação
+    são repassados à consulta; nada é filtrado ou ordenado aqui. A pré-busca
+    roda numa thread própria, fora da thread da interface.
+
+    Attributes:
+        repository (JsonRepository): Repositório com o índice de busca
+        page_size (int): Linhas por consulta
+        cache_pages (int): Páginas mantidas em cache
+    """
+
+    def __init__(self, repository, page_size: int = 200, cache_pages: int = 20):
+        self.repository = repository
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.query = ''
+        self.filters = {}
+        self.sort = None
+        self.descending = False
+        self.total = 0
+        self._pages = OrderedDict()
+        # Cursores da primeira e da última linha de cada página já lida (ficam fora do LRU)
+        self._bounds = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._prefetch_request = None
+        self._worker = None
+
+    def set_query(self, query: str = '', sort: str | None = None, descending: bool = False, **filters) -> int:
+        """Aplica uma nova consulta; retorna o total de linhas."""
+        filters = {key: value for key, value in filters.items() if value not in (None, '')}
+        total = self.repository.count(query, **filters)
+        with self._lock:
+            self.query = query
+            self.filters = filters
+            self.sort = sort
+            self.descending = descending
+            self.total = total
+            self._pages.clear()
+            self._bounds.clear()
+            self._generation += 1
+            self._prefetch_request = None
+        return total
+
+    def refresh(self) -> int:
+        """Refaz a consulta atual, descartando as páginas lidas (ex.: depois de salvar uma coleta)."""
+        return self.set_query(self.query, sort=self.sort, descending=self.descending, **self.filters)
+
+    def _position(self, number: int) -> dict:
+        """Cursor e offset para ler a página a partir da página conhecida mais próxima."""
+        if number - 1 in self._bounds:
+            return {'after': self._bounds[number - 1][1]}
+        if number + 1 in self._bounds:
+            return {'before': self._bounds[number + 1][0]}
+        below = max((known for known in self._bounds if known < number), default=-1)
+        above = min((known for known in self._bounds if known > number), default=None)
+        if above is not None and above - number < number - below:
+            return {'before': self._bounds[above][0], 'offset': (above - number - 1) * self.page_size}
+        if below < 0:
+            return {'offset': number * self.page_size}
+        return {'after': self._bounds[below][1], 'offset': (number - below - 1) * self.page_size}
+
+    def _page(self, number: int, generation: int) -> list[dict]:
+        with self._lock:
+            page = self._pages.get(number)
+            if page is not None:
+                self._pages.move_to_end(number)
+                return page
+            position = self._position(number)
+            query, sort, descending, filters = self.query, self.sort, self.descending, self.filters
+        page = self.repository.search(query, sort=sort, descending=descending, limit=self.page_size,
+                                      **position, **filters)
+        with self._lock:
+            # Uma consulta nova descarta o que foi lido para a anterior
+            if generation == self._generation:
+                self._pages[number] = page
+                if page:
+                    self._bounds[number] = (page[0]['cursor'], page[-1]['cursor'])
+                while len(self._pages) > self.cache_pages:
+                    self._pages.popitem(last=False)
+        return page
+
+    def rows(self, start: int, count: int) -> list[dict]:
+        """Linhas [start, start + count) da consulta atual."""
+        with self._lock:
+            generation = self._generation
+            start = max(0, min(start, self.total))
+            end = min(start + count, self.total)
+        rows = []
+        for number in range(start // self.page_size, (end - 1) // self.page_size + 1 if end > start else 0):
+            page = self._page(number, generation)
+            base = number * self.page_size
+            rows.extend(page[max(start - base, 0):end - base])
+        return rows
+
+    def prefetch(self, start: int, count: int, margin: int) -> None:
+        """Agenda a leitura das páginas da margem antes e depois da parte visível.
+
+        A leitura roda numa thread própria; durante uma rolagem rápida só o
+        pedido mais recente é atendido.
+        """
+        with self._lock:
+            self._prefetch_request = (self._generation, start, count, margin)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._prefetch_loop, daemon=True, name='results-prefetch')
+                self._worker.start()
+            self._wakeup.notify()
+
+    def _prefetch_loop(self) -> None:
+        while True:
+            with self._lock:
+                while self._prefetch_request is None:
+                    self._wakeup.wait()
+                generation, start, count, margin = self._prefetch_request
+                self._prefetch_request = None
+                first = max(start - margin, 0) // self.page_size
+                last = min(start + count + margin, self.total) // self.page_size
+                visible = start // self.page_size
+                # Das mais próximas da parte visível para as mais distantes: cada uma tem a vizinha carregada
+                missing = sorted((number for number in range(first, last + 1)
+                                  if number * self.page_size < self.total and number not in self._pages),
+                                 key=lambda number: abs(number - visible))
+            for number in missing:
+                with self._lock:
+                    if generation != self._generation or self._prefetch_request is not None:
+                        break
+                try:
+                    self._page(number, generation)
+                except Exception as e:
+                    print(f"[RESULTS] Erro na pré-busca: {str(e)}")
+                    break
+
+
+class ResultsScreen:
+    """Janela com os anúncios salvos numa ttk.Treeview virtualizada.
+
+    A Treeview só contém as linhas visíveis; a barra de rolagem representa o
+    total de resultados e a rolagem troca as linhas exibidas pela janela
+    correspondente, lida do índice de busca.
+    """
+
+    def __init__(self, parent, repository, prefetch_margin: int = 100):
+        self.parent = parent
+        self.repository = repository
+        self.pager = ResultsPager(repository)
+        self.prefetch_margin = prefetch_margin
+        self.results_window = None
+        self.offset = 0
+        self.visible_rows = 20
+
+    def show(self):
+        if self.results_window is not None:
+            self.results_window.lift()
+            self.refresh()
+            return
+
+        self.results_window = tk.Toplevel(self.parent)
+        self.results_window.title("Resultados")
+        self.results_window.geometry("900x560")
+        self.results_window.protocol("WM_DELETE_WINDOW", self.hide)
+        self.results_window.columnconfigure(0, weight=1)
+        self.results_window.rowconfigure(1, weight=1)
+
+        # Filtros
+        filter_frame = ttk.Frame(self.results_window, padding="10 10 10 5")
+        filter_frame.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        filter_frame.columnconfigure(1, weight=1)
+
+        self.query = tk.StringVar()
+        self.min_price = tk.StringVar()
+        self.max_price = tk.StringVar()
+        self.since = tk.StringVar()
+        self.until = tk.StringVar()
+
+        ttk.Label(filter_frame, text="Buscar:").grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
+        query_entry = ttk.Entry(filter_frame, textvariable=self.query)
+        query_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(0, 10))
+        query_entry.bind('<Return>', lambda _: self.search())
+
+        fields = [("Preço de", self.min_price), ("até", self.max_price),
+                  ("Data de", self.since), ("até", self.until)]
+        for idx, (label, var) in enumerate(fields):
+            ttk.Label(filter_frame, text=label).grid(row=0, column=2 + idx * 2, padx=(0, 3))
+            entry = ttk.Entry(filter_frame, textvariable=var, width=10)
+            entry.grid(row=0, column=3 + idx * 2, padx=(0, 8))
+            entry.bind('<Return>', lambda _: self.search())
+
+        ttk.Button(filter_frame, text="Buscar", command=self.search).grid(row=0, column=10)
+
+        # Tabela
+        table_frame = ttk.Frame(self.results_window, padding="10 0 10 0")
+        table_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        table_frame.columnconfigure(0, weight=1)
+        table_frame.rowconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(table_frame, columns=[c[0] for c in COLUMNS], show='headings',
+                                 selectmode='browse')
+        for key, title, sort_key, width in COLUMNS:
+            self.tree.heading(key, text=title, command=lambda s=sort_key: self.sort_by(s))
+            self.tree.column(key, width=width, anchor=tk.E if key == 'price' else tk.W)
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # A barra representa o total de resultados, não as linhas da Treeview
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda _: self.scroll_to(self.offset - 3))
+        self.tree.bind('<Button-5>', lambda _: self.scroll_to(self.offset + 3))
+        self.tree.bind('<Prior>', lambda _: self.scroll_to(self.offset - self.visible_rows))
+        self.tree.bind('<Next>', lambda _: self.scroll_to(self.offset + self.visible_rows))
+        self.tree.bind('<Home>', lambda _: self.scroll_to(0))
+        self.tree.bind('<End>', lambda _: self.scroll_to(self.pager.total))
+        self.tree.bind('<Double-1>', self._open_selected)
+
+        self.status = tk.StringVar()
+        ttk.Label(self.results_window, textvariable=self.status, padding="10 5 10 10").grid(
+            row=2, column=0, sticky=tk.W)
+
+        self.search()
+
+    def _read_filters(self) -> dict:
+        def price(var):
+            text = var.get().strip().replace('€', '').replace(',', '.')
+            return float(text) if text else None
+
+        return dict(min_price=price(self.min_price), max_price=price(self.max_price),
+                    since=self.since.get().strip() or None, until=self.until.get().strip() or None)
+
+    def search(self):
+        try:
+            filters = self._read_filters()
+        except ValueError:
+            messagebox.showerror("Erro", "Preço inválido", parent=self.results_window)
+            return
+        try:
+            self.pager.set_query(self.query.get(), sort=self.pager.sort, descending=self.pager.descending,
+                                 **filters)
+        except Exception as e:
+            print(f"Erro na busca: {str(e)}")
+            messagebox.showerror("Erro", f"Erro na busca: {str(e)}", parent=self.results_window)
+            return
+        self.scroll_to(0)
+
+    def refresh(self):
+        """Relê a consulta aberta, mantendo a posição (chamado quando uma coleta é salva)."""
+        if self.results_window is None:
+            return
+        try:
+            self.pager.refresh()
+        except Exception as e:
+            print(f"Erro ao atualizar resultados: {str(e)}")
+            return
+        self.scroll_to(self.offset)
+
+    def sort_by(self, sort_key: str):
+        descending = self.pager.sort == sort_key and not self.pager.descending
+        self.pager.set_query(self.pager.query, sort=sort_key, descending=descending, **self.pager.filters)
+        for key, title, column_sort, _ in COLUMNS:
+            arrow = (' ▼' if descending else ' ▲') if column_sort == sort_key else ''
+            self.tree.heading(key, text=title + arrow)
+        self.scroll_to(0)
+
+    def scroll_to(self, offset: int):
+        self.offset = max(0, min(int(offset), max(self.pager.total - self.visible_rows, 0)))
+        self._render()
+
+    def _render(self):
+        self.tree.delete(*self.tree.get_children())
+        for row in self.pager.rows(self.offset, self.visible_rows):
+            price = f"{row['price_value']:.2f} €" if row['price_value'] is not None else (row['price'] or 'N/A')
+            self.tree.insert('', tk.END, iid=row['link'], values=(
+                row['name'] or '', price, row['seller_name'] or '', (row['date'] or '').replace('T', ' '),
+                row['phone'] or ''))
+
+        total = self.pager.total
+        if total:
+            self.scrollbar.set(self.offset / total, min((self.offset + self.visible_rows) / total, 1.0))
+            last = min(self.offset + self.visible_rows, total)
+            self.status.set(f"{self.offset + 1}-{last} de {total} anúncios")
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.status.set("Nenhum anúncio encontrado")
+
+        # A margem é lida pela thread de pré-busca do pager, sem bloquear a interface
+        self.pager.prefetch(self.offset, self.visible_rows, self.prefetch_margin)
+
+    def _on_scrollbar(self, action, *args):
+        if action == 'moveto':
+            self.scroll_to(float(args[0]) * self.pager.total)
+        elif action == 'scroll':
+            amount, unit = int(args[0]), args[1]
+            self.scroll_to(self.offset + amount * (self.visible_rows if unit == 'pages' else 1))
+
+    def _on_wheel(self, event):
+        self.scroll_to(self.offset - int(event.delta / 120) * 3)
+        return 'break'
+
+    def _on_resize(self, event):
+        row_height = ttk.Style().lookup('Treeview', 'rowheight') or 20
+        visible = max(int((event.height - 25) / int(row_height)), 1)
+        if visible != self.visible_rows:
+            self.visible_rows = visible
+            self.scroll_to(self.offset)
+
+    def _open_selected(self, event):
+        link = self.tree.identify_row(event.y)
+        if link:
+            webbrowser.open(link)
+
+    def hide(self):
+        if self.results_window is not None:
+            self.results_window.destroy()
+            self.results_window = None
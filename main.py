@@ -1,20 +1,176 @@
-from frontend.gui.main_window import MainWindow
+import argparse
+import os
+
 from backend.adapters.scraping_adapter import BeautifulSoupAdapter
-from backend.adapters.json_repository import JsonRepository
-from backend.config.credentials import CredentialsManager
+from backend.adapters.block_repository import open_repository
+from backend.adapters.profiler import get_profiler
+
+
+def run_headless(url: str) -> None:
+    """Executa um scraping completo sem interface gráfica."""
+    print(f"Iniciando scraping sem interface para URL: {url}")
+    scraping_service = BeautifulSoupAdapter()
+    repository = open_repository()
+
+    try:
+        scraping_data = scraping_service.extract_data(url)
+        repository.save(scraping_data)
+        print(f"Operação concluída com sucesso! Foram processados {len(scraping_data.data)} itens.")
+    finally:
+        scraping_service.close()
+        get_profiler().finish()
+
+
+def run_distributed(args) -> None:
+    """Executa o modo coordenador ou worker sobre a fila compartilhada."""
+    from backend.adapters.distributed_crawl import CrawlWorker, open_queue, run_coordinator
+
+    queue = open_queue(args.queue)
+    scraping_service = BeautifulSoupAdapter()
+    try:
+        if args.worker:
+            CrawlWorker(scraping_service, queue, threads=args.threads, idle_timeout=args.idle_timeout).run(args.crawl)
+            return
+        data = run_coordinator(scraping_service, open_repository(), queue, url=args.url, crawl=args.crawl,
+                               work=not args.no_work, threads=args.threads)
+        if data is not None:
+            print(f"Operação concluída com sucesso! Foram processados {len(data.data)} itens.")
+    finally:
+        scraping_service.close()
+        queue.close()
+        get_profiler().finish()
+
+
+def search_ads(args) -> None:
+    """Busca anúncios salvos pelo índice de texto e imprime os resultados."""
+    repository = open_repository()
+    if args.reindex:
+        repository.rebuild_index()
+    if args.search is None:
+        return
+    filters = dict(min_price=args.min_price, max_price=args.max_price, since=args.since, until=args.until)
+    results = repository.search(args.search, sort=args.sort, descending=args.desc, limit=args.limit, **filters)
+    total = repository.count(args.search, **filters)
+    for row in results:
+        price = f"{row['price_value']:.2f} €" if row['price_value'] is not None else (row['price'] or 'N/A')
+        print(f"{(row['date'] or '')[:10]}  {price:>12}  {row['name'] or ''}  [{row['seller_name'] or ''}]  {row['link']}")
+    print(f"{len(results)} de {total} anúncios encontrados")
+
+
+def export_ads(args) -> None:
+    """Exporta o histórico, ou só as mudanças desde a última exportação de --target."""
+    repository = open_repository()
+    if args.export:
+        stats = repository.export(args.export, target=args.target)
+        print(f"{stats['rows']} anúncios exportados para {args.export}")
+    for target, mark in repository.export_targets().items():
+        print(f"  {target}: {mark['rows']} anúncios na última exportação, em {mark['updated']}")
+
+
+def migrate_storage(codec: str | None) -> None:
+    """Converte o data.json para o formato em blocos comprimidos (data.olxb)."""
+    from backend.adapters.block_repository import migrate_json
+
+    stats = migrate_json(codec=codec)
+    print(f"Migração concluída: {stats['runs']} coletas, {stats['items']} itens ({stats['codec']})")
+    print(f"data.json: {stats['source_bytes']} bytes -> data.olxb: {stats['target_bytes']} bytes "
+          f"({stats['source_bytes'] / max(stats['target_bytes'], 1):.1f}x menor)")
+    print("O data.olxb passa a ser usado automaticamente; o data.json foi mantido como cópia.")
+
+
+def manage_accounts(add: str | None, remove: str | None) -> None:
+    """Adiciona ou remove contas do pool usado para revelar telefones."""
+    import getpass
+    from backend.config.credentials import get_credentials_provider
+
+    provider = get_credentials_provider()
+    if add:
+        provider.add_account(add, getpass.getpass(f"Senha para {add}: "))
+    if remove and not provider.remove_account(remove):
+        print(f"Conta {remove} não encontrada")
+    print("Contas configuradas:")
+    for account in provider.get_accounts():
+        print(f"  - {account['email']}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Web Scraping Tool para OLX")
+    parser.add_argument('--url', help="Executa o scraping da URL informada sem abrir a interface gráfica")
+    parser.add_argument('--add-account', metavar='EMAIL', help="Adiciona uma conta OLX ao pool de revelação de telefones")
+    parser.add_argument('--remove-account', metavar='EMAIL', help="Remove uma conta OLX do pool")
+    parser.add_argument('--coordinator', action='store_true',
+                        help="Distribui a busca de --url (ou retoma --crawl) pela fila compartilhada")
+    parser.add_argument('--worker', action='store_true', help="Processa tarefas da fila compartilhada")
+    parser.add_argument('--queue', metavar='ARQUIVO', help="Banco SQLite da fila (padrão: OLX_QUEUE_FILE ou crawl_queue.db)")
+    parser.add_argument('--crawl', metavar='ID', help="Busca da fila a retomar ou processar")
+    parser.add_argument('--threads', type=int, default=1, help="Tarefas processadas em paralelo por este processo")
+    parser.add_argument('--idle-timeout', type=float, default=30.0,
+                        help="Segundos sem tarefas até o worker encerrar (0 = nunca)")
+    parser.add_argument('--no-work', action='store_true', help="O coordenador apenas acompanha os workers")
+    parser.add_argument('--search', metavar='TERMOS',
+                        help="Busca anúncios salvos (todos os termos; 'termo*' busca por prefixo, '' lista todos)")
+    parser.add_argument('--min-price', type=float, help="Preço mínimo na busca")
+    parser.add_argument('--max-price', type=float, help="Preço máximo na busca")
+    parser.add_argument('--since', metavar='AAAA-MM-DD', help="Anúncios a partir desta data")
+    parser.add_argument('--until', metavar='AAAA-MM-DD', help="Anúncios até esta data")
+    parser.add_argument('--sort', choices=['name', 'price', 'seller', 'date', 'recent', 'relevance'],
+                        help="Ordenação da busca (padrão: mais recentes)")
+    parser.add_argument('--desc', action='store_true', help="Ordem decrescente")
+    parser.add_argument('--limit', type=int, default=50, help="Máximo de resultados exibidos")
+    parser.add_argument('--reindex', action='store_true', help="Refaz o índice de busca a partir do arquivo de dados")
+    parser.add_argument('--export', metavar='ARQUIVO',
+                        help="Exporta os anúncios salvos (.xlsx, .csv ou .jsonl)")
+    parser.add_argument('--target', metavar='NOME',
+                        help="Com --export, exporta só os anúncios novos ou alterados desde a última "
+                             "exportação deste destino")
+    parser.add_argument('--export-targets', action='store_true', help="Lista os destinos de exportação incremental")
+    parser.add_argument('--migrate-storage', action='store_true',
+                        help="Converte o data.json para blocos comprimidos (data.olxb)")
+    parser.add_argument('--codec', choices=['gzip', 'zstd'],
+                        help="Compressão usada na migração (padrão: OLX_STORAGE_CODEC ou gzip)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Grava perfis de CPU e memória da execução (o mesmo que OLX_PROFILE=1)")
+    args = parser.parse_args()
+    if args.profile:
+        os.environ['OLX_PROFILE'] = '1'
+
     print("\n=== Iniciando Web Scraping Tool ===")
+    if args.add_account or args.remove_account:
+        manage_accounts(args.add_account, args.remove_account)
+        return
+    if args.export or args.export_targets:
+        export_ads(args)
+        return
+    if args.migrate_storage:
+        migrate_storage(args.codec)
+        return
+    if args.search is not None or args.reindex:
+        search_ads(args)
+        return
+    if args.coordinator or args.worker:
+        if args.coordinator and not (args.url or args.crawl):
+            parser.error("--coordinator requer --url ou --crawl")
+        run_distributed(args)
+        return
+    if args.url:
+        run_headless(args.url)
+        return
+
     print("Inicializando componentes...")
+    # A interface só é importada quando necessária (o modo headless não carrega o Tk)
+    from frontend.gui.main_window import MainWindow
 
     # Inicializa os adaptadores
-    credentials_manager = CredentialsManager()
     scraping_service = BeautifulSoupAdapter()  # Credenciais serão carregadas quando necessário
-    repository = JsonRepository()
+    repository = open_repository()
     print("Componentes inicializados com sucesso")
 
     # Inicia a interface gráfica
     app = MainWindow(scraping_service, repository)
-    app.run()
+    try:
+        app.run()
+    finally:
+        scraping_service.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
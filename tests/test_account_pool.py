@@ -0,0 +1,47 @@
+from backend.adapters.account_pool import AccountPool
+
+
+def _accounts(*emails, password='secret'):
+    return [{'email': email, 'password': password} for email in emails]
+
+
+def test_acquire_prefers_account_with_fewer_reveals():
+    pool = AccountPool(_accounts('a', 'b'))
+    first = pool.acquire(timeout=0)
+    pool.release(first, revealed=True)
+    second = pool.acquire(timeout=0)
+    assert second is not first
+
+
+def test_quota_puts_account_in_wait():
+    pool = AccountPool(_accounts('a'), max_reveals=1)
+    account = pool.acquire(timeout=0)
+    pool.release(account, revealed=True)
+    assert pool.acquire(timeout=0.05) is None
+
+
+def test_sync_returns_idle_removed_sessions():
+    pool = AccountPool(_accounts('a', 'b'))
+    kept = pool.accounts[0]
+    removed = pool.sync(_accounts('a'))
+    assert [session.email for session in removed] == ['b']
+    assert pool.accounts == [kept]
+
+
+def test_removed_session_in_use_is_reported_on_release():
+    pool = AccountPool(_accounts('a', 'b'))
+    busy = next(session for session in pool.accounts if session.email == 'b')
+    busy.in_use = True
+    assert pool.sync(_accounts('a')) == []
+    assert pool.release(busy) is True
+    assert pool.release(pool.acquire(timeout=0)) is False
+
+
+def test_password_change_requires_new_login():
+    pool = AccountPool(_accounts('a'))
+    session = pool.accounts[0]
+    session.logged_in = True
+    pool.sync(_accounts('a'))
+    assert session.logged_in
+    pool.sync(_accounts('a', password='nova'))
+    assert session.password == 'nova' and not session.logged_in
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from backend.adapters.block_repository import BlockRepository, encode_block, migrate_json, scan_blocks
+from backend.domain.entities.scraping import ScrapingData
+
+
+def _run(n: int) -> ScrapingData:
+    return ScrapingData(f"https://www.olx.pt/ads/?page={n}",
+                        [{'link': f"https://www.olx.pt/d/anuncio/{n}-{i}", 'name': f"Anúncio\n{i}", 'phone': 'N/A'}
+                         for i in range(3)])
+
+
+@pytest.fixture
+def repository(tmp_path):
+    return BlockRepository(str(tmp_path / 'data.olxb'), index_path=str(tmp_path / 'data.index.db'))
+
+
+def test_save_appends_blocks_and_reads_back(repository):
+    for n in range(3):
+        repository.save(_run(n))
+    runs = repository.load()
+    assert [run.url for run in runs] == [_run(n).url for n in range(3)]
+    assert runs[1].data == _run(1).data
+    assert [block.header['items'] for block in repository.blocks()] == [3, 3, 3]
+
+
+def test_truncated_block_is_ignored_and_discarded_on_save(repository):
+    repository.save(_run(0))
+    complete = open(repository.filename, 'rb').read()
+    partial = encode_block(_run(1).url, _run(1).data)
+    with open(repository.filename, 'ab') as f:
+        f.write(partial[:len(partial) // 2])
+
+    blocks, valid_end = scan_blocks(repository.filename)
+    assert len(blocks) == 1 and valid_end == len(complete)
+    assert [run.url for run in repository.load()] == [_run(0).url]
+
+    repository.save(_run(2))
+    assert [run.url for run in repository.load()] == [_run(0).url, _run(2).url]
+    blocks, valid_end = scan_blocks(repository.filename)
+    assert valid_end == len(open(repository.filename, 'rb').read())
+
+
+def test_truncated_frame_header_is_ignored(repository):
+    repository.save(_run(0))
+    with open(repository.filename, 'ab') as f:
+        f.write(b'OLXB\x01')
+    assert len(scan_blocks(repository.filename)[0]) == 1
+    repository.save(_run(1))
+    assert len(repository.load()) == 2
+
+
+def test_saved_runs_are_indexed(repository):
+    repository.save(_run(0))
+    repository.save(_run(1))
+    assert repository.count() == 6
+
+
+def test_migrate_json_round_trip(tmp_path):
+    source = tmp_path / 'data.json'
+    target = tmp_path / 'data.olxb'
+    source.write_text(json.dumps([{'url': run.url, 'data': run.data} for run in map(_run, range(2))]))
+    stats = migrate_json(str(source), str(target), codec='gzip')
+    assert stats['runs'] == 2 and stats['items'] == 6
+    repository = BlockRepository(str(target), index_path='0')
+    assert [run.data for run in repository.load()] == [_run(0).data, _run(1).data]
+    with pytest.raises(Exception):
+        migrate_json(str(source), str(target), codec='gzip')
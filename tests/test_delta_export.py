@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from backend.adapters.json_repository import JsonRepository
+from backend.domain.entities.scraping import ScrapingData
+
+URL = 'https://www.olx.pt/ads/'
+
+
+def _ad(n: int, phone: str = 'N/A') -> dict:
+    return {'link': f"https://www.olx.pt/d/anuncio/{n}", 'name': f"Anúncio {n}", 'phone': phone}
+
+
+def _read(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    return JsonRepository(str(tmp_path / 'data.json'), index_path=str(tmp_path / 'data.index.db'))
+
+
+def test_first_delta_export_is_complete(repository, tmp_path):
+    repository.save(ScrapingData(URL, [_ad(1), _ad(2)]))
+    out = tmp_path / 'crm.jsonl'
+    stats = repository.export(str(out), target='crm')
+    assert stats['rows'] == stats['new'] == 2
+    assert {row['change'] for row in _read(out)} == {'new'}
+
+
+def test_delta_export_only_new_or_changed(repository, tmp_path):
+    repository.save(ScrapingData(URL, [_ad(1), _ad(2)]))
+    repository.export(str(tmp_path / 'first.jsonl'), target='crm')
+
+    # Anúncio 1 sem mudança, 2 alterado, 3 novo
+    repository.save(ScrapingData(URL, [_ad(1), _ad(2, phone='912345678'), _ad(3)]))
+    out = tmp_path / 'second.jsonl'
+    stats = repository.export(str(out), target='crm')
+    rows = {row['link']: row for row in _read(out)}
+    assert set(rows) == {_ad(2)['link'], _ad(3)['link']}
+    assert rows[_ad(2)['link']]['change'] == 'changed'
+    assert rows[_ad(2)['link']]['phone'] == '912345678'
+    assert rows[_ad(3)['link']]['change'] == 'new'
+    assert (stats['new'], stats['changed']) == (1, 1)
+
+    # Nada mudou desde a última exportação
+    assert repository.export(str(tmp_path / 'third.jsonl'), target='crm')['rows'] == 0
+
+
+def test_targets_have_independent_watermarks(repository, tmp_path):
+    repository.save(ScrapingData(URL, [_ad(1)]))
+    repository.export(str(tmp_path / 'a.jsonl'), target='a')
+    repository.save(ScrapingData(URL, [_ad(2)]))
+    assert repository.export(str(tmp_path / 'a2.jsonl'), target='a')['rows'] == 1
+    assert repository.export(str(tmp_path / 'b.jsonl'), target='b')['rows'] == 2
+    assert set(repository.export_targets()) == {'a', 'b'}
+
+
+def test_failed_export_keeps_watermark(repository, tmp_path):
+    repository.save(ScrapingData(URL, [_ad(1)]))
+    with pytest.raises(Exception):
+        repository.export(str(tmp_path / 'missing' / 'out.jsonl'), target='crm')
+    assert repository.export_targets() == {}
+    assert repository.export(str(tmp_path / 'out.jsonl'), target='crm')['rows'] == 1
+
+
+def test_pending_phone_does_not_erase_revealed_phone(repository, tmp_path):
+    repository.save(ScrapingData(URL, [_ad(1, phone='912345678')]))
+    repository.export(str(tmp_path / 'first.jsonl'), target='crm')
+    repository.save(ScrapingData(URL, [dict(_ad(1), phone=None, phone_pending=True)]))
+    out = tmp_path / 'second.jsonl'
+    repository.export(str(out), target='crm')
+    assert all(row['phone'] == '912345678' for row in _read(out))
@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+
+from backend.adapters.distributed_crawl import CrawlWorker
+from backend.adapters.work_queue import DETAIL, SqliteWorkQueue
+
+
+class _FailingAdapter:
+    max_pages = 0
+
+    @contextmanager
+    def work_session(self):
+        yield self
+
+    def reveal_phone(self, item):
+        raise Exception("navegador caiu")
+
+
+def test_detail_failing_every_attempt_is_saved_without_phone(tmp_path):
+    queue = SqliteWorkQueue(str(tmp_path / 'queue.db'), max_attempts=2, retry_base=0)
+    crawl = queue.create_crawl('https://www.olx.pt/ads/')
+    queue.enqueue(crawl, DETAIL, 'a', {'link': 'a', 'title': 'Bicicleta'})
+    worker = CrawlWorker(_FailingAdapter(), queue, threads=1, poll_interval=0.01)
+    try:
+        worker.run(crawl)
+        assert worker.processed['failed'] == 2
+        assert queue.counts(crawl) == {DETAIL: {'failed': 1}}
+        assert queue.results(crawl) == [{'link': 'a', 'title': 'Bicicleta', 'phone': 'N/A'}]
+    finally:
+        queue.close()
@@ -0,0 +1,90 @@
+import base64
+import socket
+
+import pytest
+
+from backend.adapters.forward_proxy import LocalForwardingProxy
+from benchmarks.mock_server import FakeProxy, MockOlxServer
+
+
+def _free_address() -> str:
+    """Endereço de uma porta sem ninguém escutando (conexão recusada)."""
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"127.0.0.1:{port}"
+
+
+def _connect_get(proxy: LocalForwardingProxy, target: str, path: str, pinned: str | None = None) -> bytes:
+    """Abre um túnel CONNECT pelo proxy local e faz um GET simples por ele."""
+    host, _, port = proxy.address.rpartition(':')
+    with socket.create_connection((host, int(port)), timeout=10) as sock:
+        head = f"CONNECT {target} HTTP/1.1\r\nHost: {target}\r\n"
+        if pinned:
+            user = pinned.replace(':', '_')
+            head += f"Proxy-Authorization: Basic {base64.b64encode(f'{user}:'.encode()).decode()}\r\n"
+        sock.sendall((head + "\r\n").encode())
+        reply = b''
+        while b'\r\n\r\n' not in reply:
+            chunk = sock.recv(4096)
+            if not chunk:
+                return reply
+            reply += chunk
+        if not reply.startswith(b'HTTP/1.1 200'):
+            return reply
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: {target}\r\nConnection: close\r\n\r\n".encode())
+        response = b''
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return response
+            response += chunk
+
+
+@pytest.fixture
+def site():
+    with MockOlxServer() as server:
+        yield server.base_url.split('//', 1)[1]
+
+
+def test_connect_tunnels_through_upstream(site):
+    with FakeProxy() as upstream, LocalForwardingProxy([upstream.address]) as proxy:
+        response = _connect_get(proxy, site, '/login/')
+        assert response.startswith(b'HTTP/1.1 200')
+        assert upstream.stats['connections'] == 1
+        assert proxy.stats()['upstreams'][upstream.address]['connections'] == 1
+
+
+def test_connect_fails_over_to_next_upstream(site):
+    dead = _free_address()
+    with FakeProxy() as upstream, LocalForwardingProxy([dead, upstream.address]) as proxy:
+        for _ in range(2):
+            assert _connect_get(proxy, site, '/login/').startswith(b'HTTP/1.1 200')
+        stats = proxy.stats()
+        assert stats['upstreams'][dead]['failures'] >= 1
+        assert stats['upstreams'][upstream.address]['connections'] == 2
+
+
+def test_connect_without_upstreams_answers_502(site):
+    with FakeProxy(failure_rate=1.0) as upstream, \
+            LocalForwardingProxy([upstream.address], max_attempts=1) as proxy:
+        assert _connect_get(proxy, site, '/login/').startswith(b'HTTP/1.1 502')
+        assert proxy.stats()['errors'] == 1
+
+
+def test_pinned_session_uses_its_upstream(site):
+    with FakeProxy() as first, FakeProxy() as second, \
+            LocalForwardingProxy([first.address, second.address]) as proxy:
+        for _ in range(3):
+            assert _connect_get(proxy, site, '/login/', pinned=second.address).startswith(b'HTTP/1.1 200')
+        assert second.stats['connections'] == 3
+        assert 'connections' not in first.stats
+
+
+def test_route_encodes_upstream_for_pinning():
+    proxy = LocalForwardingProxy(['10.0.0.1:3128'])
+    route = proxy.route('10.0.0.1:3128')
+    user = route.split('@', 1)[0]
+    head = b'CONNECT x:443 HTTP/1.1\r\nProxy-Authorization: Basic ' + base64.b64encode(f"{user}:".encode())
+    assert LocalForwardingProxy._pinned(head + b'\r\n\r\n') == '10.0.0.1:3128'
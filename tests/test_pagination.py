@@ -0,0 +1,47 @@
+from urllib.parse import parse_qsl, urlsplit
+
+from backend.adapters.pagination import PageInfo, page_number, page_url
+
+SEARCH = 'https://www.olx.pt/ads/q-bicicleta/?search[order]=created_at:desc&search[filter_float_price:to]=500'
+
+
+def _query(url: str) -> list:
+    return parse_qsl(urlsplit(url).query, keep_blank_values=True)
+
+
+def test_page_url_merges_existing_query():
+    url = page_url(SEARCH, 3)
+    assert _query(url) == [('search[order]', 'created_at:desc'),
+                           ('search[filter_float_price:to]', '500'), ('page', '3')]
+    # Colchetes e dois-pontos ficam legíveis, como a OLX gera
+    assert 'search[order]=created_at:desc' in url
+
+
+def test_page_url_replaces_page_instead_of_duplicating():
+    url = page_url(page_url(SEARCH, 2), 5)
+    assert [value for key, value in _query(url) if key == 'page'] == ['5']
+
+
+def test_first_page_has_no_page_param():
+    assert page_url(SEARCH + '&page=4', 1) == page_url(SEARCH, 1)
+    assert 'page=' not in page_url('https://www.olx.pt/ads/', 1)
+
+
+def test_page_url_without_query():
+    assert page_url('https://www.olx.pt/ads/', 2) == 'https://www.olx.pt/ads/?page=2'
+
+
+def test_blank_values_are_kept():
+    assert ('search[q]', '') in _query(page_url('https://www.olx.pt/ads/?search[q]=', 2))
+
+
+def test_page_number_round_trips():
+    assert page_number(page_url(SEARCH, 7)) == 7
+    assert page_number(SEARCH) == 1
+    assert page_number('https://www.olx.pt/ads/?page=abc') == 1
+
+
+def test_page_info_has_next():
+    assert PageInfo(current=1, total=3).has_next
+    assert not PageInfo(current=3, total=3).has_next
+    assert PageInfo(next_url='https://www.olx.pt/ads/?page=2').has_next
@@ -0,0 +1,45 @@
+import json
+
+from backend.adapters.reveal_scheduler import RevealScheduler
+
+URL = 'https://www.olx.pt/ads/'
+
+
+def _entries(path) -> dict:
+    return {entry['item']['link']: entry for entry in map(json.loads, path.read_text().splitlines())}
+
+
+def test_budget_stops_new_reveals():
+    scheduler = RevealScheduler(max_reveals=2)
+    scheduler.start()
+    assert [scheduler.allow() for _ in range(3)] == [True, True, False]
+
+
+def test_deferred_items_return_in_next_plan(tmp_path):
+    path = tmp_path / 'deferred.jsonl'
+    scheduler = RevealScheduler(deferred_file=str(path))
+    scheduler.finish(0, [{'link': 'a'}], URL)
+    planned = scheduler.plan([{'link': 'b'}], URL)
+    assert {item['link'] for item in planned} == {'a', 'b'}
+    assert scheduler.plan([], 'https://www.olx.pt/outra/') == []
+
+
+def test_deferring_again_keeps_first_deferral_time(tmp_path):
+    path = tmp_path / 'deferred.jsonl'
+    scheduler = RevealScheduler(deferred_file=str(path))
+    scheduler.finish(0, [{'link': 'a'}], URL)
+    first = _entries(path)['a']['deferred_at']
+    scheduler.finish(0, [{'link': 'a'}, {'link': 'b'}], URL)
+    entries = _entries(path)
+    assert entries['a']['deferred_at'] == first
+    assert entries['b']['deferred_at'] >= first
+
+
+def test_old_deferred_items_expire(tmp_path):
+    path = tmp_path / 'deferred.jsonl'
+    path.write_text(json.dumps({'url': URL, 'deferred_at': 0, 'item': {'link': 'a'}}) + '\n')
+    scheduler = RevealScheduler(deferred_file=str(path))
+    assert scheduler.plan([], URL) == []
+    scheduler.finish(0, [{'link': 'a'}], URL)
+    # Adiado de novo, continua com a data antiga e segue expirado
+    assert scheduler.plan([], URL) == []
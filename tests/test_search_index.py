@@ -0,0 +1,82 @@
+import pytest
+
+from backend.adapters.search_index import SearchIndex
+
+
+def _items():
+    items = []
+    for n in range(1, 15):
+        items.append({
+            'link': f"https://www.olx.pt/d/anuncio/{n}",
+            'name': f"Bicicleta {n % 4}" if n % 3 else f"Mesa {n}",
+            'seller_name': 'Ana' if n % 2 else 'Rui',
+            # Preços e datas repetidos e ausentes, para os cursores cruzarem empates e NULL
+            'price': None if n % 5 == 0 else f"{(n % 4) * 100} €",
+            'created': None if n % 4 == 0 else f"2026-01-{n % 6 + 1:02d}T10:00:00",
+            'phone': 'N/A',
+        })
+    return items
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(str(tmp_path / 'ads.index.db'))
+    index.add_run(1, 'https://www.olx.pt/ads/', _items())
+    yield index
+    index.close()
+
+
+def _ids(rows):
+    return [row['id'] for row in rows]
+
+
+def _page_forward(index, size, **kwargs):
+    pages = []
+    after = None
+    while True:
+        rows = index.search(limit=size, after=after, **kwargs)
+        if not rows:
+            return pages
+        pages.append(_ids(rows))
+        after = rows[-1]['cursor']
+
+
+@pytest.mark.parametrize('sort', ['price', 'date', 'name', 'recent', None])
+@pytest.mark.parametrize('descending', [False, True])
+def test_keyset_pages_match_full_ordering(index, sort, descending):
+    full = _ids(index.search(sort=sort, descending=descending, limit=100))
+    assert len(full) == 14
+    pages = _page_forward(index, 3, sort=sort, descending=descending)
+    assert [row_id for page in pages for row_id in page] == full
+
+
+@pytest.mark.parametrize('sort', ['price', 'date'])
+@pytest.mark.parametrize('descending', [False, True])
+def test_before_cursor_returns_previous_page(index, sort, descending):
+    pages = _page_forward(index, 3, sort=sort, descending=descending)
+    for previous, page in zip(pages, pages[1:]):
+        first = index.search(sort=sort, descending=descending, limit=100)
+        first_of_page = next(row for row in first if row['id'] == page[0])
+        back = index.search(sort=sort, descending=descending, limit=3, before=first_of_page['cursor'])
+        assert _ids(back) == previous
+
+
+def test_offset_after_cursor_skips_across_null_segment(index):
+    full = _ids(index.search(sort='price', limit=100))
+    cursor = index.search(sort='price', limit=1)[0]['cursor']
+    assert _ids(index.search(sort='price', limit=4, offset=5, after=cursor)) == full[6:10]
+
+
+def test_text_search_and_filters(index):
+    assert index.count('bicic') == 0
+    assert index.count('bicic*') == index.count('bicicleta') == 10
+    rows = index.search('bicicleta', min_price=200, max_price=300, limit=100)
+    assert rows and all(200 <= row['price_value'] <= 300 for row in rows)
+    assert index.count(since='2026-01-02', until='2026-01-02') == 3
+
+
+def test_unchanged_ads_are_not_rewritten(index):
+    assert index.add_run(2, 'https://www.olx.pt/ads/', _items()) == 0
+    changed = _items()[:2]
+    changed[0]['phone'] = '912345678'
+    assert index.add_run(3, 'https://www.olx.pt/ads/', changed) == 1
@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+
+from backend.adapters.selector_registry import SelectorRegistry
+
+
+def _write(path, version: str, groups: dict, **extra) -> None:
+    path.write_text(json.dumps(dict(extra, version=version, groups=groups)), encoding='utf-8')
+
+
+def _touch_later(path, seconds: int = 5) -> None:
+    """Garante mtime diferente mesmo em sistemas de arquivos com resolução grossa."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+
+@pytest.fixture
+def selectors_file(tmp_path):
+    path = tmp_path / 'selectors.json'
+    _write(path, '1', {'price': ['.a', '.b', '.c']})
+    return path
+
+
+def test_candidates_follow_file_order_until_hits(selectors_file):
+    registry = SelectorRegistry(selectors_file)
+    assert registry.candidates('price') == ['.a', '.b', '.c']
+    assert registry.candidates('missing') == []
+
+
+def test_hits_move_selector_to_front(selectors_file):
+    registry = SelectorRegistry(selectors_file)
+    for _ in range(3):
+        registry.record('price', '.c')
+    assert registry.candidates('price')[0] == '.c'
+    # Os que não acertaram mantêm a ordem do arquivo entre si
+    assert registry.candidates('price')[1:] == ['.a', '.b']
+    assert registry.stats()['price']['hits']['.c'] == 3
+
+
+def test_misses_demote_previous_winner(selectors_file):
+    registry = SelectorRegistry(selectors_file)
+    for _ in range(5):
+        registry.record('price', '.a')
+    for _ in range(20):
+        registry.record('price', '.b')
+    assert registry.candidates('price')[0] == '.b'
+
+
+def test_collapse_alerts_once(selectors_file):
+    alerts = []
+    registry = SelectorRegistry(selectors_file, min_samples=5, on_alert=lambda group, rate: alerts.append(group))
+    for _ in range(10):
+        registry.record('price', None)
+    assert alerts == ['price']
+    assert registry.stats()['price']['success_rate'] == 0.0
+
+
+def test_reload_keeps_rates_of_surviving_selectors(selectors_file):
+    registry = SelectorRegistry(selectors_file, check_interval=0)
+    for _ in range(3):
+        registry.record('price', '.c')
+    _write(selectors_file, '2', {'price': ['.new', '.c']})
+    _touch_later(selectors_file)
+    assert registry.candidates('price') == ['.c', '.new']
+    assert registry.version == '2'
+
+
+def test_invalid_reload_keeps_previous_version(selectors_file):
+    registry = SelectorRegistry(selectors_file, check_interval=0)
+    selectors_file.write_text('{ quebrado', encoding='utf-8')
+    _touch_later(selectors_file)
+    assert registry.candidates('price') == ['.a', '.b', '.c']
+    assert registry.version == '1'
@@ -0,0 +1,90 @@
+import threading
+import time
+
+from backend.adapters.block_detection import CAPTCHA, ERROR, OK
+from backend.adapters.throttle import AdaptiveThrottle
+
+
+def _limit(throttle: AdaptiveThrottle, key: str = '__global__') -> int:
+    return throttle.snapshot()[key]['limit']
+
+
+def _delay(throttle: AdaptiveThrottle, key: str = '__global__') -> float:
+    return throttle.snapshot()[key]['delay']
+
+
+def test_block_halves_concurrency_and_backs_off():
+    throttle = AdaptiveThrottle(max_concurrency=8, backoff_base=2.0)
+    throttle.record('p1', CAPTCHA)
+    assert _limit(throttle, 'p1') == 4
+    assert _delay(throttle, 'p1') == 2.0
+    throttle.record('p1', CAPTCHA)
+    assert _limit(throttle, 'p1') == 2
+    assert _delay(throttle, 'p1') == 4.0
+
+
+def test_decrease_stops_at_min_and_delay_at_max():
+    throttle = AdaptiveThrottle(max_concurrency=4, min_concurrency=1, max_delay=5.0)
+    for _ in range(10):
+        throttle.record('p1', CAPTCHA)
+    assert _limit(throttle, 'p1') == 1
+    assert _delay(throttle, 'p1') == 5.0
+
+
+def test_successes_increase_additively_up_to_max():
+    throttle = AdaptiveThrottle(max_concurrency=4, increase_every=3, delay_step=0.5)
+    throttle.record('p1', CAPTCHA)
+    throttle.record('p1', CAPTCHA)
+    assert _limit(throttle, 'p1') == 1
+    for _ in range(3):
+        throttle.record('p1', OK)
+    assert _limit(throttle, 'p1') == 2
+    assert _delay(throttle, 'p1') == 2.5
+    for _ in range(30):
+        throttle.record('p1', OK)
+    assert _limit(throttle, 'p1') == 4
+    assert _delay(throttle, 'p1') == 0.0
+
+
+def test_block_resets_success_streak():
+    throttle = AdaptiveThrottle(max_concurrency=4, increase_every=3)
+    throttle.record('p1', CAPTCHA)
+    throttle.record('p1', OK)
+    throttle.record('p1', OK)
+    throttle.record('p1', ERROR)
+    throttle.record('p1', OK)
+    assert _limit(throttle, 'p1') == 2
+
+
+def test_keys_are_independent_but_global_sees_all():
+    throttle = AdaptiveThrottle(max_concurrency=8)
+    throttle.record('p1', CAPTCHA)
+    throttle.record('p2', OK)
+    assert _limit(throttle, 'p1') == 4
+    assert _limit(throttle, 'p2') == 8
+    assert _limit(throttle) == 4
+    # A chave sem bloqueio herda o intervalo global (2.0 menos um passo pelo sucesso)
+    assert throttle.delay_for('p2') == throttle.delay_for() == 1.75
+
+
+def test_slot_enforces_concurrency_limit():
+    throttle = AdaptiveThrottle(max_concurrency=2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with throttle.slot('p1'):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 2
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from backend.adapters.work_queue import DETAIL, LISTING, SqliteWorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SqliteWorkQueue(str(tmp_path / 'queue.db'), visibility_timeout=0.2, max_attempts=3, retry_base=0.05)
+    yield queue
+    queue.close()
+
+
+@pytest.fixture
+def crawl(queue):
+    return queue.create_crawl('https://www.olx.pt/ads/')
+
+
+def test_enqueue_ignores_duplicates(queue, crawl):
+    assert queue.enqueue(crawl, DETAIL, 'a', {'link': 'a'})
+    assert not queue.enqueue(crawl, DETAIL, 'a', {'link': 'a'})
+    assert queue.enqueue_many(crawl, DETAIL, [('a', {}), ('b', {}), ('b', {})]) == 1
+
+
+def test_listing_tasks_are_leased_first(queue, crawl):
+    queue.enqueue(crawl, DETAIL, 'a', {})
+    queue.enqueue(crawl, LISTING, '2', {})
+    assert queue.lease('w1', crawl).kind == LISTING
+
+
+def test_leased_task_is_hidden_until_lease_expires(queue, crawl):
+    queue.enqueue(crawl, DETAIL, 'a', {})
+    task = queue.lease('w1', crawl)
+    assert task.attempts == 1
+    assert queue.lease('w2', crawl) is None
+    time.sleep(0.25)
+    again = queue.lease('w2', crawl)
+    assert again.id == task.id and again.attempts == 2
+    # O dono anterior perdeu o arrendamento e não conclui mais a tarefa
+    assert not queue.extend(task, 'w1')
+    assert not queue.complete(task, 'w1')
+    assert queue.complete(again, 'w2')
+    assert queue.is_finished(crawl)
+
+
+def test_extend_keeps_lease(queue, crawl):
+    queue.enqueue(crawl, DETAIL, 'a', {})
+    task = queue.lease('w1', crawl)
+    for _ in range(3):
+        time.sleep(0.1)
+        assert queue.extend(task, 'w1')
+    assert queue.lease('w2', crawl) is None
+
+
+def test_fail_retries_with_backoff_then_gives_up(queue, crawl):
+    queue.enqueue(crawl, DETAIL, 'a', {})
+    task = queue.lease('w1', crawl)
+    queue.fail(task, 'w1', 'erro 1')
+    # Primeira espera: retry_base
+    assert queue.lease('w1', crawl) is None
+    time.sleep(0.06)
+    task = queue.lease('w1', crawl)
+    assert task.attempts == 2
+    queue.fail(task, 'w1', 'erro 2')
+    time.sleep(0.11)
+    task = queue.lease('w1', crawl)
+    assert task.attempts == 3
+    queue.fail(task, 'w1', 'erro 3')
+    assert queue.counts(crawl) == {DETAIL: {'failed': 1}}
+    assert queue.is_finished(crawl)
+
+
+def test_expired_lease_past_max_attempts_fails(queue, crawl):
+    queue.enqueue(crawl, DETAIL, 'a', {})
+    for _ in range(3):
+        assert queue.lease('w1', crawl) is not None
+        time.sleep(0.25)
+    assert queue.lease('w1', crawl) is None
+    assert queue.counts(crawl) == {DETAIL: {'failed': 1}}
+
+
+def test_results_are_unique_per_key(queue, crawl):
+    queue.add_result(crawl, 'a', {'link': 'a', 'phone': 'N/A'}, 'w1')
+    queue.add_result(crawl, 'a', {'link': 'a', 'phone': '912345678'}, 'w2')
+    queue.add_result(crawl, 'b', {'link': 'b', 'phone': 'N/A'}, 'w1')
+    results = queue.results(crawl)
+    assert len(results) == 2
+    assert {'link': 'a', 'phone': '912345678'} in results
+
+
+def test_close_closes_connections_of_all_threads(queue, crawl):
+    thread = threading.Thread(target=queue.counts, args=(crawl,))
+    thread.start()
+    thread.join()
+    connections = list(queue._connections)
+    assert len(connections) == 2
+    queue.close()
+    for db in connections:
+        with pytest.raises(Exception):
+            db.execute('SELECT 1')